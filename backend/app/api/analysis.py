@@ -2,38 +2,74 @@
 Salary analysis API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, FrozenSet, Literal, Optional
 import uuid
 
+from app.core.http_cache import make_etag, not_modified, set_cache_headers, wants_revalidation
+from app.core.timing import stage
 from app.models.database import get_db
 from app.models.job_analysis import JobAnalysis
 from app.models.salary_range import SalaryRange
-from app.schemas.salary import SalaryCalculationRequest, SalaryCalculationResponse
+from app.schemas.salary import (
+    SalaryCalculationRequest,
+    SalaryCalculationResponse,
+    BatchSalaryCalculationRequest,
+    BatchSalaryCalculationResponse,
+    ScenarioGridRequest,
+    ScenarioGridResponse
+)
+from app.services.market_data import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    csv_lines,
+    decode_cursor,
+    encode_cursor,
+    market_data_statement,
+    ndjson_lines,
+    parse_fields,
+    project
+)
 from app.services.salary_engine import SalaryEngine
+from app.services.salary_cache import salary_cache
+from app.services.salary_pricing import price_salary, price_salary_batch, price_scenario_grid
 
 router = APIRouter()
 
-@router.post("/calculate/{job_id}", response_model=SalaryCalculationResponse)
-async def calculate_salary(
-    job_id: str,
-    request: Optional[SalaryCalculationRequest] = None,
-    db: Session = Depends(get_db)
-):
-    """Calculate salary range for a job"""
+def parse_include(include: Optional[str]) -> Optional[FrozenSet[str]]:
+    """Parse the include query parameter into insight sections
 
-    # Get job analysis
-    job = db.query(JobAnalysis).filter(JobAnalysis.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job analysis not found")
+    Accepts a comma-separated list of SalaryEngine.INSIGHT_SECTIONS, "all"
+    (the default) or "none" for numbers only.
+    """
+    if include is None or include.strip() == "all":
+        return None
+    if include.strip() == "none":
+        return frozenset()
 
-    # Calculate salary
-    salary_engine = SalaryEngine(db)
-    salary_data = salary_engine.calculate_salary(job, request)
+    sections = frozenset(part.strip() for part in include.split(",") if part.strip())
+    unknown = sections - SalaryEngine.INSIGHT_SECTIONS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include sections: {', '.join(sorted(unknown))}"
+        )
+    return sections
 
-    # Save salary range
-    salary_range = SalaryRange(
+def persists_result(sections: Optional[FrozenSet[str]]) -> bool:
+    """Only results with every insight section are saved as a job's salary range
+
+    A reduced result would otherwise become the latest SalaryRange and hide
+    the insights of the last full calculation.
+    """
+    return sections is None or sections == SalaryEngine.INSIGHT_SECTIONS
+
+def salary_range_values(job: JobAnalysis, salary_data: Dict) -> Dict:
+    """Map an engine result onto SalaryRange columns"""
+    return dict(
         job_analysis_id=job.id,
         job_title=job.job_title,
         job_family=job.job_family,
@@ -53,55 +89,212 @@ async def calculate_salary(
         recommended_max=salary_data["recommended_max"],
         geographic_factor=salary_data.get("geographic_factor", 1.0),
         market_adjustment=salary_data.get("market_adjustment", 1.0),
+        skills_premium=salary_data.get("skills_premium", 0.0),
         data_sources=salary_data.get("sources", []),
         confidence_score=salary_data.get("confidence", 0.85),
         ai_justification=salary_data.get("justification"),
         market_insights=salary_data.get("insights", {})
     )
 
+@router.post("/calculate/{job_id}", response_model=SalaryCalculationResponse)
+async def calculate_salary(
+    job_id: str,
+    request: Optional[SalaryCalculationRequest] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Calculate salary range for a job
+
+    ``include`` selects insight sections to compute, e.g.
+    ``justification,market_position``, ``all`` (default) or ``none``. Only
+    ``all`` results are saved; other selections are returned without an id.
+    """
+
+    sections = parse_include(include)
+
+    # Get job analysis
+    job = await db.scalar(select(JobAnalysis).where(JobAnalysis.id == job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job analysis not found")
+
+    # Calculate salary
+    override_params = request.model_dump(exclude_none=True) if request else None
+    salary_data = await price_salary(db, job, override_params, include=sections)
+
+    salary_range = SalaryRange(**salary_range_values(job, salary_data))
+    if not persists_result(sections):
+        return salary_range
+
+    # Save salary range
+
     db.add(salary_range)
-    db.commit()
-    db.refresh(salary_range)
+    with stage("db_commit"):
+        await db.commit()
+    await db.refresh(salary_range)
 
     return salary_range
 
+@router.post("/calculate-batch", response_model=BatchSalaryCalculationResponse)
+async def calculate_salary_batch(
+    request: BatchSalaryCalculationRequest,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Calculate salary ranges for many jobs in one request
+
+    Accepts the same ``include`` selector as the single-job endpoint; as
+    there, only ``all`` results are saved and get an id.
+    """
+
+    sections = parse_include(include)
+
+    job_ids = list(dict.fromkeys(request.job_ids))
+    jobs = (await db.scalars(select(JobAnalysis).where(JobAnalysis.id.in_(job_ids)))).all()
+
+    found_ids = {job.id for job in jobs}
+    missing_job_ids = [job_id for job_id in job_ids if job_id not in found_ids]
+
+    # Calculate salaries
+    salary_data = await price_salary_batch(db, jobs, include=sections)
+
+    # Save all salary ranges in one bulk write
+    persist = persists_result(sections)
+    rows = []
+    for job, data in zip(jobs, salary_data):
+        row = salary_range_values(job, data)
+        row["id"] = uuid.uuid4() if persist else None
+        rows.append(row)
+
+    if rows and persist:
+        with stage("db_commit"):
+            await db.execute(insert(SalaryRange), rows)
+            await db.commit()
+
+    return {
+        "count": len(rows),
+        "missing_job_ids": missing_job_ids,
+        "results": rows
+    }
+
+@router.post("/scenarios/{job_id}", response_model=ScenarioGridResponse)
+async def calculate_scenarios(
+    job_id: str,
+    request: ScenarioGridRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Price a job across levels, zones and locations without saving results"""
+
+    job = await db.scalar(select(JobAnalysis).where(JobAnalysis.id == job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job analysis not found")
+
+    scenarios = await price_scenario_grid(
+        db,
+        job,
+        levels=list(dict.fromkeys(request.levels)),
+        zones=list(dict.fromkeys(request.zones)),
+        locations=list(dict.fromkeys(request.locations or [job.location]))
+    )
+
+    return {
+        "job_analysis_id": job.id,
+        "job_title": job.job_title,
+        "scenarios": scenarios
+    }
+
 @router.get("/salary/{job_id}", response_model=SalaryCalculationResponse)
 async def get_salary_calculation(
     job_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get latest salary calculation for a job"""
 
-    salary_range = db.query(SalaryRange)\
-        .filter(SalaryRange.job_analysis_id == job_id)\
-        .order_by(SalaryRange.created_at.desc())\
-        .first()
+    # Revalidation reads only the latest calculation's id and timestamp
+    if wants_revalidation(request):
+        version = (await db.execute(
+            select(SalaryRange.id, SalaryRange.updated_at)
+            .where(SalaryRange.job_analysis_id == job_id)
+            .order_by(SalaryRange.created_at.desc())
+            .limit(1)
+        )).first()
+        if version:
+            cached = not_modified(request, salary_etag(*version))
+            if cached:
+                return cached
+
+    salary_range = await db.scalar(
+        select(SalaryRange)
+        .where(SalaryRange.job_analysis_id == job_id)
+        .order_by(SalaryRange.created_at.desc())
+        .limit(1)
+    )
 
     if not salary_range:
         raise HTTPException(status_code=404, detail="Salary calculation not found")
 
+    set_cache_headers(response, salary_etag(salary_range.id, salary_range.updated_at))
     return salary_range
 
+def salary_etag(salary_range_id, updated_at) -> str:
+    # A recalculation inserts a new row, so the id changes with every result
+    return make_etag("salary", salary_range_id, updated_at)
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Get salary result cache statistics"""
+    return salary_cache.stats()
+
 @router.get("/market-data")
 async def get_market_data(
+    response: Response,
     job_family: Optional[str] = None,
     level: Optional[int] = None,
     zone: Optional[int] = None,
-    db: Session = Depends(get_db)
+    source_type: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (default: all)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size (json) or row cap (ndjson/csv)"),
+    format: Literal["json", "ndjson", "csv"] = "json",
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get market benchmark data"""
+    """Get market benchmark data
+
+    Rows are ordered by (data_date, id). ``json`` returns one page, with the
+    cursor for the next page in the X-Next-Cursor header. ``ndjson`` and
+    ``csv`` stream every matching row from a server-side cursor.
+    """
+
+    try:
+        columns = parse_fields(fields)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    from app.models.benchmark import Benchmark
+    filters = dict(job_family=job_family, level=level, zone=zone, source_type=source_type, after=after)
 
-    query = db.query(Benchmark)
+    if format != "json":
+        statement = market_data_statement(columns, limit=limit, **filters)
+        if format == "ndjson":
+            return StreamingResponse(ndjson_lines(statement, columns), media_type="application/x-ndjson")
+        return StreamingResponse(
+            csv_lines(statement, columns),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="market-data.csv"'}
+        )
 
-    if job_family:
-        query = query.filter(Benchmark.job_family == job_family)
-    if level:
-        query = query.filter(Benchmark.level == level)
-    if zone:
-        query = query.filter(Benchmark.zone == zone)
+    page_size = limit or DEFAULT_PAGE_SIZE
+    if page_size > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit cannot exceed {MAX_PAGE_SIZE} for json; use format=ndjson or format=csv to export"
+        )
 
-    benchmarks = query.limit(50).all()
+    # Fetch one extra row to know whether another page follows
+    rows = (await db.execute(market_data_statement(columns, limit=page_size + 1, **filters))).all()
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
 
-    return benchmarks
\ No newline at end of file
+    return [project(row, columns) for row in rows]
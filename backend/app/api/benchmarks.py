@@ -2,49 +2,100 @@
 Benchmark data API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
 import uuid
 
+from app.core.config import settings
+from app.core.http_cache import make_etag, not_modified, set_cache_headers, wants_revalidation
 from app.models.database import get_db
 from app.models.job_analysis import JobAnalysis
 from app.models.salary_range import SalaryRange
-from app.models.benchmark import Benchmark
+from app.services.benchmark_cube import benchmark_cube
+from app.services.benchmark_stats import fetch_benchmark_details, vintage_start
+from app.services.dataset_version import benchmark_dataset_version
+from app.services.location_resolver import location_resolver
+from app.services.salary_cache import salary_cache
 
 router = APIRouter()
 
+@router.get("/cube")
+async def get_cube_status():
+    """Get status of the in-process benchmark cube"""
+    return benchmark_cube.stats()
+
+@router.post("/cube/refresh")
+async def refresh_cube(db: AsyncSession = Depends(get_db)):
+    """Reload the in-process benchmark cube from the database"""
+    stats = await db.run_sync(benchmark_cube.refresh)
+    salary_cache.clear()
+    return stats
+
 @router.get("/details/{job_id}")
-async def get_benchmark_details(job_id: str, db: Session = Depends(get_db)):
+async def get_benchmark_details(
+    job_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
     """Get detailed benchmark data used for salary calculation"""
 
+    # Revalidate from version markers alone, before the benchmark query
+    if wants_revalidation(request):
+        latest_salary = select(SalaryRange.id, SalaryRange.updated_at).where(
+            SalaryRange.job_analysis_id == uuid.UUID(job_id)
+        ).order_by(SalaryRange.created_at.desc()).limit(1).subquery()
+        version = (await db.execute(
+            select(
+                JobAnalysis.created_at,
+                JobAnalysis.updated_at,
+                latest_salary.c.id,
+                latest_salary.c.updated_at
+            ).outerjoin(latest_salary, true()).where(JobAnalysis.id == uuid.UUID(job_id))
+        )).first()
+        if version:
+            dataset_version = await benchmark_dataset_version.fetch(db)
+            cached = not_modified(request, details_etag(job_id, *version, dataset_version))
+            if cached:
+                return cached
+
     # Get job analysis
-    job_analysis = db.query(JobAnalysis).filter(JobAnalysis.id == uuid.UUID(job_id)).first()
+    job_analysis = await db.scalar(select(JobAnalysis).where(JobAnalysis.id == uuid.UUID(job_id)))
     if not job_analysis:
         raise HTTPException(status_code=404, detail="Job analysis not found")
 
     # Get salary range calculation
-    salary_range = db.query(SalaryRange).filter(
-        SalaryRange.job_analysis_id == uuid.UUID(job_id)
-    ).order_by(SalaryRange.created_at.desc()).first()
-
-    # Get benchmark data used (matching level and zone)
-    mercer_benchmarks = db.query(Benchmark).filter(
-        Benchmark.source_type == 'mercer',
-        Benchmark.level == job_analysis.detected_level,
-        Benchmark.zone == job_analysis.zone
-    ).all()
-
-    lattice_benchmarks = db.query(Benchmark).filter(
-        Benchmark.source_type == 'lattice',
-        Benchmark.level == job_analysis.detected_level,
-        Benchmark.zone == job_analysis.zone
-    ).all()
-
-    # Calculate averages for each source
-    mercer_stats = calculate_benchmark_stats(mercer_benchmarks)
-    lattice_stats = calculate_benchmark_stats(lattice_benchmarks)
+    salary_range = await db.scalar(
+        select(SalaryRange).where(
+            SalaryRange.job_analysis_id == uuid.UUID(job_id)
+        ).order_by(SalaryRange.created_at.desc()).limit(1)
+    )
+
+    # Per-source stats and the top 5 data points for every source, in one query
+    details = await fetch_benchmark_details(db, level=job_analysis.detected_level, zone=job_analysis.zone, limit=5)
+    # Mercer and Lattice are always present; any other source appears when it has data
+    sources = ['mercer', 'lattice'] + sorted(details.keys() - {'mercer', 'lattice'})
+    source_stats = {
+        source: calculate_benchmark_stats(details[source]['stats'] if source in details else None)
+        for source in sources
+    }
+    mercer_stats = source_stats['mercer']
+    lattice_stats = source_stats['lattice']
+    # Mean over sources with data; as before, one source alone gives no combined figure
+    source_avgs = [stats['avg_p50'] for stats in source_stats.values() if stats['avg_p50']]
+    combined_avg = sum(source_avgs) / len(source_avgs) if len(source_avgs) > 1 else 0
+
+    dataset_version = await benchmark_dataset_version.fetch(db)
+    set_cache_headers(response, details_etag(
+        job_id,
+        job_analysis.created_at,
+        job_analysis.updated_at,
+        salary_range.id if salary_range else None,
+        salary_range.updated_at if salary_range else None,
+        dataset_version
+    ))
 
     # Prepare response
     return {
@@ -60,52 +111,18 @@ async def get_benchmark_details(job_id: str, db: Session = Depends(get_db)):
             "skills": job_analysis.skills_extracted or []
         },
         "benchmark_data": {
-            "mercer": {
-                "count": len(mercer_benchmarks),
-                "p50_range": {
-                    "min": mercer_stats['min_p50'],
-                    "max": mercer_stats['max_p50'],
-                    "avg": mercer_stats['avg_p50']
-                },
-                "p25_avg": mercer_stats['avg_p25'],
-                "p75_avg": mercer_stats['avg_p75'],
-                "data_points": [
-                    {
-                        "job_title": b.job_title or "Software Engineer",
-                        "location": b.location,
-                        "p25": float(b.p25_salary) if b.p25_salary else None,
-                        "p50": float(b.p50_salary) if b.p50_salary else None,
-                        "p75": float(b.p75_salary) if b.p75_salary else None,
-                        "data_date": b.data_date.isoformat() if b.data_date else None
-                    } for b in mercer_benchmarks[:5]  # Top 5 matches
-                ]
-            },
-            "lattice": {
-                "count": len(lattice_benchmarks),
-                "p50_range": {
-                    "min": lattice_stats['min_p50'],
-                    "max": lattice_stats['max_p50'],
-                    "avg": lattice_stats['avg_p50']
-                },
-                "p25_avg": lattice_stats['avg_p25'],
-                "p75_avg": lattice_stats['avg_p75'],
-                "data_points": [
-                    {
-                        "job_title": b.job_title or "Software Engineer",
-                        "location": b.location,
-                        "p25": float(b.p25_salary) if b.p25_salary else None,
-                        "p50": float(b.p50_salary) if b.p50_salary else None,
-                        "p75": float(b.p75_salary) if b.p75_salary else None,
-                        "data_date": b.data_date.isoformat() if b.data_date else None
-                    } for b in lattice_benchmarks[:5]  # Top 5 matches
-                ]
-            }
+            source: format_source_data(
+                source_stats[source],
+                details[source]['data_points'] if source in details else []
+            )
+            for source in sources
         },
         "calculation_breakdown": {
             "base_p50": {
                 "mercer_avg": mercer_stats['avg_p50'],
                 "lattice_avg": lattice_stats['avg_p50'],
-                "combined_avg": (mercer_stats['avg_p50'] + lattice_stats['avg_p50']) / 2 if mercer_stats['avg_p50'] and lattice_stats['avg_p50'] else 0
+                "source_avgs": {source: stats['avg_p50'] for source, stats in source_stats.items()},
+                "combined_avg": combined_avg
             },
             "adjustments": {
                 "geographic_factor": float(salary_range.geographic_factor) if salary_range else 1.0,
@@ -114,7 +131,7 @@ async def get_benchmark_details(job_id: str, db: Session = Depends(get_db)):
                 "market_adjustment": float(salary_range.market_adjustment) if salary_range else 0.0
             },
             "final_calculation": {
-                "base": (mercer_stats['avg_p50'] + lattice_stats['avg_p50']) / 2 if mercer_stats['avg_p50'] and lattice_stats['avg_p50'] else 0,
+                "base": combined_avg,
                 "after_geographic": None,  # Will calculate
                 "after_skills": None,  # Will calculate
                 "final_target": float(salary_range.recommended_target) if salary_range else 0
@@ -128,24 +145,55 @@ async def get_benchmark_details(job_id: str, db: Session = Depends(get_db)):
         }
     }
 
-def calculate_benchmark_stats(benchmarks: List[Benchmark]) -> Dict:
-    """Calculate statistics from benchmark data"""
-    if not benchmarks:
+def details_etag(job_id, job_created_at, job_updated_at, salary_range_id, salary_updated_at, dataset_version) -> str:
+    """Details depend on the job, its latest salary calculation, the benchmark data and how it is read"""
+    return make_etag(
+        "details", str(job_id).lower(), job_created_at, job_updated_at,
+        salary_range_id, salary_updated_at, dataset_version, settings.BENCHMARK_ROLLUPS_ENABLED,
+        settings.BENCHMARK_SKETCH_BLENDING, vintage_start()
+    )
+
+def format_source_data(stats: Dict, data_points: List) -> Dict:
+    """Shape one source's stats and data points for the details response"""
+    return {
+        "count": stats['count'],
+        "p50_range": {
+            "min": stats['min_p50'],
+            "max": stats['max_p50'],
+            "avg": stats['avg_p50'],
+            "median": stats['median_p50']
+        },
+        "p25_avg": stats['avg_p25'],
+        "p75_avg": stats['avg_p75'],
+        "data_points": [
+            {
+                "job_title": b.job_title or "Software Engineer",
+                "location": b.location,
+                "p25": float(b.p25_salary) if b.p25_salary else None,
+                "p50": float(b.p50_salary) if b.p50_salary else None,
+                "p75": float(b.p75_salary) if b.p75_salary else None,
+                "data_date": b.data_date.isoformat() if b.data_date else None
+            } for b in data_points
+        ]
+    }
+
+def calculate_benchmark_stats(stats: Optional[Dict]) -> Dict:
+    """Summarize SQL-aggregated statistics for one source"""
+    if not stats:
         return {
+            'count': 0,
             'avg_p25': 0, 'avg_p50': 0, 'avg_p75': 0,
-            'min_p50': 0, 'max_p50': 0
+            'min_p50': 0, 'max_p50': 0, 'median_p50': 0
         }
 
-    p25_values = [float(b.p25_salary) for b in benchmarks if b.p25_salary]
-    p50_values = [float(b.p50_salary) for b in benchmarks if b.p50_salary]
-    p75_values = [float(b.p75_salary) for b in benchmarks if b.p75_salary]
-
     return {
-        'avg_p25': sum(p25_values) / len(p25_values) if p25_values else 0,
-        'avg_p50': sum(p50_values) / len(p50_values) if p50_values else 0,
-        'avg_p75': sum(p75_values) / len(p75_values) if p75_values else 0,
-        'min_p50': min(p50_values) if p50_values else 0,
-        'max_p50': max(p50_values) if p50_values else 0
+        'count': stats['count'],
+        'avg_p25': stats['p25']['avg'],
+        'avg_p50': stats['p50']['avg'],
+        'avg_p75': stats['p75']['avg'],
+        'min_p50': stats['p50']['min'],
+        'max_p50': stats['p50']['max'],
+        'median_p50': stats['p50']['median']
     }
 
 def get_level_name(level: int) -> str:
@@ -166,11 +214,6 @@ def get_zone_name(zone: int) -> str:
     }
     return zones.get(zone, f"Zone {zone}")
 
-def get_geographic_description(location: str) -> str:
+def get_geographic_description(location: Optional[str]) -> str:
     """Get geographic adjustment description"""
-    if any(city in location.lower() for city in ['san francisco', 'new york', 'seattle']):
-        return "40% premium for primary tech market"
-    elif any(city in location.lower() for city in ['austin', 'denver', 'portland']):
-        return "20% premium for secondary tech market"
-    else:
-        return "Base market rate"
\ No newline at end of file
+    return location_resolver.describe(location)
@@ -3,7 +3,8 @@ Chat API endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict
 import json
 import uuid
@@ -13,19 +14,19 @@ from app.models.database import get_db
 from app.models.conversation import Conversation
 from app.models.job_analysis import JobAnalysis
 from app.schemas.chat import ChatMessage, ChatSession
-from app.services.openai_service import OpenAIService
+from app.services.openai_service import create_openai_service
 
 router = APIRouter()
 
 @router.post("/session", response_model=ChatSession)
 async def create_chat_session(
     job_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new chat session for a job"""
 
     # Verify job exists
-    job = db.query(JobAnalysis).filter(JobAnalysis.id == job_id).first()
+    job = await db.scalar(select(JobAnalysis).where(JobAnalysis.id == job_id))
     if not job:
         raise HTTPException(status_code=404, detail="Job analysis not found")
 
@@ -39,8 +40,7 @@ async def create_chat_session(
     )
 
     db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
+    await db.commit()
 
     return {"session_id": session_id, "job_id": job_id}
 
@@ -48,20 +48,20 @@ async def create_chat_session(
 async def send_message(
     session_id: str,
     message: ChatMessage,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Send a message and get AI response"""
 
     # Get conversation
-    conversation = db.query(Conversation)\
-        .filter(Conversation.session_id == session_id)\
-        .first()
+    conversation = await db.scalar(
+        select(Conversation).where(Conversation.session_id == session_id)
+    )
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     # Get OpenAI response
-    openai_service = OpenAIService()
+    openai_service = create_openai_service()
 
     # Build message history
     messages = conversation.messages or []
@@ -79,7 +79,7 @@ async def send_message(
     conversation.last_message_at = datetime.utcnow()
     conversation.total_tokens_used += 100  # Estimate, should get from OpenAI
 
-    db.commit()
+    await db.commit()
 
     return {"response": response}
 
@@ -87,23 +87,23 @@ async def send_message(
 async def websocket_chat(
     websocket: WebSocket,
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """WebSocket endpoint for real-time chat"""
 
     await websocket.accept()
 
     # Get conversation
-    conversation = db.query(Conversation)\
-        .filter(Conversation.session_id == session_id)\
-        .first()
+    conversation = await db.scalar(
+        select(Conversation).where(Conversation.session_id == session_id)
+    )
 
     if not conversation:
         await websocket.send_text(json.dumps({"error": "Conversation not found"}))
         await websocket.close()
         return
 
-    openai_service = OpenAIService()
+    openai_service = create_openai_service()
 
     try:
         while True:
@@ -128,7 +128,7 @@ async def websocket_chat(
             messages.append({"role": "assistant", "content": response_text})
             conversation.messages = messages
             conversation.last_message_at = datetime.utcnow()
-            db.commit()
+            await db.commit()
 
             # Send completion signal
             await websocket.send_text(json.dumps({"complete": True}))
@@ -142,13 +142,13 @@ async def websocket_chat(
 @router.get("/history/{session_id}")
 async def get_chat_history(
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get chat history for a session"""
 
-    conversation = db.query(Conversation)\
-        .filter(Conversation.session_id == session_id)\
-        .first()
+    conversation = await db.scalar(
+        select(Conversation).where(Conversation.session_id == session_id)
+    )
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
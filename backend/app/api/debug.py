@@ -0,0 +1,33 @@
+"""
+Debug endpoints for captured request profiles
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiler import request_profiler
+
+router = APIRouter()
+
+@router.get("/profiles")
+async def list_profiles():
+    """List captured request profiles, newest first"""
+    return request_profiler.list()
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """Get a profile's metadata and top allocation changes"""
+    profile = request_profiler.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return {key: value for key, value in profile.items() if key != "collapsed"}
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+async def get_profile_stacks(profile_id: str):
+    """Get sampled stacks in collapsed format for flamegraph.pl or speedscope"""
+    profile = request_profiler.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return profile["collapsed"]
@@ -2,12 +2,14 @@
 Health check endpoints
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-import redis
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as redis
 
-from app.models.database import get_db
+from app.models.database import get_db, engine, async_engine, pool_status
 from app.core.config import settings
+from app.core.metrics import render_metrics
 
 router = APIRouter()
 
@@ -22,14 +24,13 @@ async def liveness():
     return {"status": "alive"}
 
 @router.get("/health/ready")
-async def readiness(db: Session = Depends(get_db)):
+async def readiness(db: AsyncSession = Depends(get_db)):
     """Readiness probe - checks database and Redis"""
     status = {"status": "ready", "checks": {}}
 
     # Check database
     try:
-        from sqlalchemy import text
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         status["checks"]["database"] = "ok"
     except Exception as e:
         status["status"] = "not ready"
@@ -38,10 +39,27 @@ async def readiness(db: Session = Depends(get_db)):
     # Check Redis
     try:
         r = redis.from_url(settings.REDIS_URL)
-        r.ping()
+        try:
+            await r.ping()
+        finally:
+            await r.close()
         status["checks"]["redis"] = "ok"
     except Exception as e:
         status["status"] = "not ready"
         status["checks"]["redis"] = f"error: {str(e)}"
 
-    return status
\ No newline at end of file
+    return status
+
+@router.get("/health/pool")
+async def pool_stats():
+    """Connection pool usage for this worker process"""
+    return {
+        "async": pool_status(async_engine),
+        "sync": pool_status(engine)
+    }
+
+@router.get("/metrics")
+async def metrics():
+    """Prometheus metrics, aggregated across workers in multiprocess mode"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -2,23 +2,26 @@
 Job-related API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import uuid
 
+from app.core.http_cache import make_etag, not_modified, set_cache_headers, wants_revalidation
+from app.core.timing import stage
 from app.models.database import get_db
 from app.models.job_analysis import JobAnalysis
 from app.schemas.job import JobAnalysisCreate, JobAnalysisResponse
 from app.services.document_processor import DocumentProcessor
-from app.services.openai_service import OpenAIService
+from app.services.openai_service import create_openai_service
 
 router = APIRouter()
 
 @router.post("/upload", response_model=JobAnalysisResponse)
 async def upload_job_description(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload and analyze a job description"""
 
@@ -30,7 +33,7 @@ async def upload_job_description(
         raise HTTPException(status_code=400, detail="Could not extract text from document")
 
     # Analyze with OpenAI
-    openai_service = OpenAIService()
+    openai_service = create_openai_service()
     analysis = await openai_service.analyze_job_description(text)
 
     # Create job analysis record
@@ -53,35 +56,54 @@ async def upload_job_description(
     )
 
     db.add(job_analysis)
-    db.commit()
-    db.refresh(job_analysis)
+    with stage("db_commit"):
+        await db.commit()
+    await db.refresh(job_analysis)
 
     return job_analysis
 
 @router.get("/{job_id}", response_model=JobAnalysisResponse)
 async def get_job_analysis(
     job_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get job analysis by ID"""
-    job = db.query(JobAnalysis).filter(JobAnalysis.id == job_id).first()
+
+    # Revalidation reads only the row's timestamps
+    if wants_revalidation(request):
+        version = (await db.execute(
+            select(JobAnalysis.created_at, JobAnalysis.updated_at).where(JobAnalysis.id == job_id)
+        )).first()
+        if version:
+            cached = not_modified(request, job_etag(job_id, *version))
+            if cached:
+                return cached
+
+    job = await db.scalar(select(JobAnalysis).where(JobAnalysis.id == job_id))
 
     if not job:
         raise HTTPException(status_code=404, detail="Job analysis not found")
 
+    set_cache_headers(response, job_etag(job_id, job.created_at, job.updated_at))
     return job
 
+def job_etag(job_id, created_at, updated_at) -> str:
+    return make_etag("job", str(job_id).lower(), created_at, updated_at)
+
 @router.get("/", response_model=List[JobAnalysisResponse])
 async def list_job_analyses(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all job analyses"""
-    jobs = db.query(JobAnalysis)\
-        .order_by(JobAnalysis.created_at.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    jobs = await db.scalars(
+        select(JobAnalysis)
+        .order_by(JobAnalysis.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
 
-    return jobs
\ No newline at end of file
+    return jobs.all()
\ No newline at end of file
@@ -3,7 +3,7 @@ Application configuration settings
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # Application
@@ -14,12 +14,70 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables the server-side timeout
+
+    # Benchmark cube (in-process benchmark lookups; ignored with sketch blending)
+    BENCHMARK_CUBE_ENABLED: bool = False
+
+    # Benchmark rollups (read precomputed aggregates instead of raw rows)
+    BENCHMARK_ROLLUPS_ENABLED: bool = False
+
+    # Blend benchmark sources through rollup quantile sketches instead of averaging
+    BENCHMARK_SKETCH_BLENDING: bool = False
+
+    # Read only benchmarks whose data_date falls in the last N calendar years (0 = all),
+    # so lookups touch only the current vintage partitions. Rollups are kept per
+    # vintage year and filtered the same way
+    BENCHMARK_VINTAGE_YEARS: int = 0
+
+    # Skill weights (JSON file overriding the default premium/demand tables)
+    SKILL_WEIGHTS_FILE: Optional[str] = None
+
+    # Location resolution
+    LOCATION_CACHE_SIZE: int = 4096
+
+    # Salary result cache
+    SALARY_CACHE_ENABLED: bool = False
+    SALARY_CACHE_MAX_ENTRIES: int = 10000
+    SALARY_CACHE_TTL_SECONDS: int = 3600
+    SALARY_CACHE_REDIS_ENABLED: bool = False
+    DATASET_VERSION_TTL_SECONDS: float = 5.0
+
+    # Prometheus request/database metrics (set PROMETHEUS_MULTIPROC_DIR for multi-worker)
+    METRICS_ENABLED: bool = False
+
+    # Per-request stage timing (Server-Timing header and log line)
+    SERVER_TIMING_ENABLED: bool = False
+
+    # Conditional GET for job, salary and benchmark detail reads (0 = revalidate every time)
+    HTTP_ETAGS_ENABLED: bool = True
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 0
+
+    # Request profiler (X-Profile header or ?profile=1; staging/debug only)
+    PROFILER_ENABLED: bool = False
+    PROFILER_INTERVAL_MS: float = 5.0
+    PROFILER_MAX_PROFILES: int = 20
+    PROFILER_TRACEBACK_FRAMES: int = 1
 
     # Redis
     REDIS_URL: str
 
-    # OpenAI
+    # OpenAI (OPENAI_BASE_URL points the client at another server, e.g. the load-test stand-in)
     OPENAI_API_KEY: str
+    OPENAI_BASE_URL: Optional[str] = None
+
+    # Deterministic mock LLM for load tests (latency is lognormal around the median)
+    OPENAI_MOCK_ENABLED: bool = False
+    MOCK_OPENAI_SEED: int = 0
+    MOCK_OPENAI_LATENCY_MS: float = 0.0
+    MOCK_OPENAI_LATENCY_SIGMA: float = 0.0
+    MOCK_OPENAI_CHUNK_DELAY_MS: float = 0.0
 
     # Security
     SECRET_KEY: str
@@ -38,4 +96,9 @@ class Settings(BaseSettings):
         """Get CORS origins as list"""
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
 
+    @property
+    def benchmark_cube_active(self) -> bool:
+        """Cube lookups average percentile columns, so sketch blending bypasses them"""
+        return self.BENCHMARK_CUBE_ENABLED and not self.BENCHMARK_SKETCH_BLENDING
+
 settings = Settings()
\ No newline at end of file
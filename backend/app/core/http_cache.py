@@ -0,0 +1,58 @@
+"""
+Conditional GET support: strong ETags, If-None-Match and Cache-Control
+"""
+
+from typing import Optional
+import hashlib
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the values a response is derived from
+
+    Callers pass identifiers and version markers (row ids, ``updated_at``,
+    dataset version), never the payload itself, so the ETag can be computed
+    before the response is built.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def cache_control() -> str:
+    if settings.HTTP_CACHE_MAX_AGE_SECONDS > 0:
+        return f"private, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, must-revalidate"
+    # Stored by the browser but revalidated on every use
+    return "private, no-cache"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match lists ``etag`` (weak comparison, per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response if the client already holds ``etag``, else None"""
+    if not etag_matches(request, etag):
+        return None
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control()})
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    if not settings.HTTP_ETAGS_ENABLED:
+        return
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control()
+
+
+def wants_revalidation(request: Request) -> bool:
+    """Whether to run the lightweight version check before loading a resource"""
+    return settings.HTTP_ETAGS_ENABLED and "if-none-match" in request.headers
@@ -0,0 +1,155 @@
+"""
+Prometheus metrics for requests, database, caches and OpenAI calls
+
+Metrics are process-local unless PROMETHEUS_MULTIPROC_DIR is set before the
+app starts, in which case each worker writes to that directory and /metrics
+aggregates every uvicorn/gunicorn worker. Only counters and histograms are
+used, so values from exited workers keep counting toward the totals.
+"""
+
+from typing import Dict
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"]
+)
+
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "Database statements executed",
+    ["engine", "operation"]
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Database statement latency",
+    ["engine", "operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+OPENAI_CACHE_LOOKUPS = Counter(
+    "openai_cache_lookups_total",
+    "Redis lookups for cached OpenAI results, by key prefix and result",
+    ["prefix", "result"]
+)
+
+OPENAI_LATENCY = Histogram(
+    "openai_request_duration_seconds",
+    "OpenAI API call latency",
+    ["operation"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+)
+
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total",
+    "OpenAI tokens used",
+    ["operation", "kind"]
+)
+
+OPENAI_COST = Counter(
+    "openai_estimated_cost_dollars_total",
+    "Estimated OpenAI spend",
+    ["operation"]
+)
+
+SALARY_CALCULATIONS = Counter(
+    "salary_calculations_total",
+    "SalaryEngine calculations by path; 'estimate' is the no-market-data fallback",
+    ["path"]
+)
+
+
+def render_metrics() -> tuple:
+    """Return (body, content type) for the /metrics endpoint"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Count and time every statement run on a (sync) engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        DB_QUERIES.labels(name, operation).inc()
+        DB_QUERY_LATENCY.labels(name, operation).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        if context.connection is not None:
+            starts = context.connection.info.get("query_start")
+            if starts:
+                starts.pop()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template
+
+    Routes are labelled by their path template (``/api/jobs/{job_id}``), not
+    the concrete URL, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_LATENCY.labels(
+                scope["method"],
+                self._route(scope),
+                str(status["code"])
+            ).observe(time.perf_counter() - started)
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+
+        route = self._routes.get(endpoint)
+        if route is None:
+            # Built lazily because routers are included after middleware is added
+            self._routes = {
+                getattr(r, "endpoint", None): r.path
+                for r in scope["app"].router.routes
+            }
+            route = self._routes.setdefault(endpoint, "unmatched")
+        return route
@@ -0,0 +1,227 @@
+"""
+On-demand request profiling: sampled CPU stacks and allocation diffs
+"""
+
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval from a helper thread
+
+    Stacks are kept in collapsed form ("outer;inner;leaf"), the input format of
+    flamegraph.pl and speedscope. Only the sampled thread is observed, so for
+    async requests the profile also includes other work on the event loop.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+class RequestProfiler:
+    """Profiles one request at a time and keeps the most recent results"""
+
+    def __init__(
+        self,
+        max_profiles: int = 20,
+        interval_ms: float = 5.0,
+        top_allocations: int = 25,
+        traceback_frames: int = 1
+    ):
+        self.max_profiles = max_profiles
+        self.interval = interval_ms / 1000
+        self.top_allocations = top_allocations
+        self.traceback_frames = traceback_frames
+        self._profiles: "OrderedDict[str, Dict]" = OrderedDict()
+        self._busy = threading.Lock()
+
+    def begin(self, memory: bool = False) -> Optional[Dict]:
+        """Start profiling the calling thread, or return None if a profile is running
+
+        ``memory`` also diffs tracemalloc snapshots, which slows allocation-heavy
+        code several times over, so it is opt-in.
+        """
+
+        if not self._busy.acquire(blocking=False):
+            return None
+
+        started_tracing = memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.traceback_frames)
+
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        state = {
+            "id": uuid.uuid4().hex[:12],
+            "sampler": sampler,
+            "started_tracing": started_tracing,
+            "snapshot": tracemalloc.take_snapshot() if memory else None,
+            "started": time.perf_counter()
+        }
+        sampler.start()
+        return state
+
+    def end(self, state: Dict, method: str, path: str, status: Optional[int]) -> None:
+        """Stop profiling and store the result under the id from begin()"""
+
+        try:
+            duration = time.perf_counter() - state["started"]
+            state["sampler"].stop()
+
+            diff = []
+            if state["snapshot"] is not None:
+                after = tracemalloc.take_snapshot()
+                if state["started_tracing"]:
+                    tracemalloc.stop()
+
+                filters = [
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__)
+                ]
+                diff = after.filter_traces(filters).compare_to(
+                    state["snapshot"].filter_traces(filters), "lineno"
+                )
+
+            profile_id = state["id"]
+            self._profiles[profile_id] = {
+                "id": profile_id,
+                "method": method,
+                "path": path,
+                "status": status,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "duration_ms": round(duration * 1000, 2),
+                "interval_ms": self.interval * 1000,
+                "samples": sum(state["sampler"].samples.values()),
+                "memory": state["snapshot"] is not None,
+                "collapsed": state["sampler"].collapsed(),
+                "allocations": [
+                    {
+                        "location": str(stat.traceback),
+                        "size_diff_kb": round(stat.size_diff / 1024, 1),
+                        "size_kb": round(stat.size / 1024, 1),
+                        "count_diff": stat.count_diff
+                    }
+                    for stat in diff[:self.top_allocations]
+                ]
+            }
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+            logger.info(f"Captured profile {profile_id} for {method} {path} ({duration * 1000:.1f}ms)")
+        finally:
+            self._busy.release()
+
+    def list(self) -> List[Dict]:
+        return [
+            {key: value for key, value in profile.items() if key not in ("collapsed", "allocations")}
+            for profile in reversed(self._profiles.values())
+        ]
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        return self._profiles.get(profile_id)
+
+
+class ProfilerMiddleware:
+    """ASGI middleware profiling requests sent with ``X-Profile: 1`` or ``?profile=1``
+
+    Use ``memory`` instead of ``1`` to add a tracemalloc allocation diff. The
+    response carries an ``X-Profile-Id`` header pointing at
+    /debug/profiles/{id}, or ``X-Profile-Id: busy`` if another request was
+    being profiled.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        mode = self._requested_mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = self.profiler.begin(memory=mode == "memory")
+        profile_id = state["id"] if state else "busy"
+        status = {"code": None}
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        if state is None:
+            await self.app(scope, receive, send_with_profile_id)
+            return
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            self.profiler.end(state, scope["method"], scope["path"], status["code"])
+
+    @staticmethod
+    def _requested_mode(scope) -> Optional[str]:
+        """Return "cpu", "memory" or None from the header or query flag"""
+
+        value = None
+        for name, header in scope.get("headers", []):
+            if name == b"x-profile":
+                value = header.decode("latin-1")
+        if value is None and b"profile=" in scope.get("query_string", b""):
+            value = parse_qs(scope["query_string"].decode()).get("profile", [""])[0]
+
+        value = (value or "").strip().lower()
+        if value in ("", "0", "false"):
+            return None
+        return "memory" if value in ("memory", "mem", "all") else "cpu"
+
+
+# Shared profiler, installed when PROFILER_ENABLED is set
+request_profiler = RequestProfiler(
+    max_profiles=settings.PROFILER_MAX_PROFILES,
+    interval_ms=settings.PROFILER_INTERVAL_MS,
+    traceback_frames=settings.PROFILER_TRACEBACK_FRAMES
+)
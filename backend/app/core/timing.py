@@ -0,0 +1,151 @@
+"""
+Per-request stage timing reported through Server-Timing headers
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    """Accumulated duration and call count per stage for one request"""
+
+    __slots__ = ("started", "stages")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, list] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        entry = self.stages.get(name)
+        if entry is None:
+            self.stages[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header(self) -> str:
+        """Format as a Server-Timing header value, durations in milliseconds"""
+        metrics = [
+            f"{name};dur={seconds * 1000:.2f}"
+            for name, (seconds, _) in self.stages.items()
+        ]
+        metrics.append(f"total;dur={self.total() * 1000:.2f}")
+        return ", ".join(metrics)
+
+    def to_dict(self) -> Dict:
+        return {
+            "total_ms": round(self.total() * 1000, 2),
+            "stages": {
+                name: {"ms": round(seconds * 1000, 2), "count": count}
+                for name, (seconds, count) in self.stages.items()
+            }
+        }
+
+
+# Collector for the current request; None when timing is disabled or outside a request
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+class stage:
+    """Time a block as a named stage of the current request
+
+    Costs one context variable lookup when no request is being timed.
+    """
+
+    __slots__ = ("name", "timings", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.timings = _current.get()
+        if self.timings is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.timings is not None:
+            self.timings.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def timed(name: str):
+    """Decorator form of ``stage`` for sync and async functions"""
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware that collects stage timings and reports them
+
+    Adds a ``Server-Timing`` header when the response starts and logs one
+    structured line per request once it finishes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = {"code": None}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.header().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            summary = timings.to_dict()
+            stages = " ".join(
+                f"{name}={values['ms']}ms" for name, values in summary["stages"].items()
+            )
+            logger.info(
+                f"Request timing {scope['method']} {scope['path']} "
+                f"status={status['code']} total={summary['total_ms']}ms {stages}".rstrip(),
+                extra={
+                    "request_timing": {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status["code"],
+                        **summary
+                    }
+                }
+            )
@@ -8,7 +8,13 @@ from contextlib import asynccontextmanager
 import logging
 
 from app.core.config import settings
-from app.api import jobs, analysis, chat, health, benchmarks
+from app.core.timing import ServerTimingMiddleware
+from app.core.metrics import MetricsMiddleware, instrument_engine
+from app.core.profiler import ProfilerMiddleware, request_profiler
+from app.api import jobs, analysis, chat, health, benchmarks, debug
+from app.models.database import AsyncSessionLocal, async_engine, engine
+from app.services.benchmark_cube import benchmark_cube
+from app.services.location_resolver import location_resolver
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,9 +25,26 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            await db.run_sync(location_resolver.refresh)
+        except Exception as e:
+            logger.error(f"Metro load failed, using default locations: {e}")
+
+    if settings.BENCHMARK_CUBE_ENABLED and not settings.benchmark_cube_active:
+        logger.warning("Benchmark cube not loaded: BENCHMARK_SKETCH_BLENDING prices from sketches")
+    elif settings.BENCHMARK_CUBE_ENABLED:
+        async with AsyncSessionLocal() as db:
+            try:
+                await db.run_sync(benchmark_cube.refresh)
+            except Exception as e:
+                logger.error(f"Benchmark cube load failed, using database queries: {e}")
+
     yield
     # Shutdown
     logger.info("Shutting down application")
+    await async_engine.dispose()
 
 # Create FastAPI app
 app = FastAPI(
@@ -42,6 +65,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record Prometheus request and database metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine, "sync")
+    instrument_engine(async_engine.sync_engine, "async")
+
+# Report per-request stage timings
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
 # Include routers
 app.include_router(health.router, tags=["Health"])
 app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
@@ -49,6 +82,11 @@ app.include_router(analysis.router, prefix="/api/analysis", tags=["Analysis"])
 app.include_router(chat.router, prefix="/api/chat", tags=["Chat"])
 app.include_router(benchmarks.router, prefix="/api/benchmarks", tags=["Benchmarks"])
 
+# Profile individual requests on demand (staging/debug only)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware, profiler=request_profiler)
+    app.include_router(debug.router, prefix="/debug", tags=["Debug"])
+
 @app.get("/")
 async def root():
     """Root endpoint"""
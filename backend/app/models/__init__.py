@@ -1,16 +1,24 @@
-from .database import Base, engine, SessionLocal, get_db
+from .database import Base, engine, async_engine, SessionLocal, AsyncSessionLocal, get_db
 from .job_analysis import JobAnalysis
 from .salary_range import SalaryRange
 from .benchmark import Benchmark
+from .benchmark_rollup import BenchmarkRollup
 from .conversation import Conversation
+from .geo_metro import GeoMetro
+from .dataset_version import DatasetVersion
 
 __all__ = [
     'Base',
     'engine',
+    'async_engine',
     'SessionLocal',
+    'AsyncSessionLocal',
     'get_db',
     'JobAnalysis',
     'SalaryRange',
     'Benchmark',
-    'Conversation'
+    'BenchmarkRollup',
+    'Conversation',
+    'GeoMetro',
+    'DatasetVersion'
 ]
\ No newline at end of file
@@ -2,7 +2,7 @@
 Benchmark model for market salary data
 """
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, DECIMAL, Date
+from sqlalchemy import CHAR, Column, String, Integer, Float, DateTime, DECIMAL, Date, Index
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.sql import func
 import uuid
@@ -11,7 +11,12 @@ from .database import Base
 
 class Benchmark(Base):
     __tablename__ = "benchmarks"
-    __table_args__ = {"schema": "compensation"}
+    # Mirrors scripts/create_database.sql and create_indexes.sql: yearly range
+    # partitions on data_date, so every unique key includes data_date
+    __table_args__ = (
+        Index("idx_benchmarks_natural_key", "natural_key", "data_date", unique=True),
+        {"schema": "compensation", "postgresql_partition_by": "RANGE (data_date)"}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -43,8 +48,13 @@ class Benchmark(Base):
     trend_velocity = Column(String(20))
 
     # Metadata
-    data_date = Column(Date)
+    data_date = Column(Date, primary_key=True)  # partition key (yearly partitions)
     currency = Column(String(10), default='USD')
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    expires_at = Column(DateTime(timezone=True))
\ No newline at end of file
+    expires_at = Column(DateTime(timezone=True))
+
+    # Delta imports (scripts/import_data.py); deleted_at marks tombstoned rows
+    natural_key = Column(CHAR(32))
+    row_fingerprint = Column(CHAR(32))
+    deleted_at = Column(DateTime(timezone=True))
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Benchmark rollup model for precomputed market data aggregates
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, DECIMAL, Date
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+import uuid
+
+from .database import Base
+
+class BenchmarkRollup(Base):
+    __tablename__ = "benchmark_rollups"
+    __table_args__ = {"schema": "compensation"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Cell key
+    job_family = Column(String(100))
+    level = Column(Integer)
+    zone = Column(Integer)
+    source_type = Column(String(50), nullable=False)
+    vintage_year = Column(Integer, nullable=False)  # calendar year of data_date
+    row_count = Column(Integer, nullable=False, default=0)
+
+    # Percentile aggregates (zero and null values excluded)
+    p10_count = Column(Integer)
+    p10_avg = Column(DECIMAL(12, 2))
+    p10_min = Column(DECIMAL(12, 2))
+    p10_max = Column(DECIMAL(12, 2))
+    p10_median = Column(DECIMAL(12, 2))
+
+    p25_count = Column(Integer)
+    p25_avg = Column(DECIMAL(12, 2))
+    p25_min = Column(DECIMAL(12, 2))
+    p25_max = Column(DECIMAL(12, 2))
+    p25_median = Column(DECIMAL(12, 2))
+
+    p50_count = Column(Integer)
+    p50_avg = Column(DECIMAL(12, 2))
+    p50_min = Column(DECIMAL(12, 2))
+    p50_max = Column(DECIMAL(12, 2))
+    p50_median = Column(DECIMAL(12, 2))
+
+    p75_count = Column(Integer)
+    p75_avg = Column(DECIMAL(12, 2))
+    p75_min = Column(DECIMAL(12, 2))
+    p75_max = Column(DECIMAL(12, 2))
+    p75_median = Column(DECIMAL(12, 2))
+
+    p90_count = Column(Integer)
+    p90_avg = Column(DECIMAL(12, 2))
+    p90_min = Column(DECIMAL(12, 2))
+    p90_max = Column(DECIMAL(12, 2))
+    p90_median = Column(DECIMAL(12, 2))
+
+    # Mergeable quantile sketch built from the cell's survey rows
+    sketch = Column(JSONB)
+
+    # Metadata
+    latest_data_date = Column(Date)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -2,26 +2,135 @@
 Database connection and session management
 """
 
+from typing import Dict
+import threading
+import time
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
 
-# Create engine
-engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+def async_database_url(url: str) -> str:
+    """Point a PostgreSQL URL at the asyncpg driver"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+class PoolWaitStats:
+    """Time spent waiting for a pooled connection, per pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3)
+            }
+
+class _TimedPoolMixin:
+    """Record how long each checkout waits for a free connection"""
+
+    wait_stats: PoolWaitStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
 
-# Create session factory
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def engine_options(statement_timeout_option: Dict) -> Dict:
+    """Pool and logging options shared by the sync and async engines"""
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = statement_timeout_option
+    return options
+
+def pool_status(engine) -> Dict:
+    """Live checkout, overflow and wait statistics for an engine's pool"""
+    pool = engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow
+    }
+    if isinstance(pool, _TimedPoolMixin):
+        status["wait"] = pool.wait_stats.stats()
+    return status
+
+# Create engines: async for API requests, sync for scripts and startup jobs
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=TimedQueuePool,
+    **engine_options({"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"})
+)
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    poolclass=TimedAsyncAdaptedQueuePool,
+    **engine_options({"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}})
+)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Create base class for models
 Base = declarative_base()
 
-def get_db():
+async def get_db():
     """
-    Dependency to get database session
+    Dependency to get an async database session
+
+    Pricing goes through app.services.salary_pricing, which fetches on this
+    session and runs SalaryEngine in the threadpool.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""
+Dataset version model for cache invalidation
+"""
+
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+
+from .database import Base
+
+class DatasetVersion(Base):
+    __tablename__ = "dataset_versions"
+    __table_args__ = {"schema": "compensation"}
+
+    name = Column(String(50), primary_key=True)  # e.g. 'benchmarks'
+    version = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
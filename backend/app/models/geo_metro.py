@@ -0,0 +1,25 @@
+"""
+Geographic metro model for location resolution
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, DECIMAL
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+import uuid
+
+from .database import Base
+
+class GeoMetro(Base):
+    __tablename__ = "geo_metros"
+    __table_args__ = {"schema": "compensation"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    metro = Column(String(100), unique=True, nullable=False)
+    aliases = Column(JSONB, default=list)  # e.g. ["sf", "bay area"]
+    state = Column(String(10))
+    zone = Column(Integer)
+    geographic_factor = Column(DECIMAL(5, 3), nullable=False, default=1.0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
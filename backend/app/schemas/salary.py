@@ -56,6 +56,57 @@ class SalaryCalculationResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class BatchSalaryCalculationRequest(BaseModel):
+    """Request for pricing many jobs at once"""
+    job_ids: List[UUID] = Field(..., min_length=1, max_length=20000)
+
+class BatchSalaryResult(BaseModel):
+    """Summary of one salary range from a batch calculation; id is None when not saved"""
+    id: Optional[UUID] = None
+    job_analysis_id: UUID
+    recommended_min: Optional[Decimal] = None
+    recommended_target: Optional[Decimal] = None
+    recommended_max: Optional[Decimal] = None
+    confidence_score: Optional[Decimal] = None
+    data_sources: Optional[List[str]] = []
+
+class BatchSalaryCalculationResponse(BaseModel):
+    """Response for a batch salary calculation"""
+    count: int
+    missing_job_ids: List[UUID] = []
+    results: List[BatchSalaryResult] = []
+
+class ScenarioGridRequest(BaseModel):
+    """Levels, zones and locations to price a job across"""
+    levels: List[int] = Field(..., min_length=1, max_length=20)
+    zones: List[int] = Field(..., min_length=1, max_length=10)
+    locations: Optional[List[Optional[str]]] = Field(default=None, max_length=100)
+
+class ScenarioResult(BaseModel):
+    """Salary range for one level/zone/location combination"""
+    level: int
+    zone: int
+    location: Optional[str] = None
+    min: float
+    p25: float
+    target: float
+    p75: float
+    max: float
+    recommended_min: float
+    recommended_target: float
+    recommended_max: float
+    geographic_factor: float
+    market_adjustment: float
+    skills_premium: float
+    sources: List[str] = []
+    confidence: float
+
+class ScenarioGridResponse(BaseModel):
+    """Scenario grid for a job"""
+    job_analysis_id: UUID
+    job_title: str
+    scenarios: List[ScenarioResult] = []
+
 class MarketDataResponse(BaseModel):
     """Market benchmark data response"""
     source_type: str
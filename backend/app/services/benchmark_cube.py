@@ -0,0 +1,201 @@
+"""
+In-process benchmark cube for fast market data lookups
+"""
+
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from datetime import datetime
+import hashlib
+import threading
+import logging
+
+import numpy as np
+
+from app.models.benchmark import Benchmark
+from app.services.benchmark_stats import FALLBACK_LIMIT, active_benchmark_filters
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = ("p10", "p25", "p50", "p75", "p90")
+
+CellKey = Tuple[Optional[str], Optional[int], Optional[int], str]
+
+
+class _CubeState:
+    """Immutable snapshot of the loaded benchmark data"""
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        sources: np.ndarray,
+        cells: Dict[CellKey, np.ndarray],
+        by_family: Dict[Tuple, np.ndarray],
+        by_level_zone: Dict[Tuple, np.ndarray],
+    ):
+        self.values = values
+        self.sources = sources
+        self.cells = cells
+        self.by_family = by_family
+        self.by_level_zone = by_level_zone
+        self.loaded_at = datetime.utcnow()
+        self.generation = self._digest(values, cells)
+
+    @staticmethod
+    def _digest(values: np.ndarray, cells: Dict[CellKey, np.ndarray]) -> str:
+        """Content hash of the snapshot: workers that load the same rows agree on it"""
+        digest = hashlib.sha256(values.tobytes())
+        for key, idx in cells.items():
+            digest.update(repr(key).encode())
+            digest.update(idx.tobytes())
+        return digest.hexdigest()[:16]
+
+
+class BenchmarkCube:
+    """Benchmarks held as NumPy arrays indexed by (job_family, level, zone, source_type)
+
+    Lookups return the same shape as ``SalaryEngine._get_market_benchmarks`` so the
+    engine can answer from memory instead of querying ``compensation.benchmarks``.
+    Data is only loaded on ``refresh``; readers always see a complete snapshot.
+    """
+
+    def __init__(self):
+        self._state: Optional[_CubeState] = None
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._state is not None
+
+    @property
+    def generation(self) -> Optional[str]:
+        """Identifies the loaded snapshot; changes whenever a rebuild changes the data"""
+        state = self._state
+        return state.generation if state is not None else None
+
+    def refresh(self, db: Session) -> Dict:
+        """Reload all benchmarks from the database and swap in the new snapshot"""
+
+        with self._refresh_lock:
+            rows = db.query(
+                Benchmark.job_family,
+                Benchmark.level,
+                Benchmark.zone,
+                Benchmark.source_type,
+                Benchmark.p10_salary,
+                Benchmark.p25_salary,
+                Benchmark.p50_salary,
+                Benchmark.p75_salary,
+                Benchmark.p90_salary
+            ).filter(*active_benchmark_filters()).all()
+
+            self.load_rows(rows)
+
+        stats = self.stats()
+        logger.info(f"Benchmark cube refreshed: {stats['rows']} rows, {stats['cells']} cells")
+        return stats
+
+    def load_rows(self, rows: List[Tuple]) -> None:
+        """Build the cube from (job_family, level, zone, source_type, p10..p90) tuples"""
+
+        count = len(rows)
+        values = np.full((count, len(PERCENTILES)), np.nan)
+        sources = np.empty(count, dtype=object)
+
+        cell_rows: Dict[CellKey, List[int]] = {}
+        family_rows: Dict[Tuple, List[int]] = {}
+        level_zone_rows: Dict[Tuple, List[int]] = {}
+
+        for i, (job_family, level, zone, source_type, *percentiles) in enumerate(rows):
+            # Null and zero percentiles are skipped, as in the SQL aggregation
+            values[i] = [float(v) if v else np.nan for v in percentiles]
+            sources[i] = source_type
+
+            cell_rows.setdefault((job_family, level, zone, source_type), []).append(i)
+            family_rows.setdefault((job_family, level, zone), []).append(i)
+            level_zone_rows.setdefault((level, zone), []).append(i)
+
+        def to_index(groups: Dict) -> Dict:
+            return {key: np.asarray(idx, dtype=np.intp) for key, idx in groups.items()}
+
+        self._state = _CubeState(
+            values=values,
+            sources=sources,
+            cells=to_index(cell_rows),
+            by_family=to_index(family_rows),
+            by_level_zone={
+                key: np.asarray(idx[:FALLBACK_LIMIT], dtype=np.intp)
+                for key, idx in level_zone_rows.items()
+            },
+        )
+
+    def lookup(self, job_family: Optional[str], level: int, zone: int) -> Optional[Dict]:
+        """Aggregate benchmarks the same way as SalaryEngine._get_market_benchmarks"""
+
+        state = self._state
+        if state is None:
+            return None
+
+        if job_family:
+            idx = state.by_family.get((job_family, level, zone))
+            if idx is not None:
+                return self._aggregate(state, idx)
+
+        idx = state.by_level_zone.get((level, zone))
+        if idx is not None:
+            return self._aggregate(state, idx)
+
+        return None
+
+    def cell(
+        self,
+        job_family: Optional[str],
+        level: int,
+        zone: int,
+        source_type: str
+    ) -> Optional[Dict]:
+        """Aggregate a single (job_family, level, zone, source_type) cell"""
+
+        state = self._state
+        if state is None:
+            return None
+
+        idx = state.cells.get((job_family, level, zone, source_type))
+        if idx is None:
+            return None
+
+        return self._aggregate(state, idx)
+
+    def stats(self) -> Dict:
+        """Describe the currently loaded snapshot"""
+
+        state = self._state
+        if state is None:
+            return {"loaded": False, "rows": 0, "cells": 0, "loaded_at": None, "generation": None}
+
+        return {
+            "loaded": True,
+            "rows": int(state.values.shape[0]),
+            "cells": len(state.cells),
+            "loaded_at": state.loaded_at.isoformat(),
+            "generation": state.generation
+        }
+
+    def clear(self) -> None:
+        self._state = None
+
+    @staticmethod
+    def _aggregate(state: _CubeState, idx: np.ndarray) -> Dict:
+        values = state.values[idx]
+        present = ~np.isnan(values)
+        counts = present.sum(axis=0)
+        sums = np.where(present, values, 0.0).sum(axis=0)
+        means = np.divide(sums, counts, out=np.zeros(len(PERCENTILES)), where=counts > 0)
+
+        result = {name: float(mean) for name, mean in zip(PERCENTILES, means)}
+        result["sources"] = list(set(state.sources[idx]))
+        result["data_points"] = int(idx.size)
+        return result
+
+
+# Shared cube used by SalaryEngine when BENCHMARK_CUBE_ENABLED is set
+benchmark_cube = BenchmarkCube()
@@ -0,0 +1,619 @@
+"""
+SQL aggregation of benchmark percentiles per source
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, func, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.models.benchmark import Benchmark
+from app.models.benchmark_rollup import BenchmarkRollup
+from app.services.quantile_sketch import QuantileSketch, SURVEY_QUANTILES
+
+PERCENTILES = ("p10", "p25", "p50", "p75", "p90")
+
+# Market data lookups are keyed by (job_family, level, zone)
+MarketKey = Tuple[Optional[str], int, int]
+
+# Rows sampled by the level/zone fallback when no job family matches
+FALLBACK_LIMIT = 10
+
+
+def vintage_start(today: Optional[date] = None) -> Optional[date]:
+    """First data_date of the current vintage window, or None to read every vintage"""
+    if settings.BENCHMARK_VINTAGE_YEARS <= 0:
+        return None
+    today = today or date.today()
+    return date(today.year - settings.BENCHMARK_VINTAGE_YEARS + 1, 1, 1)
+
+
+def active_benchmark_filters() -> List:
+    """Filters for benchmark rows lookups may use: not tombstoned, current vintage
+
+    The data_date bound lets Postgres prune older yearly partitions.
+    """
+    filters = [Benchmark.deleted_at.is_(None)]
+    start = vintage_start()
+    if start is not None:
+        filters.append(Benchmark.data_date >= start)
+    return filters
+
+
+def active_rollup_filters() -> List:
+    """Filters limiting rollups to the vintage years active_benchmark_filters reads"""
+    start = vintage_start()
+    if start is None:
+        return []
+    return [BenchmarkRollup.vintage_year >= start.year]
+
+
+def benchmark_stats_statement(
+    level: int,
+    zone: int,
+    job_family: Optional[str] = None,
+    source_types: Optional[Iterable[str]] = None,
+    limit: Optional[int] = None
+) -> Select:
+    """Build a query returning one aggregate row per source_type
+
+    Zero and null percentiles are ignored, matching the Python aggregation the
+    engine used before. ``limit`` restricts the rows aggregated, which the engine
+    uses for its level/zone fallback.
+    """
+
+    rows = select(
+        Benchmark.source_type,
+        *(getattr(Benchmark, f"{name}_salary") for name in PERCENTILES)
+    ).where(
+        Benchmark.level == level,
+        Benchmark.zone == zone,
+        *active_benchmark_filters()
+    )
+    if job_family:
+        rows = rows.where(Benchmark.job_family == job_family)
+    if source_types:
+        rows = rows.where(Benchmark.source_type.in_(list(source_types)))
+    if limit:
+        rows = rows.limit(limit)
+    rows = rows.subquery()
+
+    columns = [rows.c.source_type, *_aggregate_columns(rows)]
+    return select(*columns).group_by(rows.c.source_type)
+
+
+def benchmark_grid_statement(
+    levels: Iterable[int],
+    zones: Iterable[int],
+    job_family: str
+) -> Select:
+    """Build a query aggregating a job family's (level, zone) cells at once
+
+    Rows are grouped by level, zone and source_type.
+    """
+
+    rows = select(
+        Benchmark.level,
+        Benchmark.zone,
+        Benchmark.source_type,
+        *(getattr(Benchmark, f"{name}_salary") for name in PERCENTILES)
+    ).where(
+        Benchmark.level.in_(list(levels)),
+        Benchmark.zone.in_(list(zones)),
+        Benchmark.job_family == job_family,
+        *active_benchmark_filters()
+    ).subquery()
+
+    keys = [rows.c.level, rows.c.zone, rows.c.source_type]
+    return select(*keys, *_aggregate_columns(rows)).group_by(*keys)
+
+
+def benchmark_cells_statement(keys: Iterable[MarketKey]) -> Select:
+    """Build a query aggregating several (job_family, level, zone) cells at once
+
+    Rows are grouped by job family, level, zone and source_type.
+    """
+
+    rows = select(
+        Benchmark.job_family,
+        Benchmark.level,
+        Benchmark.zone,
+        Benchmark.source_type,
+        *(getattr(Benchmark, f"{name}_salary") for name in PERCENTILES)
+    ).where(
+        tuple_(Benchmark.job_family, Benchmark.level, Benchmark.zone).in_(list(keys)),
+        *active_benchmark_filters()
+    ).subquery()
+
+    keys = [rows.c.job_family, rows.c.level, rows.c.zone, rows.c.source_type]
+    return select(*keys, *_aggregate_columns(rows)).group_by(*keys)
+
+
+def benchmark_fallback_statement(cells: Iterable[Tuple[int, int]], limit: int = FALLBACK_LIMIT) -> Select:
+    """Build the level/zone fallback for several (level, zone) cells at once
+
+    Each cell aggregates at most ``limit`` of its rows, like
+    benchmark_stats_statement with a limit, numbered per cell by a window.
+    """
+
+    ranked = select(
+        Benchmark.level,
+        Benchmark.zone,
+        Benchmark.source_type,
+        *(getattr(Benchmark, f"{name}_salary") for name in PERCENTILES),
+        func.row_number().over(partition_by=(Benchmark.level, Benchmark.zone)).label("cell_row")
+    ).where(
+        tuple_(Benchmark.level, Benchmark.zone).in_(list(cells)),
+        *active_benchmark_filters()
+    ).subquery()
+    rows = select(ranked).where(ranked.c.cell_row <= limit).subquery()
+
+    keys = [rows.c.level, rows.c.zone, rows.c.source_type]
+    return select(*keys, *_aggregate_columns(rows)).group_by(*keys)
+
+
+def rollup_stats_statement(
+    level: int,
+    zone: int,
+    job_family: Optional[str] = None,
+    source_types: Optional[Iterable[str]] = None
+) -> Select:
+    """Build a query merging rollups into one row per source_type
+
+    Mirrors merge_source_stats: counts, averages, minimums and maximums merge
+    exactly, and merged medians are a count-weighted mean of cell medians.
+    """
+
+    query = select(
+        BenchmarkRollup.source_type,
+        BenchmarkRollup.row_count,
+        *(
+            getattr(BenchmarkRollup, f"{name}_{field}")
+            for name in PERCENTILES
+            for field in ("count", "avg", "min", "max", "median")
+        )
+    ).where(
+        BenchmarkRollup.level == level,
+        BenchmarkRollup.zone == zone,
+        *active_rollup_filters()
+    )
+    if job_family:
+        query = query.where(BenchmarkRollup.job_family == job_family)
+    if source_types:
+        query = query.where(BenchmarkRollup.source_type.in_(list(source_types)))
+    rollups = query.subquery()
+
+    columns = [rollups.c.source_type, func.sum(rollups.c.row_count).label("count")]
+    for name in PERCENTILES:
+        count = rollups.c[f"{name}_count"]
+        populated = count > 0
+        total = func.nullif(func.sum(count), 0)
+        columns += [
+            func.coalesce(func.sum(count), 0).label(f"{name}_count"),
+            (func.sum(rollups.c[f"{name}_avg"] * count) / total).label(f"{name}_avg"),
+            func.min(rollups.c[f"{name}_min"]).filter(populated).label(f"{name}_min"),
+            func.max(rollups.c[f"{name}_max"]).filter(populated).label(f"{name}_max"),
+            (func.sum(rollups.c[f"{name}_median"] * count) / total).label(f"{name}_median"),
+        ]
+    return select(*columns).group_by(rollups.c.source_type)
+
+
+def rollup_rows_statement(
+    level: int,
+    zone: int,
+    job_family: Optional[str] = None,
+    source_types: Optional[Iterable[str]] = None
+) -> Select:
+    """Select the rollups of a level/zone, optionally one job family's, in the vintage window"""
+
+    query = select(BenchmarkRollup).where(
+        BenchmarkRollup.level == level,
+        BenchmarkRollup.zone == zone,
+        *active_rollup_filters()
+    )
+    if job_family:
+        query = query.where(BenchmarkRollup.job_family == job_family)
+    if source_types:
+        query = query.where(BenchmarkRollup.source_type.in_(list(source_types)))
+    return query
+
+
+def rollup_grid_statement(levels: Iterable[int], zones: Iterable[int], job_family: str) -> Select:
+    """Select a job family's rollups for every (level, zone) cell of a grid"""
+
+    return select(BenchmarkRollup).where(
+        BenchmarkRollup.level.in_(list(levels)),
+        BenchmarkRollup.zone.in_(list(zones)),
+        BenchmarkRollup.job_family == job_family,
+        *active_rollup_filters()
+    )
+
+
+def rollup_cells_statement(keys: Iterable[MarketKey]) -> Select:
+    """Select the rollups of several (job_family, level, zone) cells"""
+
+    return select(BenchmarkRollup).where(
+        tuple_(BenchmarkRollup.job_family, BenchmarkRollup.level, BenchmarkRollup.zone).in_(list(keys)),
+        *active_rollup_filters()
+    )
+
+
+def rollup_fallback_statement(cells: Iterable[Tuple[int, int]]) -> Select:
+    """Select every family's rollups for several (level, zone) cells"""
+
+    return select(BenchmarkRollup).where(
+        tuple_(BenchmarkRollup.level, BenchmarkRollup.zone).in_(list(cells)),
+        *active_rollup_filters()
+    )
+
+
+def benchmark_details_statement(level: int, zone: int, limit: int = 5) -> Select:
+    """Build one query returning per-source stats and each source's top data points
+
+    Every source_type at the level/zone is included. Each stats row is joined
+    laterally to that source's ``limit`` most recent rows, so fetching the data
+    points is an index range scan whose cost does not grow with the cell;
+    stats come from rollups when enabled and otherwise aggregate the cell.
+    Sources are returned in order, with one row per data point (or a single
+    row with null point columns if a rollup has no matching rows).
+    """
+
+    if settings.BENCHMARK_ROLLUPS_ENABLED:
+        stats = rollup_stats_statement(level, zone).subquery("source_stats")
+    else:
+        stats = benchmark_stats_statement(level, zone).subquery("source_stats")
+
+    points = select(
+        Benchmark.id.label("point_id"),
+        Benchmark.job_title,
+        Benchmark.location,
+        Benchmark.p25_salary,
+        Benchmark.p50_salary,
+        Benchmark.p75_salary,
+        Benchmark.data_date
+    ).where(
+        Benchmark.level == level,
+        Benchmark.zone == zone,
+        Benchmark.source_type == stats.c.source_type,
+        *active_benchmark_filters()
+    ).order_by(
+        Benchmark.data_date.desc().nulls_last(),
+        Benchmark.id
+    ).limit(limit).lateral("data_points")
+
+    return select(stats, points).select_from(
+        stats.outerjoin(points, true())
+    ).order_by(stats.c.source_type, points.c.data_date.desc().nulls_last(), points.c.point_id)
+
+
+async def fetch_benchmark_details(db: AsyncSession, level: int, zone: int, limit: int = 5) -> Dict[str, Dict]:
+    """Per-source stats and top data points in one round-trip, keyed by source_type
+
+    Each value is ``{"stats": ..., "data_points": [...]}``, with stats in the
+    shape returned by load_benchmark_stats.
+    """
+
+    details: Dict[str, Dict] = {}
+    for row in await db.execute(benchmark_details_statement(level, zone, limit)):
+        source = details.get(row.source_type)
+        if source is None:
+            source = details[row.source_type] = {"stats": _source_stats(row._mapping), "data_points": []}
+        if row.point_id is not None:
+            source["data_points"].append(row)
+    return details
+
+
+def get_benchmark_stats(
+    db: Session,
+    level: int,
+    zone: int,
+    job_family: Optional[str] = None,
+    source_types: Optional[Iterable[str]] = None,
+    limit: Optional[int] = None
+) -> Dict[str, Dict]:
+    """Aggregate matching benchmarks in one round-trip, keyed by source_type"""
+
+    statement = benchmark_stats_statement(level, zone, job_family, source_types, limit)
+    return _stats_by_source(db.execute(statement))
+
+
+def get_rollup_stats(
+    db: Session,
+    level: int,
+    zone: int,
+    job_family: Optional[str] = None,
+    source_types: Optional[Iterable[str]] = None
+) -> Dict[str, Dict]:
+    """Read precomputed per-source stats from compensation.benchmark_rollups
+
+    Without a job family, the rollups for every family at the level/zone are
+    merged per source, as are the vintage years in the window. Counts,
+    averages, minimums and maximums merge exactly; merged medians are a
+    count-weighted mean of the cell medians.
+    """
+
+    statement = rollup_rows_statement(level, zone, job_family, source_types)
+    return _merge_rollups(db.scalars(statement).all())
+
+
+def load_benchmark_stats(
+    db: Session,
+    level: int,
+    zone: int,
+    job_family: Optional[str] = None,
+    source_types: Optional[Iterable[str]] = None,
+    limit: Optional[int] = None
+) -> Dict[str, Dict]:
+    """Get per-source stats from the rollup table when enabled, else from raw rows
+
+    ``limit`` only applies to the raw query; rollups always cover every row of
+    the vintage window.
+    """
+
+    if settings.BENCHMARK_ROLLUPS_ENABLED:
+        return get_rollup_stats(db, level, zone, job_family, source_types)
+
+    return get_benchmark_stats(db, level, zone, job_family, source_types, limit)
+
+
+def load_market_benchmarks(db: Session, job_family: Optional[str], level: int, zone: int) -> Optional[Dict]:
+    """Market data for a job family's cell, else a level/zone fallback
+
+    With sketch blending the fallback blends every sketch at the level/zone;
+    otherwise it aggregates a FALLBACK_LIMIT row sample.
+    """
+
+    if settings.BENCHMARK_SKETCH_BLENDING:
+        market_data = None
+        if job_family:
+            market_data = load_sketch_market_data(db, level, zone, job_family)
+        return market_data or load_sketch_market_data(db, level, zone)
+
+    # Try exact job family match first
+    if job_family:
+        stats = load_benchmark_stats(db, level, zone, job_family=job_family)
+        if stats:
+            return combine_benchmark_stats(stats)
+
+    # Fallback to a sample of all matches at level/zone
+    stats = load_benchmark_stats(db, level, zone, limit=FALLBACK_LIMIT)
+    return combine_benchmark_stats(stats)
+
+
+def load_benchmark_grid(
+    db: Session,
+    levels: Iterable[int],
+    zones: Iterable[int],
+    job_family: Optional[str] = None
+) -> Dict[Tuple[int, int], Dict]:
+    """A job family's market data for every (level, zone) cell in one round-trip
+
+    Cells the family has no benchmarks for are left out, so callers can apply
+    the same level/zone fallback as single lookups. Reads rollups when rollups
+    or sketch blending are enabled.
+    """
+
+    if not job_family:
+        return {}
+
+    levels, zones = list(levels), list(zones)
+    if _grid_reads_rollups():
+        rows = db.scalars(rollup_grid_statement(levels, zones, job_family)).all()
+    else:
+        rows = db.execute(benchmark_grid_statement(levels, zones, job_family)).all()
+    return _grid_market_data(rows)
+
+
+def load_fallback_grid(db: Session, cells: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Dict]:
+    """The level/zone fallback of load_market_benchmarks for many cells in one round-trip
+
+    Cells without any benchmarks are left out.
+    """
+
+    cells = list(dict.fromkeys(cells))
+    if not cells:
+        return {}
+
+    if _grid_reads_rollups():
+        rows = db.scalars(rollup_fallback_statement(cells)).all()
+    else:
+        rows = db.execute(benchmark_fallback_statement(cells)).all()
+    return _grid_market_data(rows)
+
+
+async def fetch_fallback_grid(db: AsyncSession, cells: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Dict]:
+    """load_fallback_grid on an AsyncSession"""
+
+    cells = list(dict.fromkeys(cells))
+    if not cells:
+        return {}
+
+    if _grid_reads_rollups():
+        rows = (await db.scalars(rollup_fallback_statement(cells))).all()
+    else:
+        rows = (await db.execute(benchmark_fallback_statement(cells))).all()
+    return _grid_market_data(rows)
+
+
+async def fetch_market_grid(db: AsyncSession, keys: Iterable[MarketKey]) -> Dict[MarketKey, Optional[Dict]]:
+    """load_market_benchmarks for many keys on an AsyncSession, in at most two round-trips
+
+    The job families' cells are read in one grouped query; keys without a
+    family, or whose family has no benchmarks there, share one level/zone
+    fallback query.
+    """
+
+    keys = list(dict.fromkeys(keys))
+    family_keys = [key for key in keys if key[0]]
+
+    found: Dict[MarketKey, Dict] = {}
+    if family_keys:
+        if _grid_reads_rollups():
+            rows = (await db.scalars(rollup_cells_statement(family_keys))).all()
+        else:
+            rows = (await db.execute(benchmark_cells_statement(family_keys))).all()
+        found = _grid_market_data(rows, cell=_family_cell)
+
+    fallback = await fetch_fallback_grid(db, (key[1:] for key in keys if key not in found))
+    return {key: found.get(key) or fallback.get(key[1:]) for key in keys}
+
+
+def load_sketch_market_data(
+    db: Session,
+    level: int,
+    zone: int,
+    job_family: Optional[str] = None
+) -> Optional[Dict]:
+    """Blend the quantile sketches stored on matching rollups"""
+
+    return sketch_market_data(db.scalars(rollup_rows_statement(level, zone, job_family)).all())
+
+
+def sketch_market_data(rollups: List[BenchmarkRollup]) -> Optional[Dict]:
+    """Merge rollup sketches and read p10..p90 from the blended distribution"""
+
+    merged = QuantileSketch.merge_all(QuantileSketch.from_dict(rollup.sketch) for rollup in rollups)
+    if merged is None:
+        return None
+
+    result = {name: merged.quantile(q) for name, q in SURVEY_QUANTILES.items()}
+    result["sources"] = list({rollup.source_type for rollup in rollups})
+    result["data_points"] = sum(rollup.row_count for rollup in rollups)
+    return result
+
+
+def merge_source_stats(cells: List[Dict]) -> Dict:
+    """Merge stats for several cells of the same source"""
+
+    if len(cells) == 1:
+        return cells[0]
+
+    merged = {"count": sum(cell["count"] for cell in cells)}
+    for name in PERCENTILES:
+        parts = [cell[name] for cell in cells if cell[name]["count"]]
+        count = sum(part["count"] for part in parts)
+        merged[name] = {
+            "count": count,
+            "avg": sum(p["avg"] * p["count"] for p in parts) / count if count else 0,
+            "min": min((p["min"] for p in parts), default=0),
+            "max": max((p["max"] for p in parts), default=0),
+            "median": sum(p["median"] * p["count"] for p in parts) / count if count else 0,
+        }
+    return merged
+
+
+def combine_benchmark_stats(stats: Dict[str, Dict]) -> Optional[Dict]:
+    """Blend per-source stats into the market data shape used by SalaryEngine
+
+    Each percentile is the mean over all contributing rows, i.e. per-source
+    averages weighted by their non-null counts.
+    """
+
+    if not stats:
+        return None
+
+    result = {}
+    for name in PERCENTILES:
+        total = sum(s[name]["avg"] * s[name]["count"] for s in stats.values())
+        count = sum(s[name]["count"] for s in stats.values())
+        result[name] = total / count if count else 0
+
+    result["sources"] = list(stats.keys())
+    result["data_points"] = sum(s["count"] for s in stats.values())
+    return result
+
+
+def _stats_by_source(rows) -> Dict[str, Dict]:
+    return {row.source_type: _source_stats(row._mapping) for row in rows}
+
+
+def _merge_rollups(rollups: List[BenchmarkRollup]) -> Dict[str, Dict]:
+    cells: Dict[str, list] = {}
+    for rollup in rollups:
+        cells.setdefault(rollup.source_type, []).append(_rollup_stats(rollup))
+    return {source: merge_source_stats(source_cells) for source, source_cells in cells.items()}
+
+
+def _grid_reads_rollups() -> bool:
+    return settings.BENCHMARK_ROLLUPS_ENABLED or settings.BENCHMARK_SKETCH_BLENDING
+
+
+def _level_zone_cell(row) -> Tuple[int, int]:
+    return row.level, row.zone
+
+
+def _family_cell(row) -> MarketKey:
+    return row.job_family, row.level, row.zone
+
+
+def _grid_market_data(rows, cell=_level_zone_cell) -> Dict[Tuple, Dict]:
+    """Blend grid rows (rollups or per-source aggregates) into market data per cell"""
+
+    cells: Dict[Tuple, list] = {}
+    for row in rows:
+        cells.setdefault(cell(row), []).append(row)
+
+    grid = {}
+    for key, cell_rows in cells.items():
+        if settings.BENCHMARK_SKETCH_BLENDING:
+            market_data = sketch_market_data(cell_rows)
+        else:
+            by_source: Dict[str, list] = {}
+            for row in cell_rows:
+                stats = _rollup_stats(row) if isinstance(row, BenchmarkRollup) else _source_stats(row._mapping)
+                by_source.setdefault(row.source_type, []).append(stats)
+            market_data = combine_benchmark_stats(
+                {source: merge_source_stats(stats) for source, stats in by_source.items()}
+            )
+
+        if market_data:
+            grid[key] = market_data
+
+    return grid
+
+
+def _aggregate_columns(rows) -> List:
+    columns = [func.count().label("count")]
+    for name in PERCENTILES:
+        value = func.nullif(rows.c[f"{name}_salary"], 0)
+        columns += [
+            func.count(value).label(f"{name}_count"),
+            func.avg(value).label(f"{name}_avg"),
+            func.min(value).label(f"{name}_min"),
+            func.max(value).label(f"{name}_max"),
+            func.percentile_cont(0.5).within_group(value).label(f"{name}_median"),
+        ]
+    return columns
+
+
+def _rollup_stats(rollup: BenchmarkRollup) -> Dict:
+    stats = {"count": rollup.row_count}
+    for name in PERCENTILES:
+        stats[name] = {
+            "count": getattr(rollup, f"{name}_count") or 0,
+            "avg": _to_float(getattr(rollup, f"{name}_avg")),
+            "min": _to_float(getattr(rollup, f"{name}_min")),
+            "max": _to_float(getattr(rollup, f"{name}_max")),
+            "median": _to_float(getattr(rollup, f"{name}_median")),
+        }
+    return stats
+
+
+def _source_stats(row) -> Dict:
+    stats = {"count": row["count"]}
+    for name in PERCENTILES:
+        stats[name] = {
+            "count": row[f"{name}_count"],
+            "avg": _to_float(row[f"{name}_avg"]),
+            "min": _to_float(row[f"{name}_min"]),
+            "max": _to_float(row[f"{name}_max"]),
+            "median": _to_float(row[f"{name}_median"]),
+        }
+    return stats
+
+
+def _to_float(value) -> float:
+    return float(value) if value is not None else 0
@@ -0,0 +1,43 @@
+"""
+Benchmark dataset version lookups
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import time
+
+from app.core.config import settings
+from app.models.dataset_version import DatasetVersion
+
+BENCHMARKS_DATASET = "benchmarks"
+
+
+class DatasetVersionTracker:
+    """Read a dataset version, re-checking the database at most once per TTL
+
+    ``scripts/import_data.py`` bumps the version in ``compensation.dataset_versions``
+    after every load, so anything keyed on it is invalidated within one TTL.
+    """
+
+    def __init__(self, name: str = BENCHMARKS_DATASET, ttl_seconds: float = 5.0):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self._version = 0
+        self._checked_at = 0.0
+
+    async def fetch(self, db: AsyncSession) -> int:
+        # Concurrent refreshes may both query, which is harmless
+        if time.monotonic() - self._checked_at >= self.ttl_seconds:
+            version = await db.scalar(
+                select(DatasetVersion.version).where(DatasetVersion.name == self.name)
+            )
+            self._version = version or 0
+            self._checked_at = time.monotonic()
+
+        return self._version
+
+    def invalidate(self) -> None:
+        self._checked_at = 0.0
+
+
+benchmark_dataset_version = DatasetVersionTracker(ttl_seconds=settings.DATASET_VERSION_TTL_SECONDS)
@@ -9,11 +9,14 @@ from typing import Optional
 from fastapi import UploadFile
 import logging
 
+from app.core.timing import timed
+
 logger = logging.getLogger(__name__)
 
 class DocumentProcessor:
     """Process various document formats"""
 
+    @timed("extract_text")
     async def extract_text(self, file: UploadFile) -> Optional[str]:
         """Extract text from uploaded file"""
 
@@ -0,0 +1,176 @@
+"""
+Location resolution for geographic salary adjustments
+"""
+
+from typing import Dict, Iterable, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from functools import lru_cache
+import re
+import logging
+
+from app.core.config import settings
+from app.models.geo_metro import GeoMetro
+
+logger = logging.getLogger(__name__)
+
+REMOTE = "Remote"
+
+
+class Metro(NamedTuple):
+    name: str
+    zone: Optional[int]
+    factor: float
+    aliases: tuple = ()
+    state: Optional[str] = None
+
+
+# Used until compensation.geo_metros is loaded, or if it is empty
+DEFAULT_METROS = [
+    Metro("San Francisco", 1, 1.4, ("sf", "san fran", "bay area", "sf bay area", "san francisco bay area"), "CA"),
+    Metro("New York", 1, 1.35, ("nyc", "ny", "new york city", "manhattan", "brooklyn"), "NY"),
+    Metro("Seattle", 1, 1.25, (), "WA"),
+    Metro("Boston", 1, 1.25, (), "MA"),
+    Metro("Los Angeles", 1, 1.2, ("la",), "CA"),
+    Metro("Austin", 2, 1.1, ("atx",), "TX"),
+    Metro("Denver", 2, 1.05, (), "CO"),
+    Metro("Chicago", 2, 1.05, (), "IL"),
+    Metro(REMOTE, None, 1.0, ("anywhere", "work from home", "wfh", "distributed", "fully remote")),
+]
+
+ZONE_MARKETS = {
+    1: "primary tech market",
+    2: "secondary tech market"
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s,]+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Longest alias, in words, tried when scanning free-form locations
+_MAX_NGRAM = 4
+
+
+def normalize_location(location: str) -> str:
+    """Lowercase, drop punctuation other than commas and collapse whitespace"""
+    text = _PUNCTUATION.sub(" ", location.lower())
+    return _WHITESPACE.sub(" ", text).strip(" ,")
+
+
+class LocationResolver:
+    """Resolve free-form locations to metros through a normalized alias index
+
+    Lookups try the whole string, then the part before the first comma (which
+    drops state suffixes such as ", CA"), then scan word n-grams so that
+    "Remote - US" or "Downtown Austin TX" still resolve. Aliases only match
+    the whole string or its first part; the scan looks for full metro names
+    only, so "La Jolla" is not read as "la". Named metros win over remote
+    mentions. Results sit behind a bounded LRU cache.
+    """
+
+    def __init__(self, metros: Iterable[Metro] = DEFAULT_METROS, cache_size: int = 4096):
+        self._cache_size = cache_size
+        self.load(metros)
+
+    def load(self, metros: Iterable[Metro]) -> None:
+        """Rebuild the alias index and clear cached resolutions"""
+
+        index: Dict[str, Metro] = {}
+        names: Dict[str, Metro] = {}
+        for metro in metros:
+            keys = [metro.name]
+            if metro.state:
+                keys.append(f"{metro.name} {metro.state}")
+            for key in keys:
+                names[normalize_location(key).replace(",", "")] = metro
+            for key in metro.aliases:
+                index[normalize_location(key).replace(",", "")] = metro
+
+        # Names take precedence over another metro's alias
+        index.update(names)
+        self._index = index
+        self._names = names
+        self._resolve_cached = lru_cache(maxsize=self._cache_size)(self._resolve)
+
+    def refresh(self, db: Session) -> int:
+        """Load metros from compensation.geo_metros, keeping the current index if empty"""
+
+        rows = db.query(GeoMetro).all()
+        if not rows:
+            logger.warning("No rows in compensation.geo_metros, using default metros")
+            return 0
+
+        self.load(
+            Metro(
+                name=row.metro,
+                zone=row.zone,
+                factor=float(row.geographic_factor),
+                aliases=tuple(row.aliases or ()),
+                state=row.state
+            )
+            for row in rows
+        )
+        logger.info(f"Loaded {len(rows)} metros for location resolution")
+        return len(rows)
+
+    def resolve(self, location: Optional[str]) -> Optional[Metro]:
+        """Find the metro for a location, or None if it is unknown"""
+
+        if not location:
+            return None
+        return self._resolve_cached(location)
+
+    def geographic_factor(self, location: Optional[str], zone: Optional[int]) -> float:
+        """Get the cost adjustment for a location, defaulting by zone"""
+
+        metro = self.resolve(location)
+        if metro:
+            return metro.factor
+
+        return 1.2 if zone == 1 else 1.0
+
+    def describe(self, location: Optional[str]) -> str:
+        """Describe the geographic adjustment applied for a location"""
+
+        metro = self.resolve(location)
+        if not metro or metro.factor <= 1.0:
+            return "Base market rate"
+
+        premium = round((metro.factor - 1) * 100)
+        return f"{premium}% premium for {ZONE_MARKETS.get(metro.zone, metro.name)}"
+
+    def cache_info(self):
+        return self._resolve_cached.cache_info()
+
+    def _resolve(self, location: str) -> Optional[Metro]:
+        text = normalize_location(location)
+
+        # Remote aliases such as "WFH" are kept as the fallback so a named metro
+        # later in the string still wins
+        metro = self._index.get(text.replace(",", ""))
+        if metro and metro.name != REMOTE:
+            return metro
+        remote = metro
+
+        parts = [part.strip() for part in text.split(",")]
+        metro = self._index.get(parts[0])
+        if metro and metro.name != REMOTE:
+            return metro
+        remote = remote or metro
+
+        # Drop two-letter state and country suffixes before scanning for names
+        parts = parts[:1] + [part for part in parts[1:] if len(part) > 2 and part != "usa"]
+        words = " ".join(parts).split()
+
+        for size in range(min(_MAX_NGRAM, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                metro = self._names.get(" ".join(words[start:start + size]))
+                if metro is None:
+                    continue
+                if metro.name != REMOTE:
+                    return metro
+                remote = metro
+
+        return remote
+
+
+# Shared resolver used by SalaryEngine and the benchmarks API
+location_resolver = LocationResolver(cache_size=settings.LOCATION_CACHE_SIZE)
@@ -0,0 +1,141 @@
+"""
+Market data export: keyset pagination, column projection and streaming
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+import base64
+import csv
+import io
+import json
+import uuid
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.sql import Select
+
+from app.models.benchmark import Benchmark
+from app.models.database import AsyncSessionLocal
+
+# Import bookkeeping columns are internal; tombstoned rows are never exported
+IMPORT_COLUMNS = ("natural_key", "row_fingerprint", "deleted_at")
+MARKET_DATA_COLUMNS = [column.name for column in Benchmark.__table__.columns if column.name not in IMPORT_COLUMNS]
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+# Rows fetched per round-trip from the server-side cursor while streaming
+STREAM_BATCH_SIZE = 2000
+
+Cursor = Tuple[date, uuid.UUID]
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Validate a comma-separated column list; None or empty means every column"""
+    if not fields:
+        return list(MARKET_DATA_COLUMNS)
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in MARKET_DATA_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(MARKET_DATA_COLUMNS)}"
+        )
+    return list(dict.fromkeys(requested))
+
+
+def encode_cursor(row) -> str:
+    """Opaque cursor pointing just after ``row`` in (data_date, id) order"""
+    payload = json.dumps([row.data_date.isoformat(), str(row.id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data_date, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (date.fromisoformat(data_date), uuid.UUID(row_id))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def market_data_statement(
+    fields: Sequence[str],
+    job_family: Optional[str] = None,
+    level: Optional[int] = None,
+    zone: Optional[int] = None,
+    source_type: Optional[str] = None,
+    after: Optional[Cursor] = None,
+    limit: Optional[int] = None
+) -> Select:
+    """Select the projected columns in (data_date, id) order
+
+    id and data_date are always selected because the cursor is built from
+    them. Rows after ``after`` are matched with a row-value comparison, so each
+    page is an index range scan rather than an OFFSET.
+    """
+
+    names = list(dict.fromkeys([*fields, "id", "data_date"]))
+    query = select(*(Benchmark.__table__.c[name] for name in names)).where(Benchmark.deleted_at.is_(None))
+
+    if job_family:
+        query = query.where(Benchmark.job_family == job_family)
+    if level is not None:
+        query = query.where(Benchmark.level == level)
+    if zone is not None:
+        query = query.where(Benchmark.zone == zone)
+    if source_type:
+        query = query.where(Benchmark.source_type == source_type)
+
+    if after is not None:
+        query = query.where(tuple_(Benchmark.data_date, Benchmark.id) > tuple_(*after))
+
+    query = query.order_by(Benchmark.data_date.asc(), Benchmark.id.asc())
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def _plain(value):
+    """JSON-friendly scalar"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def project(row, fields: Sequence[str]) -> Dict:
+    mapping = row._mapping
+    return {name: _plain(mapping[name]) for name in fields}
+
+
+async def stream_rows(statement: Select) -> AsyncIterator[List]:
+    """Yield batches of rows from a server-side cursor on a dedicated session
+
+    The session is opened here rather than taken from the request so that it
+    stays open for the whole response, and only one batch is held at a time.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(statement.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for batch in result.partitions():
+            yield batch
+
+
+async def ndjson_lines(statement: Select, fields: Sequence[str]) -> AsyncIterator[str]:
+    async for batch in stream_rows(statement):
+        yield "".join(json.dumps(project(row, fields), separators=(",", ":")) + "\n" for row in batch)
+
+
+async def csv_lines(statement: Select, fields: Sequence[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+
+    async for batch in stream_rows(statement):
+        buffer.seek(0)
+        buffer.truncate()
+        # csv writes str() of each value, which keeps DECIMAL amounts exact
+        writer.writerows([row._mapping[name] for name in fields] for row in batch)
+        yield buffer.getvalue()
@@ -1,30 +1,78 @@
 """
-Mock OpenAI service for testing when API quota is exceeded
+Mock OpenAI service for testing and load tests
+
+Outputs are deterministic: each response is drawn from a random generator
+seeded with MOCK_OPENAI_SEED and the prompt, so the same input always gets the
+same analysis. Latency is off by default; for load tests, MOCK_OPENAI_LATENCY_MS
+and MOCK_OPENAI_LATENCY_SIGMA give a lognormal delay per call, and
+MOCK_OPENAI_CHUNK_DELAY_MS a delay per streamed chunk.
 """
 
-import json
+import asyncio
+import math
 import random
-from typing import Dict, List, AsyncGenerator
+from typing import Dict, List, AsyncGenerator, Optional
 import logging
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+
+class LatencyModel:
+    """Lognormal latency with a given median; sigma 0 gives a fixed delay"""
+
+    def __init__(self, median_ms: float = 0.0, sigma: float = 0.0):
+        self.median_ms = median_ms
+        self.sigma = sigma
+
+    def sample(self, rng: random.Random) -> float:
+        """Delay in seconds"""
+        if self.median_ms <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.median_ms / 1000
+        return rng.lognormvariate(math.log(self.median_ms), self.sigma) / 1000
+
+
 class MockOpenAIService:
     """Mock OpenAI service for testing"""
 
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        latency: Optional[LatencyModel] = None,
+        chunk_delay_ms: Optional[float] = None
+    ):
+        self.seed = settings.MOCK_OPENAI_SEED if seed is None else seed
+        self.latency = latency or LatencyModel(settings.MOCK_OPENAI_LATENCY_MS, settings.MOCK_OPENAI_LATENCY_SIGMA)
+        self.chunk_delay = (settings.MOCK_OPENAI_CHUNK_DELAY_MS if chunk_delay_ms is None else chunk_delay_ms) / 1000
+
+    def _rng(self, *parts: str) -> random.Random:
+        """Generator seeded by the service seed and the request content"""
+        return random.Random("\x00".join([str(self.seed), *parts]))
+
+    async def _delay(self, rng: random.Random):
+        delay = self.latency.sample(rng)
+        if delay:
+            await asyncio.sleep(delay)
+
     async def analyze_job_description(self, text: str) -> Dict:
         """Mock job analysis - returns realistic test data"""
 
         logger.info("Using MOCK OpenAI service for job analysis")
 
+        rng = self._rng("job_analysis", text)
+        await self._delay(rng)
+
         # Simulate different job levels based on keywords
         level = 3  # Default mid-level
         if any(word in text.lower() for word in ['senior', 'lead', 'principal']):
-            level = random.choice([5, 6, 7])
+            level = rng.choice([5, 6, 7])
         elif any(word in text.lower() for word in ['junior', 'entry', 'associate']):
-            level = random.choice([1, 2])
+            level = rng.choice([1, 2])
         elif any(word in text.lower() for word in ['staff', 'director', 'vp']):
-            level = random.choice([7, 8, 9])
+            level = rng.choice([7, 8, 9])
 
         # Detect location
         location = "San Francisco, CA"  # Default
@@ -45,7 +93,7 @@ class MockOpenAIService:
             "years_exp_max": level * 3,
             "skills": [
                 "Python", "JavaScript", "SQL", "AWS", "Docker"
-            ][:random.randint(3, 5)],
+            ][:rng.randint(3, 5)],
             "department": "Engineering" if "engineer" in text.lower() else "Operations",
             "location": location,
             "remote_type": "hybrid",
@@ -55,7 +103,7 @@ class MockOpenAIService:
                 "Mentor junior team members",
                 "Drive technical initiatives",
                 "Ensure code quality and best practices"
-            ][:random.randint(3, 5)],
+            ][:rng.randint(3, 5)],
             "requirements": [
                 "Bachelor's degree in Computer Science or related field",
                 f"{level * 2}+ years of relevant experience",
@@ -96,6 +144,11 @@ class MockOpenAIService:
         """Mock chat completion"""
 
         user_message = messages[-1]["content"] if messages else ""
+        await self._delay(self._rng("chat", user_message))
+        return self._chat_response(user_message, context)
+
+    def _chat_response(self, user_message: str, context: Dict = None) -> str:
+        context = context or {}
 
         # Generate contextual responses
         if "salary" in user_message.lower():
@@ -114,17 +167,23 @@ class MockOpenAIService:
     ) -> AsyncGenerator[str, None]:
         """Mock streaming chat"""
 
-        response = await self.chat_completion(messages, context)
+        # The latency model covers time to first chunk
+        user_message = messages[-1]["content"] if messages else ""
+        await self._delay(self._rng("chat", user_message))
+        response = self._chat_response(user_message, context)
 
         # Simulate streaming by yielding words one at a time
         words = response.split()
-        for word in words:
+        for i, word in enumerate(words):
+            if i and self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
             yield word + " "
 
     def generate_embeddings(self, text: str) -> List[float]:
         """Generate mock embeddings"""
-        # Return a mock 1536-dimensional vector
-        return [random.random() for _ in range(1536)]
+        # Return a mock 1536-dimensional vector, stable per text
+        rng = self._rng("embedding", text)
+        return [rng.random() for _ in range(1536)]
 
     def _track_usage(self, usage):
         """Mock usage tracking"""
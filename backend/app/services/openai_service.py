@@ -9,8 +9,12 @@ import redis
 from typing import Dict, List, Optional, AsyncGenerator
 from datetime import timedelta
 import logging
+import time
 
 from app.core.config import settings
+from app.core.metrics import OPENAI_CACHE_LOOKUPS, OPENAI_COST, OPENAI_LATENCY, OPENAI_TOKENS
+from app.core.timing import stage, timed
+from app.services.mock_openai_service import MockOpenAIService
 
 logger = logging.getLogger(__name__)
 
@@ -18,16 +22,19 @@ class OpenAIService:
     """OpenAI integration with caching"""
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL or None)
         self.redis = redis.from_url(settings.REDIS_URL)
         self.cache_ttl = timedelta(hours=24)
 
+    @timed("analyze_job")
     async def analyze_job_description(self, text: str) -> Dict:
         """Extract structured data from job description"""
 
         # Check cache
         cache_key = self._generate_cache_key("job_analysis", text)
-        cached = self.redis.get(cache_key)
+        with stage("redis"):
+            cached = self.redis.get(cache_key)
+        OPENAI_CACHE_LOOKUPS.labels("job_analysis", "hit" if cached else "miss").inc()
         if cached:
             logger.info("Using cached job analysis")
             return json.loads(cached)
@@ -83,6 +90,7 @@ class OpenAIService:
         }]
 
         try:
+            started = time.perf_counter()
             response = self.client.chat.completions.create(
                 model="gpt-4-turbo-preview",
                 messages=[
@@ -109,19 +117,21 @@ class OpenAIService:
                 function_call={"name": "extract_job_info"},
                 temperature=0.1
             )
+            duration = time.perf_counter() - started
 
             # Parse function response
             result = json.loads(response.choices[0].message.function_call.arguments)
 
             # Cache result
-            self.redis.setex(
-                cache_key,
-                int(self.cache_ttl.total_seconds()),
-                json.dumps(result)
-            )
+            with stage("redis"):
+                self.redis.setex(
+                    cache_key,
+                    int(self.cache_ttl.total_seconds()),
+                    json.dumps(result)
+                )
 
             # Track usage
-            self._track_usage(response.usage)
+            self._track_usage(response.usage, "analyze_job", duration)
 
             return result
 
@@ -138,6 +148,7 @@ class OpenAIService:
         full_messages = [{"role": "system", "content": system_message}] + messages
 
         try:
+            started = time.perf_counter()
             response = self.client.chat.completions.create(
                 model="gpt-4-turbo-preview",
                 messages=full_messages,
@@ -146,7 +157,7 @@ class OpenAIService:
             )
 
             # Track usage
-            self._track_usage(response.usage)
+            self._track_usage(response.usage, "chat", time.perf_counter() - started)
 
             return response.choices[0].message.content
 
@@ -165,6 +176,7 @@ class OpenAIService:
         full_messages = [{"role": "system", "content": system_message}] + messages
 
         try:
+            started = time.perf_counter()
             stream = self.client.chat.completions.create(
                 model="gpt-4-turbo-preview",
                 messages=full_messages,
@@ -177,6 +189,9 @@ class OpenAIService:
                 if chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
 
+            # Streamed responses carry no usage block
+            self._track_usage(None, "chat_stream", time.perf_counter() - started)
+
         except Exception as e:
             logger.error(f"OpenAI stream error: {e}")
             yield "I'm having trouble connecting. Please try again."
@@ -218,8 +233,11 @@ class OpenAIService:
         content_hash = hashlib.md5(content.encode()).hexdigest()
         return f"openai:{prefix}:{content_hash}"
 
-    def _track_usage(self, usage):
-        """Track token usage for cost monitoring"""
+    def _track_usage(self, usage, operation: str, duration: Optional[float] = None):
+        """Track token usage and latency for cost and capacity monitoring"""
+        if duration is not None:
+            OPENAI_LATENCY.labels(operation).observe(duration)
+
         if usage:
             total_tokens = usage.total_tokens
             # Estimate cost (GPT-4 Turbo: $0.01/1K input, $0.03/1K output)
@@ -229,6 +247,10 @@ class OpenAIService:
 
             logger.info(f"OpenAI usage - Tokens: {total_tokens}, Est. cost: ${total_cost:.4f}")
 
+            OPENAI_TOKENS.labels(operation, "prompt").inc(usage.prompt_tokens)
+            OPENAI_TOKENS.labels(operation, "completion").inc(usage.completion_tokens)
+            OPENAI_COST.labels(operation).inc(total_cost)
+
             # Could store in database for tracking
 
     def _fallback_analysis(self, text: str) -> Dict:
@@ -281,4 +303,11 @@ class OpenAIService:
             "location": location,
             "remote_type": "hybrid",
             "confidence": 0.3
-        }
\ No newline at end of file
+        }
+
+
+def create_openai_service():
+    """OpenAIService, or the deterministic mock when OPENAI_MOCK_ENABLED is set"""
+    if settings.OPENAI_MOCK_ENABLED:
+        return MockOpenAIService()
+    return OpenAIService()
@@ -0,0 +1,177 @@
+"""
+Mergeable quantile sketches for blending survey percentiles
+"""
+
+from typing import Dict, Iterable, Optional
+import math
+
+import numpy as np
+
+# Quantiles reported by the survey percentile columns
+SURVEY_QUANTILES = {
+    "p10": 0.10,
+    "p25": 0.25,
+    "p50": 0.50,
+    "p75": 0.75,
+    "p90": 0.90
+}
+
+# Equal-mass points each survey row is expanded into
+POINTS_PER_ROW = 20
+
+
+class QuantileSketch:
+    """t-digest style sketch: weighted centroids compressed with the k1 scale function
+
+    Survey rows only publish a few percentiles, so each row is expanded into
+    equal-mass points along its piecewise-linear quantile curve; rows carry
+    unit weight unless a caller passes one. Sketches merge in
+    O(centroids), so blending sources, levels or geographies never needs raw
+    rows, and any quantile can be read back.
+    """
+
+    def __init__(
+        self,
+        compression: int = 100,
+        means: Optional[np.ndarray] = None,
+        weights: Optional[np.ndarray] = None,
+        min_value: float = math.inf,
+        max_value: float = -math.inf
+    ):
+        self.compression = compression
+        self.means = np.asarray(means if means is not None else [], dtype=float)
+        self.weights = np.asarray(weights if weights is not None else [], dtype=float)
+        self.min_value = min_value
+        self.max_value = max_value
+
+    @property
+    def total_weight(self) -> float:
+        return float(self.weights.sum())
+
+    def __len__(self) -> int:
+        return int(self.means.size)
+
+    def add_survey_row(self, percentiles: Dict[str, Optional[float]], weight: float = 1.0) -> None:
+        """Add one survey row given its p10..p90 values"""
+
+        known = sorted(
+            (SURVEY_QUANTILES[name], float(value))
+            for name, value in percentiles.items()
+            if name in SURVEY_QUANTILES and value
+        )
+        if not known or weight <= 0:
+            return
+
+        quantiles = np.array([q for q, _ in known])
+        values = np.maximum.accumulate(np.array([v for _, v in known]))
+
+        if len(known) == 1:
+            points = np.full(POINTS_PER_ROW, values[0])
+        else:
+            # Extend the curve linearly to q=0 and q=1 from the outermost segments
+            low = values[0] - (values[1] - values[0]) / (quantiles[1] - quantiles[0]) * quantiles[0]
+            high = values[-1] + (values[-1] - values[-2]) / (quantiles[-1] - quantiles[-2]) * (1 - quantiles[-1])
+            curve_q = np.concatenate(([0.0], quantiles, [1.0]))
+            curve_v = np.concatenate(([max(low, 0.0)], values, [high]))
+
+            midpoints = (np.arange(POINTS_PER_ROW) + 0.5) / POINTS_PER_ROW
+            points = np.interp(midpoints, curve_q, curve_v)
+
+        self.min_value = min(self.min_value, float(points[0]))
+        self.max_value = max(self.max_value, float(points[-1]))
+        self.means = np.concatenate((self.means, points))
+        self.weights = np.concatenate((self.weights, np.full(POINTS_PER_ROW, weight / POINTS_PER_ROW)))
+
+        if len(self) > 4 * self.compression:
+            self.compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Return a new sketch combining this one and ``other``"""
+        return QuantileSketch.merge_all([self, other]) or QuantileSketch(self.compression)
+
+    @classmethod
+    def merge_all(cls, sketches: Iterable["QuantileSketch"]) -> Optional["QuantileSketch"]:
+        sketches = [sketch for sketch in sketches if len(sketch)]
+        if not sketches:
+            return None
+
+        merged = cls(
+            compression=max(sketch.compression for sketch in sketches),
+            means=np.concatenate([sketch.means for sketch in sketches]),
+            weights=np.concatenate([sketch.weights for sketch in sketches]),
+            min_value=min(sketch.min_value for sketch in sketches),
+            max_value=max(sketch.max_value for sketch in sketches)
+        )
+        merged.compress()
+        return merged
+
+    def compress(self) -> None:
+        """Merge adjacent centroids while each stays within one k1 scale unit"""
+
+        if len(self) <= 1:
+            return
+
+        order = np.argsort(self.means, kind="mergesort")
+        means, weights = self.means[order], self.weights[order]
+        total = weights.sum()
+
+        new_means, new_weights = [], []
+        cur_mean, cur_weight = means[0], weights[0]
+        weight_before = 0.0
+        k_limit = self._k(0.0) + 1
+
+        for mean, weight in zip(means[1:], weights[1:]):
+            if self._k((weight_before + cur_weight + weight) / total) <= k_limit:
+                cur_mean += (mean - cur_mean) * weight / (cur_weight + weight)
+                cur_weight += weight
+            else:
+                new_means.append(cur_mean)
+                new_weights.append(cur_weight)
+                weight_before += cur_weight
+                k_limit = self._k(weight_before / total) + 1
+                cur_mean, cur_weight = mean, weight
+
+        new_means.append(cur_mean)
+        new_weights.append(cur_weight)
+
+        self.means = np.array(new_means)
+        self.weights = np.array(new_weights)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the value at quantile ``q`` (0-1)"""
+
+        if not len(self):
+            return 0.0
+
+        q = min(max(q, 0.0), 1.0)
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+
+        positions = np.concatenate(([0.0], centers, [total]))
+        values = np.concatenate(([self.min_value], self.means, [self.max_value]))
+        return float(np.interp(q * total, positions, values))
+
+    def to_dict(self) -> Dict:
+        return {
+            "compression": self.compression,
+            "means": [round(float(m), 2) for m in self.means],
+            "weights": [float(w) for w in self.weights],
+            "min": self.min_value if len(self) else None,
+            "max": self.max_value if len(self) else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "QuantileSketch":
+        if not data:
+            return cls()
+        return cls(
+            compression=data.get("compression", 100),
+            means=data.get("means", []),
+            weights=data.get("weights", []),
+            min_value=data["min"] if data.get("min") is not None else math.inf,
+            max_value=data["max"] if data.get("max") is not None else -math.inf
+        )
+
+    def _k(self, q: float) -> float:
+        q = min(max(q, 0.0), 1.0)
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
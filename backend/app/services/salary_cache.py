@@ -0,0 +1,130 @@
+"""
+Result cache for salary calculations
+"""
+
+from typing import Dict, Optional
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+import threading
+import time
+import logging
+
+import redis
+import redis.asyncio
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SalaryResultCache:
+    """Two-tier cache for SalaryEngine results
+
+    Entries live in an in-process LRU bounded by size and TTL, with an optional
+    Redis tier shared across workers, reached through ``redis.asyncio`` so a
+    slow Redis never blocks the event loop. Keys are fingerprints of the
+    pricing inputs plus the benchmark dataset version, so a data import makes
+    every earlier entry unreachable without explicit deletes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: int = 3600,
+        redis_url: Optional[str] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis.asyncio.from_url(redis_url) if redis_url else None
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(inputs: Dict, dataset_version: int) -> str:
+        """Stable key for a set of pricing inputs and dataset version"""
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        return f"salary:result:v{dataset_version}:{digest}"
+
+    async def get(self, key: str) -> Optional[Dict]:
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            if entry:
+                del self._entries[key]
+
+        if self.redis is not None:
+            try:
+                cached = await self.redis.get(key)
+            except redis.RedisError as e:
+                logger.warning(f"Salary cache Redis read failed: {e}")
+                cached = None
+
+            if cached:
+                value = json.loads(cached)
+                self._store(key, value, now)
+                with self._lock:
+                    self.redis_hits += 1
+                return copy.deepcopy(value)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Dict) -> None:
+        self._store(key, copy.deepcopy(value), time.monotonic())
+
+        if self.redis is not None:
+            try:
+                await self.redis.setex(key, self.ttl_seconds, json.dumps(value, default=str))
+            except redis.RedisError as e:
+                logger.warning(f"Salary cache Redis write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop in-process entries; Redis entries expire by TTL or a new version or cube generation"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.redis_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "redis_enabled": self.redis is not None,
+                "hits": self.hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits + self.redis_hits) / lookups if lookups else 0.0
+            }
+
+    def _store(self, key: str, value: Dict, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+# Shared cache used by app.services.salary_pricing when SALARY_CACHE_ENABLED is set
+salary_cache = SalaryResultCache(
+    max_entries=settings.SALARY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SALARY_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL if settings.SALARY_CACHE_REDIS_ENABLED else None
+)
@@ -2,38 +2,116 @@
 Salary calculation engine
 """
 
-from typing import Dict, Optional, List
+from typing import Dict, FrozenSet, Iterable, Optional, List, Tuple
 from sqlalchemy.orm import Session
-from decimal import Decimal
 import logging
 
-from app.models.benchmark import Benchmark
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import SALARY_CALCULATIONS
+from app.core.timing import timed
 from app.models.job_analysis import JobAnalysis
+from app.services.benchmark_cube import BenchmarkCube, benchmark_cube, PERCENTILES
+from app.services.benchmark_stats import (
+    MarketKey,
+    load_benchmark_grid,
+    load_fallback_grid,
+    load_market_benchmarks
+)
+from app.services.skill_matcher import get_skill_matchers
+from app.services.location_resolver import location_resolver
 
 logger = logging.getLogger(__name__)
 
 class SalaryEngine:
     """Calculate salary ranges based on market data and job analysis"""
 
-    def __init__(self, db: Session):
+    # Optional result sections; each is only computed when requested
+    INSIGHT_SECTIONS = frozenset({
+        "justification",
+        "market_position",
+        "competitive_analysis",
+        "retention_risk"
+    })
+
+    MARKET_ADJUSTMENT_CAP = 0.25
+    SKILLS_PREMIUM_CAP = 0.20
+
+    def __init__(
+        self,
+        db: Optional[Session],
+        cube: Optional[BenchmarkCube] = None,
+        market_data: Optional[Dict[MarketKey, Optional[Dict]]] = None
+    ):
         self.db = db
+        # Serve benchmark lookups from memory when the cube is enabled and loaded
+        if cube is None and settings.benchmark_cube_active:
+            cube = benchmark_cube
+        self.cube = cube
+        # Market data fetched ahead of time, keyed by (job_family, level, zone);
+        # set by app.services.salary_pricing so pricing never touches the session
+        self.market_data = market_data
+
+    @property
+    def reads_cube(self) -> bool:
+        return self.cube is not None and self.cube.loaded
 
     def calculate_salary(
         self,
         job: JobAnalysis,
-        override_params: Optional[Dict] = None
+        override_params: Optional[Dict] = None,
+        include: Optional[Iterable[str]] = None
     ) -> Dict:
-        """Calculate salary range for a job"""
+        """Calculate salary range for a job
+
+        ``include`` selects which INSIGHT_SECTIONS to compute; None means all.
+        """
+
+        include = self.resolve_include(include)
+        level, zone, location = self.pricing_inputs(job, override_params)
+        return self._calculate_salary(job, level, zone, location, include)
+
+    @staticmethod
+    def pricing_inputs(job: JobAnalysis, override_params: Optional[Dict] = None) -> Tuple[int, int, str]:
+        """The level, zone and location to price at, after overrides"""
 
         # Use override parameters if provided
         if override_params:
-            level = override_params.get("level", job.detected_level)
-            zone = override_params.get("zone", job.zone)
-            location = override_params.get("location", job.location)
-        else:
-            level = job.detected_level
-            zone = job.zone
-            location = job.location
+            return (
+                override_params.get("level", job.detected_level),
+                override_params.get("zone", job.zone),
+                override_params.get("location", job.location)
+            )
+        return job.detected_level, job.zone, job.location
+
+    @staticmethod
+    def cache_inputs(job: JobAnalysis, level: int, zone: int, location: str) -> Dict:
+        """Every job attribute that can change a calculate_salary result"""
+
+        return {
+            "job_family": job.job_family,
+            "job_title": job.job_title,
+            "level": level,
+            "zone": zone,
+            "location": location,
+            "skills": list(job.skills_extracted or []),
+            "detected_level": job.detected_level,
+            "detected_band": job.detected_band,
+            "years_experience_min": job.years_experience_min,
+            "years_experience_max": job.years_experience_max,
+            "job_location": job.location
+        }
+
+    def _calculate_salary(
+        self,
+        job: JobAnalysis,
+        level: int,
+        zone: int,
+        location: str,
+        include: FrozenSet[str]
+    ) -> Dict:
+        """Calculate salary range for resolved level, zone and location"""
 
         # Get market data
         market_data = self._get_market_benchmarks(
@@ -44,7 +122,10 @@ class SalaryEngine:
 
         if not market_data:
             # Fallback to estimation
-            return self._estimate_salary(job, level, zone)
+            SALARY_CALCULATIONS.labels("estimate").inc()
+            return self._estimate_salary(job, level, zone, include)
+
+        SALARY_CALCULATIONS.labels("market").inc()
 
         # Calculate base salary from market data
         base_salary = self._calculate_base_from_market(market_data)
@@ -70,82 +151,263 @@ class SalaryEngine:
             "market_adjustment": market_adjustment,
             "skills_premium": skills_premium,
             "sources": market_data["sources"],
-            "confidence": self._calculate_confidence(market_data),
-            "justification": self._generate_justification(job, market_data, adjusted_base),
-            "insights": {
-                "market_position": self._get_market_position(adjusted_base, base_salary),
-                "competitive_analysis": self._competitive_analysis(job, market_data),
-                "retention_risk": self._assess_retention_risk(adjusted_base, market_data)
-            }
+            "confidence": self._calculate_confidence(market_data)
         }
+        result.update(self._build_insights(job, market_data, base_salary, adjusted_base, include))
 
         return result
 
-    def _get_market_benchmarks(
+    def calculate_salary_batch(
         self,
-        job_family: str,
-        level: int,
-        zone: int
-    ) -> Optional[Dict]:
-        """Query market benchmark data"""
-
-        benchmarks = self.db.query(Benchmark).filter(
-            Benchmark.level == level,
-            Benchmark.zone == zone
+        jobs: List[JobAnalysis],
+        include: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """Calculate salary ranges for many jobs at once
+
+        Jobs are factorized into distinct market cells, (location, zone) pairs,
+        titles and skills. Market data, geographic factors and skill weights are
+        looked up once per distinct value and gathered back to jobs with index
+        arrays, so adjustments and ranges are array operations. Results are
+        returned in the same order and shape as ``calculate_salary``.
+        """
+
+        include = self.resolve_include(include)
+        if not jobs:
+            return []
+
+        count = len(jobs)
+        levels = [job.detected_level for job in jobs]
+        zones = [job.zone for job in jobs]
+        skills = [job.skills_extracted or () for job in jobs]
+
+        # Market data per distinct (job_family, level, zone)
+        cells, cell_idx = _factorize(zip((job.job_family for job in jobs), levels, zones))
+        markets = [self._get_market_benchmarks(*cell) for cell in cells]
+        cell_percentiles = np.array(
+            [[market[p] for p in PERCENTILES] if market else [np.nan] * len(PERCENTILES) for market in markets],
+            dtype=float
         )
+        priced = np.array([bool(market) for market in markets])[cell_idx]
+
+        SALARY_CALCULATIONS.labels("estimate").inc(count - int(priced.sum()))
+        SALARY_CALCULATIONS.labels("market").inc(int(priced.sum()))
+
+        # Geographic factor per distinct (location, zone)
+        places, place_idx = _factorize(zip((job.location for job in jobs), zones))
+        geo_factors = np.array([self._get_geographic_factor(*place) for place in places])[place_idx]
+
+        # Skill and title weights per distinct value, summed per job with bincount
+        matchers = get_skill_matchers()
+        titles, title_idx = _factorize(job.job_title for job in jobs)
+        title_weights = np.array([matchers.high_demand_titles.max_weight(title) for title in titles])[title_idx]
 
-        # Try exact job family match first
-        if job_family:
-            family_matches = benchmarks.filter(
-                Benchmark.job_family == job_family
-            ).all()
+        skill_names, skill_idx = _factorize(skill for job_skills in skills for skill in job_skills)
+        owners = np.repeat(np.arange(count), [len(job_skills) for job_skills in skills])
+        hot_weights = np.array([matchers.hot_skills.max_weight(name) for name in skill_names], dtype=float)
+        premium_weights = np.array([matchers.premium_skills.total_weight(name) for name in skill_names], dtype=float)
 
-            if family_matches:
-                return self._aggregate_benchmarks(family_matches)
+        market_adjustments = np.minimum(
+            np.bincount(owners, weights=hot_weights[skill_idx], minlength=count) + title_weights,
+            self.MARKET_ADJUSTMENT_CAP
+        )
+        skills_premiums = np.minimum(
+            np.bincount(owners, weights=premium_weights[skill_idx], minlength=count),
+            self.SKILLS_PREMIUM_CAP
+        )
 
-        # Fallback to all matches at level/zone
-        all_matches = benchmarks.limit(10).all()
+        percentiles = cell_percentiles[cell_idx]
+        adjusted = percentiles[:, 2] * geo_factors * (1 + market_adjustments) * (1 + skills_premiums)
+
+        confidences = [self._calculate_confidence(market) if market else None for market in markets]
+        bases = [self._calculate_base_from_market(market) if market else None for market in markets]
+        estimates: Dict[tuple, Dict] = {}
+
+        results = []
+        for job, level, zone, cell, (p10, p25, _, p75, p90), target, geo_factor, adjustment, premium in zip(
+            jobs, levels, zones, cell_idx.tolist(), percentiles.tolist(), adjusted.tolist(),
+            geo_factors.tolist(), market_adjustments.tolist(), skills_premiums.tolist()
+        ):
+            market_data = markets[cell]
+            if not market_data:
+                key = (level, zone, job.detected_band)
+                if key not in estimates:
+                    estimates[key] = self._estimate_salary(job, level, zone, include)
+                estimate = estimates[key]
+                results.append({**estimate, "sources": list(estimate["sources"]), "insights": {}})
+                continue
+
+            result = {
+                "min": p10,
+                "p25": p25,
+                "target": target,
+                "p75": p75,
+                "max": p90,
+                "recommended_min": target * 0.85,
+                "recommended_target": target,
+                "recommended_max": target * 1.15,
+                "geographic_factor": geo_factor,
+                "market_adjustment": adjustment,
+                "skills_premium": premium,
+                "sources": market_data["sources"],
+                "confidence": confidences[cell]
+            }
+            if include:
+                result.update(self._build_insights(job, market_data, bases[cell], target, include))
+            else:
+                result.update(justification=None, insights={})
+            results.append(result)
 
-        if all_matches:
-            return self._aggregate_benchmarks(all_matches)
+        return results
 
-        return None
+    def calculate_scenario_grid(
+        self,
+        job: JobAnalysis,
+        levels: List[int],
+        zones: List[int],
+        locations: List[Optional[str]]
+    ) -> List[Dict]:
+        """Price a job across every level x zone x location combination
+
+        The job family's market data for the whole grid comes from one benchmark
+        fetch and the ranges are computed with broadcasting. Cells the family
+        has no benchmarks for use the same level/zone fallback as
+        ``calculate_salary``, read for all of them in one more fetch, and cells without any market data fall back to the
+        level/zone estimate. Nothing is persisted.
+        """
+
+        if self.reads_cube or self.market_data is not None:
+            grid = {}
+            for level in levels:
+                for zone in zones:
+                    market_data = self._get_market_benchmarks(job.job_family, level, zone)
+                    if market_data:
+                        grid[(level, zone)] = market_data
+        else:
+            grid = load_benchmark_grid(self.db, levels, zones, job.job_family)
+            grid.update(load_fallback_grid(
+                self.db,
+                [(level, zone) for level in levels for zone in zones if (level, zone) not in grid]
+            ))
 
-    def _aggregate_benchmarks(self, benchmarks: List[Benchmark]) -> Dict:
-        """Aggregate multiple benchmark records"""
+        market_adjustment = self._get_market_adjustment(job)
+        skills_premium = self._calculate_skills_premium(job.skills_extracted)
 
-        sources = set()
-        p10_values = []
-        p25_values = []
-        p50_values = []
-        p75_values = []
-        p90_values = []
+        # (level, zone, percentile) market values, NaN where there is no data
+        percentiles = np.full((len(levels), len(zones), 5), np.nan)
+        for i, level in enumerate(levels):
+            for j, zone in enumerate(zones):
+                market_data = grid.get((level, zone))
+                if market_data:
+                    percentiles[i, j] = [market_data[p] for p in PERCENTILES]
+
+        # (zone, location) geographic factors
+        geo_factors = np.array([
+            [self._get_geographic_factor(location, zone) for location in locations]
+            for zone in zones
+        ], dtype=float).reshape(len(zones), len(locations))
+
+        # (level, zone, location) adjusted targets
+        adjusted = (
+            percentiles[:, :, 2, np.newaxis]
+            * geo_factors[np.newaxis, :, :]
+            * (1 + market_adjustment)
+            * (1 + skills_premium)
+        )
 
-        for benchmark in benchmarks:
-            sources.add(benchmark.source_type)
+        scenarios = []
+        for i, level in enumerate(levels):
+            for j, zone in enumerate(zones):
+                market_data = grid.get((level, zone))
+                estimate = None if market_data else self._estimate_salary(job, level, zone, frozenset())
+
+                for k, location in enumerate(locations):
+                    scenario = {"level": level, "zone": zone, "location": location}
+
+                    if estimate:
+                        scenario.update({
+                            key: estimate[key] for key in (
+                                "min", "p25", "target", "p75", "max",
+                                "recommended_min", "recommended_target", "recommended_max",
+                                "geographic_factor", "market_adjustment", "skills_premium",
+                                "sources", "confidence"
+                            )
+                        })
+                    else:
+                        target = float(adjusted[i, j, k])
+                        scenario.update({
+                            "min": float(percentiles[i, j, 0]),
+                            "p25": float(percentiles[i, j, 1]),
+                            "target": target,
+                            "p75": float(percentiles[i, j, 3]),
+                            "max": float(percentiles[i, j, 4]),
+                            "recommended_min": target * 0.85,
+                            "recommended_target": target,
+                            "recommended_max": target * 1.15,
+                            "geographic_factor": float(geo_factors[j, k]),
+                            "market_adjustment": market_adjustment,
+                            "skills_premium": skills_premium,
+                            "sources": market_data["sources"],
+                            "confidence": self._calculate_confidence(market_data)
+                        })
+
+                    scenarios.append(scenario)
+
+        return scenarios
+
+    @classmethod
+    def resolve_include(cls, include: Optional[Iterable[str]]) -> FrozenSet[str]:
+        """Normalize an include selection, rejecting unknown sections"""
+
+        if include is None:
+            return cls.INSIGHT_SECTIONS
+
+        include = frozenset(include)
+        unknown = include - cls.INSIGHT_SECTIONS
+        if unknown:
+            raise ValueError(f"Unknown insight sections: {', '.join(sorted(unknown))}")
+        return include
+
+    def _build_insights(
+        self,
+        job: JobAnalysis,
+        market_data: Dict,
+        base_salary: Dict,
+        salary: float,
+        include: FrozenSet[str]
+    ) -> Dict:
+        """Compute only the requested justification and insight sections"""
 
-            if benchmark.p10_salary:
-                p10_values.append(float(benchmark.p10_salary))
-            if benchmark.p25_salary:
-                p25_values.append(float(benchmark.p25_salary))
-            if benchmark.p50_salary:
-                p50_values.append(float(benchmark.p50_salary))
-            if benchmark.p75_salary:
-                p75_values.append(float(benchmark.p75_salary))
-            if benchmark.p90_salary:
-                p90_values.append(float(benchmark.p90_salary))
+        sections = {
+            "market_position": lambda: self._get_market_position(salary, base_salary),
+            "competitive_analysis": lambda: self._competitive_analysis(job, market_data),
+            "retention_risk": lambda: self._assess_retention_risk(salary, market_data)
+        }
 
-        # Calculate averages
         return {
-            "p10": sum(p10_values) / len(p10_values) if p10_values else 0,
-            "p25": sum(p25_values) / len(p25_values) if p25_values else 0,
-            "p50": sum(p50_values) / len(p50_values) if p50_values else 0,
-            "p75": sum(p75_values) / len(p75_values) if p75_values else 0,
-            "p90": sum(p90_values) / len(p90_values) if p90_values else 0,
-            "sources": list(sources),
-            "data_points": len(benchmarks)
+            "justification": (
+                self._generate_justification(job, market_data, salary)
+                if "justification" in include else None
+            ),
+            "insights": {name: build() for name, build in sections.items() if name in include}
         }
 
+    @timed("benchmarks")
+    def _get_market_benchmarks(
+        self,
+        job_family: str,
+        level: int,
+        zone: int
+    ) -> Optional[Dict]:
+        """Query market benchmark data"""
+
+        if self.reads_cube:
+            return self.cube.lookup(job_family, level, zone)
+
+        if self.market_data is not None:
+            return self.market_data.get((job_family, level, zone))
+
+        return load_market_benchmarks(self.db, job_family, level, zone)
+
     def _calculate_base_from_market(self, market_data: Dict) -> Dict:
         """Calculate base salary from market data"""
 
@@ -160,48 +422,23 @@ class SalaryEngine:
     def _get_geographic_factor(self, location: str, zone: int) -> float:
         """Get geographic cost adjustment factor"""
 
-        # Location-specific adjustments
-        location_factors = {
-            "San Francisco": 1.4,
-            "New York": 1.35,
-            "Seattle": 1.25,
-            "Boston": 1.25,
-            "Los Angeles": 1.2,
-            "Austin": 1.1,
-            "Denver": 1.05,
-            "Chicago": 1.05,
-            "Remote": 1.0
-        }
-
-        # Check if location is in our factors
-        for city, factor in location_factors.items():
-            if location and city.lower() in location.lower():
-                return factor
-
-        # Default by zone
-        return 1.2 if zone == 1 else 1.0
+        return location_resolver.geographic_factor(location, zone)
 
     def _get_market_adjustment(self, job: JobAnalysis) -> float:
         """Calculate market demand adjustment"""
 
-        # High-demand indicators
-        hot_skills = ["ai", "machine learning", "kubernetes", "rust", "golang"]
-        high_demand_titles = ["staff", "principal", "architect", "director"]
-
+        matchers = get_skill_matchers()
         adjustment = 0.0
 
         # Check for hot skills
         if job.skills_extracted:
             for skill in job.skills_extracted:
-                if any(hot in skill.lower() for hot in hot_skills):
-                    adjustment += 0.05
+                adjustment += matchers.hot_skills.max_weight(skill)
 
         # Check for high-demand titles
-        if job.job_title:
-            if any(title in job.job_title.lower() for title in high_demand_titles):
-                adjustment += 0.1
+        adjustment += matchers.high_demand_titles.max_weight(job.job_title)
 
-        return min(adjustment, 0.25)  # Cap at 25% premium
+        return min(adjustment, self.MARKET_ADJUSTMENT_CAP)  # Cap at 25% premium
 
     def _calculate_skills_premium(self, skills: List[str]) -> float:
         """Calculate premium based on specialized skills"""
@@ -209,25 +446,10 @@ class SalaryEngine:
         if not skills:
             return 0.0
 
-        premium_skills = {
-            "kubernetes": 0.05,
-            "aws": 0.03,
-            "machine learning": 0.08,
-            "ai": 0.08,
-            "blockchain": 0.05,
-            "security": 0.05,
-            "golang": 0.04,
-            "rust": 0.04
-        }
-
-        total_premium = 0.0
-        for skill in skills:
-            skill_lower = skill.lower()
-            for premium_skill, value in premium_skills.items():
-                if premium_skill in skill_lower:
-                    total_premium += value
+        premium_skills = get_skill_matchers().premium_skills
+        total_premium = sum(premium_skills.total_weight(skill) for skill in skills)
 
-        return min(total_premium, 0.20)  # Cap at 20%
+        return min(total_premium, self.SKILLS_PREMIUM_CAP)  # Cap at 20%
 
     def _calculate_confidence(self, market_data: Dict) -> float:
         """Calculate confidence score"""
@@ -249,7 +471,13 @@ class SalaryEngine:
 
         return min(confidence, 0.95)
 
-    def _estimate_salary(self, job: JobAnalysis, level: int, zone: int) -> Dict:
+    def _estimate_salary(
+        self,
+        job: JobAnalysis,
+        level: int,
+        zone: int,
+        include: FrozenSet[str] = INSIGHT_SECTIONS
+    ) -> Dict:
         """Estimate salary when no market data available"""
 
         # Base salary by level (zone 1)
@@ -290,7 +518,10 @@ class SalaryEngine:
             "skills_premium": 0.0,
             "sources": ["estimated"],
             "confidence": 0.3,
-            "justification": "Estimated based on level and location due to limited market data",
+            "justification": (
+                "Estimated based on level and location due to limited market data"
+                if "justification" in include else None
+            ),
             "insights": {}
         }
 
@@ -350,4 +581,12 @@ class SalaryEngine:
         elif salary < p50 * 1.1:
             return "Low - at market rate"
         else:
-            return "Very low - above market"
\ No newline at end of file
+            return "Very low - above market"
+
+
+def _factorize(keys: Iterable) -> Tuple[List, np.ndarray]:
+    """Distinct keys in first-seen order, and each key's position among them"""
+
+    positions: Dict = {}
+    codes = [positions.setdefault(key, len(positions)) for key in keys]
+    return list(positions), np.array(codes, dtype=np.intp)
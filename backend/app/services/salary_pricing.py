@@ -0,0 +1,97 @@
+"""
+Salary pricing for request handlers, without blocking the event loop
+"""
+
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.timing import stage
+from app.models.job_analysis import JobAnalysis
+from app.services.benchmark_stats import fetch_market_grid
+from app.services.dataset_version import benchmark_dataset_version
+from app.services.salary_cache import salary_cache
+from app.services.salary_engine import MarketKey, SalaryEngine
+
+
+async def price_salary(
+    db: AsyncSession,
+    job: JobAnalysis,
+    override_params: Optional[Dict] = None,
+    include: Optional[Iterable[str]] = None
+) -> Dict:
+    """SalaryEngine.calculate_salary behind the result cache
+
+    Cache lookups, the dataset version and market data are read with awaits;
+    the engine itself runs in the threadpool on the fetched data. Results
+    priced from the cube are keyed by its generation too, so a cube rebuild
+    retires them in Redis as well as in-process.
+    """
+
+    include = SalaryEngine.resolve_include(include)
+    level, zone, location = SalaryEngine.pricing_inputs(job, override_params)
+
+    cache_key = None
+    if settings.SALARY_CACHE_ENABLED:
+        reader = SalaryEngine(None)
+        with stage("salary_cache"):
+            cache_key = salary_cache.fingerprint(
+                {
+                    **SalaryEngine.cache_inputs(job, level, zone, location),
+                    "include": sorted(include),
+                    "cube": reader.cube.generation if reader.reads_cube else None
+                },
+                await benchmark_dataset_version.fetch(db)
+            )
+            result = await salary_cache.get(cache_key)
+        if result is not None:
+            return result
+
+    engine = await pricing_engine(db, [(job.job_family, level, zone)])
+    result = await run_in_threadpool(engine.calculate_salary, job, override_params, include)
+
+    if cache_key is not None:
+        with stage("salary_cache"):
+            await salary_cache.set(cache_key, result)
+    return result
+
+
+async def price_salary_batch(
+    db: AsyncSession,
+    jobs: List[JobAnalysis],
+    include: Optional[Iterable[str]] = None
+) -> List[Dict]:
+    """SalaryEngine.calculate_salary_batch with market data fetched up front"""
+
+    include = SalaryEngine.resolve_include(include)
+    engine = await pricing_engine(db, [(job.job_family, job.detected_level, job.zone) for job in jobs])
+    return await run_in_threadpool(engine.calculate_salary_batch, jobs, include)
+
+
+async def price_scenario_grid(
+    db: AsyncSession,
+    job: JobAnalysis,
+    levels: List[int],
+    zones: List[int],
+    locations: List[Optional[str]]
+) -> List[Dict]:
+    """SalaryEngine.calculate_scenario_grid with the grid's market data fetched up front
+
+    The family's cells and the level/zone fallback for the cells it lacks are
+    each read in one query, keyed as the engine will ask.
+    """
+
+    keys = [(job.job_family, level, zone) for level in levels for zone in zones]
+    engine = await pricing_engine(db, keys)
+    return await run_in_threadpool(engine.calculate_scenario_grid, job, levels, zones, locations)
+
+
+async def pricing_engine(db: AsyncSession, keys: Iterable[MarketKey]) -> SalaryEngine:
+    """A SalaryEngine that needs no session: the cube, or market data fetched for ``keys``"""
+
+    engine = SalaryEngine(None)
+    if not engine.reads_cube:
+        with stage("benchmarks"):
+            engine.market_data = await fetch_market_grid(db, keys)
+    return engine
@@ -0,0 +1,179 @@
+"""
+Compiled multi-pattern matching for weighted skills and titles
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+from collections import deque
+from functools import lru_cache
+import json
+import re
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Default weights, overridable with a JSON file at SKILL_WEIGHTS_FILE
+DEFAULT_SKILL_WEIGHTS = {
+    # Added to the skills premium for each matching skill
+    "premium_skills": {
+        "kubernetes": 0.05,
+        "aws": 0.03,
+        "machine learning": 0.08,
+        "ai": 0.08,
+        "blockchain": 0.05,
+        "security": 0.05,
+        "golang": 0.04,
+        "rust": 0.04
+    },
+    # Market demand adjustment per skill that mentions a hot skill
+    "hot_skills": {
+        "ai": 0.05,
+        "machine learning": 0.05,
+        "kubernetes": 0.05,
+        "rust": 0.05,
+        "golang": 0.05
+    },
+    # Market demand adjustment for high-demand job titles
+    "high_demand_titles": {
+        "staff": 0.1,
+        "principal": 0.1,
+        "architect": 0.1,
+        "director": 0.1
+    }
+}
+
+_SEPARATORS = re.compile(r"[\s\-_]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace, hyphens and underscores to single spaces"""
+    return _SEPARATORS.sub(" ", text.lower()).strip()
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over a weighted pattern table
+
+    Matching costs O(len(text) + matches) regardless of how many patterns are
+    loaded. A match only counts when it starts and ends on a word boundary, so
+    "ai" matches "AI/ML" but not "maintain".
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        self.patterns: List[str] = []
+        self.weights: List[float] = []
+
+        for pattern, weight in weights.items():
+            normalized = normalize_text(pattern)
+            if normalized:
+                self.patterns.append(normalized)
+                self.weights.append(float(weight))
+
+        self._build()
+
+    def _build(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(pattern_id)
+
+        # Breadth-first pass to set failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: Optional[str]) -> List[int]:
+        """Return ids of distinct patterns found in text at word boundaries"""
+
+        if not text:
+            return []
+
+        text = normalize_text(text)
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Dict[int, None] = {}
+
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            for pattern_id in output[node]:
+                start = end - len(self.patterns[pattern_id]) + 1
+                if _is_boundary(text, start - 1) and _is_boundary(text, end + 1):
+                    found[pattern_id] = None
+
+        return list(found)
+
+    def matches(self, text: Optional[str]) -> List[str]:
+        """Return the distinct patterns found in text"""
+        return [self.patterns[pattern_id] for pattern_id in self.find(text)]
+
+    def total_weight(self, text: Optional[str]) -> float:
+        """Sum of weights of the distinct patterns found in text"""
+        return sum(self.weights[pattern_id] for pattern_id in self.find(text))
+
+    def max_weight(self, text: Optional[str]) -> float:
+        """Largest weight among patterns found in text, or 0.0"""
+        return max((self.weights[pattern_id] for pattern_id in self.find(text)), default=0.0)
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+class SkillMatchers(NamedTuple):
+    premium_skills: SkillMatcher
+    hot_skills: SkillMatcher
+    high_demand_titles: SkillMatcher
+
+
+def load_skill_weights(path: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """Load the weights table, falling back to defaults for missing sections"""
+
+    weights = {name: dict(table) for name, table in DEFAULT_SKILL_WEIGHTS.items()}
+    if not path:
+        return weights
+
+    try:
+        with open(path) as f:
+            overrides = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not load skill weights from {path}: {e}")
+        return weights
+
+    for name in weights:
+        if name in overrides:
+            weights[name] = overrides[name]
+    return weights
+
+
+@lru_cache(maxsize=1)
+def get_skill_matchers() -> SkillMatchers:
+    """Build the shared matchers once per process"""
+
+    weights = load_skill_weights(settings.SKILL_WEIGHTS_FILE)
+    return SkillMatchers(
+        premium_skills=SkillMatcher(weights["premium_skills"]),
+        hot_skills=SkillMatcher(weights["hot_skills"]),
+        high_demand_titles=SkillMatcher(weights["high_demand_titles"])
+    )
@@ -0,0 +1,111 @@
+"""
+Request parsing helpers of the analysis API
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import analysis
+from app.api.analysis import parse_include
+from app.services.salary_engine import SalaryEngine
+
+from tests.test_salary_engine import make_jobs
+
+
+@pytest.mark.parametrize("value", [None, "all", " all "])
+def test_parse_include_defaults_to_every_section(value):
+    assert parse_include(value) is None
+
+
+def test_parse_include_none_means_numbers_only():
+    assert parse_include("none") == frozenset()
+
+
+def test_parse_include_selects_sections():
+    assert parse_include("justification, market_position,") == frozenset({"justification", "market_position"})
+
+
+def test_parse_include_rejects_unknown_sections():
+    with pytest.raises(HTTPException) as error:
+        parse_include("justification,bogus")
+    assert error.value.status_code == 400
+    assert "bogus" in error.value.detail
+
+
+def test_every_section_is_accepted():
+    assert parse_include(",".join(SalaryEngine.INSIGHT_SECTIONS)) == SalaryEngine.INSIGHT_SECTIONS
+
+
+class RecordingSession:
+    """Returns one job and records what the endpoint writes"""
+
+    def __init__(self, job):
+        self.job = job
+        self.added = []
+        self.executed = []
+        self.commits = 0
+
+    async def scalar(self, statement):
+        return self.job
+
+    async def scalars(self, statement):
+        return type("Result", (), {"all": lambda _: [self.job]})()
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    async def execute(self, statement, rows=None):
+        self.executed.append(rows)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def refresh(self, instance):
+        pass
+
+
+@pytest.fixture
+def priced(monkeypatch):
+    job = make_jobs(1)[0]
+    job.id = uuid.uuid4()
+    result = SalaryEngine(None, market_data={}).calculate_salary(job)
+
+    async def price_salary(db, job, override_params=None, include=None):
+        return result
+
+    async def price_salary_batch(db, jobs, include=None):
+        return [result for _ in jobs]
+
+    monkeypatch.setattr(analysis, "price_salary", price_salary)
+    monkeypatch.setattr(analysis, "price_salary_batch", price_salary_batch)
+    return RecordingSession(job)
+
+
+@pytest.mark.parametrize("include, saved", [
+    (None, True),
+    ("all", True),
+    (",".join(SalaryEngine.INSIGHT_SECTIONS), True),
+    ("none", False),
+    ("justification", False)
+])
+def test_only_full_results_are_saved(priced, include, saved):
+    db = priced
+    salary_range = asyncio.run(analysis.calculate_salary(str(db.job.id), None, include, db))
+
+    assert salary_range.job_analysis_id == db.job.id
+    assert (db.added == [salary_range]) is saved
+    assert db.commits == int(saved)
+
+
+@pytest.mark.parametrize("include, saved", [(None, True), ("none", False)])
+def test_batch_saves_only_full_results(priced, include, saved):
+    db = priced
+    request = analysis.BatchSalaryCalculationRequest(job_ids=[db.job.id])
+    response = asyncio.run(analysis.calculate_salary_batch(request, include, db))
+
+    assert response["count"] == 1
+    assert (response["results"][0]["id"] is not None) is saved
+    assert bool(db.executed) is saved
@@ -0,0 +1,135 @@
+"""
+Benchmark aggregation statements, vintage filters and grouped lookups
+"""
+
+from datetime import date
+import asyncio
+import re
+
+import pytest
+
+from app.core.config import settings
+from app.services import benchmark_stats
+from app.services.benchmark_stats import (
+    FALLBACK_LIMIT,
+    PERCENTILES,
+    active_rollup_filters,
+    benchmark_cells_statement,
+    benchmark_fallback_statement,
+    benchmark_grid_statement,
+    benchmark_stats_statement,
+    fetch_market_grid,
+    rollup_cells_statement,
+    rollup_fallback_statement,
+    rollup_grid_statement,
+    rollup_rows_statement,
+    rollup_stats_statement,
+    vintage_start
+)
+
+
+@pytest.fixture
+def vintage_years(monkeypatch):
+    def set_years(years):
+        monkeypatch.setattr(settings, "BENCHMARK_VINTAGE_YEARS", years)
+    return set_years
+
+
+def test_vintage_start(vintage_years):
+    vintage_years(0)
+    assert vintage_start(date(2026, 6, 1)) is None
+
+    vintage_years(3)
+    assert vintage_start(date(2026, 6, 1)) == date(2024, 1, 1)
+
+
+def test_rollups_follow_the_vintage_window(vintage_years):
+    vintage_years(0)
+    assert active_rollup_filters() == []
+    assert "vintage_year" not in str(rollup_stats_statement(3, 1, "Engineering"))
+
+    vintage_years(2)
+    statement = rollup_stats_statement(3, 1, "Engineering").compile()
+    assert "benchmark_rollups.vintage_year >=" in str(statement)
+    assert vintage_start().year in statement.params.values()
+
+
+def test_rollup_lookups_apply_the_vintage_window(vintage_years):
+    vintage_years(2)
+    for statement in (
+        rollup_rows_statement(3, 1, "Engineering"),
+        rollup_grid_statement([3, 4], [1], "Engineering"),
+        rollup_cells_statement([("Engineering", 3, 1)]),
+        rollup_fallback_statement([(3, 1)])
+    ):
+        compiled = statement.compile()
+        assert "benchmark_rollups.vintage_year >=" in str(compiled)
+        assert vintage_start().year in compiled.params.values()
+
+
+def test_grouped_lookups_apply_the_vintage_window(vintage_years):
+    vintage_years(2)
+    for statement in (
+        benchmark_cells_statement([("Engineering", 3, 1), ("Sales", 4, 2)]),
+        benchmark_fallback_statement([(3, 1), (4, 2)])
+    ):
+        assert "benchmarks.data_date >=" in str(statement.compile())
+
+
+def test_fallback_samples_each_cell():
+    statement = benchmark_fallback_statement([(3, 1), (4, 2)]).compile()
+    assert "row_number() OVER (PARTITION BY compensation.benchmarks.level, compensation.benchmarks.zone)" in str(statement)
+    assert FALLBACK_LIMIT in statement.params.values()
+
+
+class EmptySession:
+    """Counts queries and finds no benchmarks for any job family"""
+
+    def __init__(self):
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return self
+
+    def all(self):
+        return []
+
+
+def test_market_grid_falls_back_in_one_query(monkeypatch):
+    monkeypatch.setattr(settings, "BENCHMARK_ROLLUPS_ENABLED", False)
+    monkeypatch.setattr(settings, "BENCHMARK_SKETCH_BLENDING", False)
+    fallback_calls = []
+
+    async def fetch_fallback_grid(db, cells):
+        cells = list(cells)
+        fallback_calls.append(cells)
+        return {cell: {"p50": cell[0] * 1000} for cell in cells if cell != (5, 2)}
+
+    monkeypatch.setattr(benchmark_stats, "fetch_fallback_grid", fetch_fallback_grid)
+    db = EmptySession()
+    keys = [("Engineering", 3, 1), (None, 4, 1), ("Sales", 3, 1), ("Sales", 5, 2)]
+
+    market_data = asyncio.run(fetch_market_grid(db, keys))
+
+    assert db.queries == 1
+    assert fallback_calls == [[(3, 1), (4, 1), (3, 1), (5, 2)]]
+    assert market_data == {
+        ("Engineering", 3, 1): {"p50": 3000},
+        (None, 4, 1): {"p50": 4000},
+        ("Sales", 3, 1): {"p50": 3000},
+        ("Sales", 5, 2): None
+    }
+
+
+def test_raw_aggregates_compute_every_median():
+    for statement in (
+        benchmark_stats_statement(3, 1, "Engineering"),
+        benchmark_grid_statement([3, 4], [1], "Engineering"),
+        benchmark_cells_statement([("Engineering", 3, 1)]),
+        benchmark_fallback_statement([(3, 1)])
+    ):
+        sql = str(statement.compile())
+        for name in PERCENTILES:
+            median = rf"percentile_cont\(\S+\) WITHIN GROUP \(ORDER BY nullif\(\S+\.{name}_salary, \S+\)\)"
+            assert re.search(rf"{median} AS {name}_median", sql)
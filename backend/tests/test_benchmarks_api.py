@@ -0,0 +1,30 @@
+"""
+Revalidation of the benchmarks API
+"""
+
+from datetime import date
+
+from app.api import benchmarks
+from app.api.benchmarks import details_etag
+from app.core.config import settings
+
+VERSION = ("job-1", date(2026, 1, 5), None, None, None, 7)
+
+
+def test_details_etag_follows_benchmark_settings(monkeypatch):
+    monkeypatch.setattr(settings, "BENCHMARK_ROLLUPS_ENABLED", False)
+    monkeypatch.setattr(settings, "BENCHMARK_SKETCH_BLENDING", False)
+    monkeypatch.setattr(settings, "BENCHMARK_VINTAGE_YEARS", 0)
+    etags = {details_etag(*VERSION)}
+
+    monkeypatch.setattr(settings, "BENCHMARK_SKETCH_BLENDING", True)
+    etags.add(details_etag(*VERSION))
+
+    monkeypatch.setattr(settings, "BENCHMARK_VINTAGE_YEARS", 2)
+    etags.add(details_etag(*VERSION))
+
+    # The window moves at the year rollover
+    monkeypatch.setattr(benchmarks, "vintage_start", lambda: date(2026, 1, 1))
+    etags.add(details_etag(*VERSION))
+
+    assert len(etags) == 4
@@ -0,0 +1,79 @@
+"""
+Location resolution and geographic factors
+"""
+
+import pytest
+
+from app.services.location_resolver import REMOTE, LocationResolver
+
+
+@pytest.fixture
+def resolver():
+    return LocationResolver(cache_size=16)
+
+
+@pytest.mark.parametrize("location, metro", [
+    ("San Francisco, CA", "San Francisco"),
+    ("san francisco ca", "San Francisco"),
+    ("SF", "San Francisco"),
+    ("SF Bay Area", "San Francisco"),
+    ("NYC", "New York"),
+    ("Brooklyn, NY", "New York"),
+    ("Seattle, WA, USA", "Seattle"),
+    ("Downtown Austin TX", "Austin"),
+    ("Los Angeles", "Los Angeles"),
+    ("Remote - US", REMOTE),
+    ("WFH", REMOTE),
+    ("Work from home", REMOTE),
+    ("Anywhere", REMOTE),
+    ("Fully remote, USA", REMOTE),
+    ("Distributed", REMOTE),
+    ("WFH, Seattle", "Seattle"),
+    ("Remote or Seattle", "Seattle"),
+    ("LA", "Los Angeles"),
+    ("LA, CA", "Los Angeles"),
+    ("NY, NY", "New York"),
+])
+def test_resolves_known_metros(resolver, location, metro):
+    assert resolver.resolve(location).name == metro
+
+
+@pytest.mark.parametrize("location", [
+    "Albany, NY",
+    "La Jolla, CA",
+    "La Crosse",
+    "NY Mills, MN",
+    "Near SF",
+    "Boise, ID",
+    "",
+    None
+])
+def test_unknown_locations_do_not_resolve(resolver, location):
+    assert resolver.resolve(location) is None
+
+
+def test_geographic_factor_defaults_by_zone(resolver):
+    assert resolver.geographic_factor("San Francisco", 2) == 1.4
+    assert resolver.geographic_factor("Boise, ID", 1) == 1.2
+    assert resolver.geographic_factor("Boise, ID", 2) == 1.0
+
+
+def test_remote_aliases_use_the_remote_factor(resolver):
+    assert resolver.geographic_factor("WFH", 1) == 1.0
+    assert resolver.geographic_factor("Work from home", 1) == 1.0
+
+
+def test_short_aliases_do_not_reprice_other_places(resolver):
+    assert resolver.geographic_factor("La Jolla, CA", 2) == 1.0
+    assert resolver.geographic_factor("Albany, NY", 2) == 1.0
+
+
+def test_describe(resolver):
+    assert resolver.describe("New York") == "35% premium for primary tech market"
+    assert resolver.describe("Remote") == "Base market rate"
+
+
+def test_resolutions_are_cached(resolver):
+    resolver.resolve("Seattle")
+    resolver.resolve("Seattle")
+    assert resolver.cache_info().hits == 1
@@ -0,0 +1,43 @@
+"""
+Market data cursors and field projection
+"""
+
+from datetime import date
+from types import SimpleNamespace
+import uuid
+
+import pytest
+
+from app.services.market_data import MARKET_DATA_COLUMNS, decode_cursor, encode_cursor, parse_fields
+
+
+def test_cursor_round_trip():
+    row = SimpleNamespace(data_date=date(2024, 3, 31), id=uuid.uuid4())
+    cursor = encode_cursor(row)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (row.data_date, row.id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not-a-cursor",
+    "WzEsMl0",
+    "WyIyMDI0LTEzLTAxIiwieCJd",
+    # data_date is NOT NULL, so an undated cursor cannot come from a page
+    "W251bGwsIjAwMDAwMDAwLTAwMDAtMDAwMC0wMDAwLTAwMDAwMDAwMDAwMSJd"
+])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_parse_fields_defaults_to_every_column():
+    assert parse_fields(None) == MARKET_DATA_COLUMNS
+    assert "natural_key" not in MARKET_DATA_COLUMNS
+
+
+def test_parse_fields_deduplicates_and_rejects_unknown():
+    assert parse_fields("job_family, level,job_family") == ["job_family", "level"]
+    with pytest.raises(ValueError):
+        parse_fields("job_family,row_fingerprint")
@@ -0,0 +1,75 @@
+"""
+Quantile sketch accuracy, merging and serialization
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.services.quantile_sketch import SURVEY_QUANTILES, QuantileSketch
+
+SPREAD = {"p10": 0.78, "p25": 0.88, "p50": 1.0, "p75": 1.14, "p90": 1.3}
+
+
+def survey_row(median):
+    return {name: median * spread for name, spread in SPREAD.items()}
+
+
+def test_identical_rows_reproduce_their_percentiles():
+    sketch = QuantileSketch()
+    for _ in range(500):
+        sketch.add_survey_row(survey_row(100_000))
+
+    for name, q in SURVEY_QUANTILES.items():
+        assert sketch.quantile(q) == pytest.approx(100_000 * SPREAD[name], rel=0.01)
+
+
+def test_median_tracks_the_median_of_row_medians():
+    rng = random.Random(3)
+    medians = [rng.lognormvariate(11.5, 0.2) for _ in range(2000)]
+    sketch = QuantileSketch()
+    for median in medians:
+        sketch.add_survey_row(survey_row(median))
+
+    assert sketch.quantile(0.5) == pytest.approx(float(np.percentile(medians, 50)), rel=0.02)
+
+
+def test_merge_matches_a_single_sketch():
+    rng = random.Random(5)
+    rows = [survey_row(rng.uniform(80_000, 160_000)) for _ in range(1000)]
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for n, row in enumerate(rows):
+        whole.add_survey_row(row)
+        (left if n % 2 else right).add_survey_row(row)
+
+    merged = left.merge(right)
+    assert merged.total_weight == pytest.approx(whole.total_weight)
+    for q in SURVEY_QUANTILES.values():
+        assert merged.quantile(q) == pytest.approx(whole.quantile(q), rel=0.01)
+
+
+def test_compression_bounds_size():
+    sketch = QuantileSketch(compression=50)
+    for median in range(50_000, 150_000, 10):
+        sketch.add_survey_row(survey_row(median))
+    sketch.compress()
+
+    assert len(sketch) <= 4 * sketch.compression
+    assert sketch.total_weight == pytest.approx(10_000)
+
+
+def test_serialization_round_trip():
+    sketch = QuantileSketch()
+    sketch.add_survey_row({"p25": 90_000, "p50": 100_000, "p75": 115_000})
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+
+    assert restored.quantile(0.5) == pytest.approx(sketch.quantile(0.5), abs=0.01)
+    assert QuantileSketch.from_dict(None).quantile(0.5) == 0.0
+
+
+def test_rows_without_values_are_skipped():
+    sketch = QuantileSketch()
+    sketch.add_survey_row({"p10": None, "p50": 0})
+    sketch.add_survey_row(survey_row(100_000), weight=0)
+    assert len(sketch) == 0
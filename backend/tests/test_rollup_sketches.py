@@ -0,0 +1,56 @@
+"""
+Rollup sketches built by scripts/import_data.py blend sources like the row stats
+"""
+
+from types import SimpleNamespace
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from import_data import cell_sketches  # noqa: E402
+
+from app.services.benchmark_stats import sketch_market_data  # noqa: E402
+
+SPREAD = (0.78, 0.88, 1.0, 1.14, 1.3)
+CELL = ("Engineering", 4, 1, 2024)
+
+
+def survey_rows(count, center, seed):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        median = center * rng.uniform(0.85, 1.15)
+        rows.append((*CELL, *(round(median * spread, 2) for spread in SPREAD)))
+    return rows
+
+
+def rollup(source_type, rows):
+    sketch = cell_sketches(rows)[CELL]
+    return SimpleNamespace(source_type=source_type, row_count=len(rows), sketch=sketch.to_dict())
+
+
+def test_mixed_source_median_matches_percentile_cont():
+    # Mercer publishes no headcounts and Lattice does; neither may dominate
+    mercer = survey_rows(300, 100_000, seed=1)
+    lattice = survey_rows(100, 130_000, seed=2)
+
+    blended = sketch_market_data([rollup("mercer", mercer), rollup("lattice", lattice)])
+
+    # PERCENTILE_CONT(0.5) over the cell's p50_salary interpolates like numpy's default
+    expected = float(np.percentile([row[6] for row in mercer + lattice], 50))
+    assert blended["p50"] == pytest.approx(expected, rel=0.02)
+    assert sorted(blended["sources"]) == ["lattice", "mercer"]
+    assert blended["data_points"] == 400
+
+
+def test_sources_blend_by_row_count():
+    mercer = survey_rows(200, 100_000, seed=3)
+    lattice = survey_rows(200, 100_000, seed=4)
+    sketches = cell_sketches(mercer + lattice)
+
+    assert sketches[CELL].total_weight == pytest.approx(400)
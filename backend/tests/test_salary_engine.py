@@ -0,0 +1,184 @@
+"""
+Cube, scalar and batch pricing parity
+"""
+
+import statistics
+
+import pytest
+
+from app.models.job_analysis import JobAnalysis
+from app.services import benchmark_stats, salary_engine
+from app.services.benchmark_cube import BenchmarkCube, FALLBACK_LIMIT, PERCENTILES
+from app.services.benchmark_stats import combine_benchmark_stats
+from app.services.salary_engine import SalaryEngine
+
+from tests.conftest import FAMILIES, LEVELS, ZONES
+
+SKILLS = [["Python", "Kubernetes"], ["Machine Learning", "AWS", "Rust", "SQL"], [], None]
+LOCATIONS = ["San Francisco, CA", "Austin", "Boise, ID", "Remote", None]
+TITLES = ["Software Engineer", "Staff Engineer", "Principal Architect", "Analyst"]
+NUMERIC_KEYS = (
+    "min", "p25", "target", "p75", "max", "recommended_min", "recommended_target",
+    "recommended_max", "geographic_factor", "market_adjustment", "skills_premium", "confidence"
+)
+
+
+def expected_market_data(rows, job_family, level, zone):
+    """Aggregate rows the way the SQL path does: family cell, else a level/zone sample"""
+    matched = [row for row in rows if job_family and row[:3] == (job_family, level, zone)]
+    if not matched:
+        matched = [row for row in rows if row[1:3] == (level, zone)][:FALLBACK_LIMIT]
+    if not matched:
+        return None
+
+    result = {}
+    for n, name in enumerate(PERCENTILES):
+        values = [float(row[4 + n]) for row in matched if row[4 + n]]
+        result[name] = sum(values) / len(values) if values else 0
+    result["sources"] = sorted({row[3] for row in matched})
+    result["data_points"] = len(matched)
+    return result
+
+
+def source_stats(rows):
+    """Per-source stats in the shape load_benchmark_stats returns"""
+    stats = {}
+    for source in sorted({row[3] for row in rows}):
+        source_rows = [row for row in rows if row[3] == source]
+        stats[source] = {"count": len(source_rows)}
+        for n, name in enumerate(PERCENTILES):
+            values = [float(row[4 + n]) for row in source_rows if row[4 + n]]
+            stats[source][name] = {
+                "count": len(values),
+                "avg": sum(values) / len(values) if values else 0,
+                "min": min(values, default=0),
+                "max": max(values, default=0),
+                "median": statistics.median(values) if values else 0
+            }
+    return stats
+
+
+def make_jobs(count=300):
+    families = FAMILIES + ["Unknown Family", None]
+    return [
+        JobAnalysis(
+            job_title=TITLES[i % len(TITLES)],
+            job_family=families[i % len(families)],
+            detected_level=(LEVELS + [99])[i % (len(LEVELS) + 1)],
+            detected_band=1 + i % 2,
+            zone=ZONES[i % len(ZONES)],
+            location=LOCATIONS[i % len(LOCATIONS)],
+            skills_extracted=SKILLS[i % len(SKILLS)],
+            years_experience_min=2,
+            years_experience_max=6
+        )
+        for i in range(count)
+    ]
+
+
+def normalized(result):
+    return {**result, "sources": sorted(result["sources"])}
+
+
+@pytest.fixture
+def engine(cube):
+    return SalaryEngine(None, cube=cube)
+
+
+def test_cube_matches_row_aggregation(cube, benchmark_rows):
+    for job_family in FAMILIES + ["Unknown Family", None]:
+        for level in LEVELS + [99]:
+            for zone in ZONES:
+                expected = expected_market_data(benchmark_rows, job_family, level, zone)
+                actual = cube.lookup(job_family, level, zone)
+                if expected is None:
+                    assert actual is None
+                    continue
+                assert sorted(actual["sources"]) == expected["sources"]
+                assert actual["data_points"] == expected["data_points"]
+                for name in PERCENTILES:
+                    assert actual[name] == pytest.approx(expected[name])
+
+
+def test_batch_matches_scalar(engine):
+    jobs = make_jobs()
+    batch = engine.calculate_salary_batch(jobs)
+
+    assert len(batch) == len(jobs)
+    for job, result in zip(jobs, batch):
+        assert normalized(result) == normalized(engine.calculate_salary(job))
+
+
+def test_batch_matches_scalar_without_insights(engine):
+    jobs = make_jobs(60)
+    for job, result in zip(jobs, engine.calculate_salary_batch(jobs, include=())):
+        assert normalized(result) == normalized(engine.calculate_salary(job, include=()))
+        assert result["insights"] == {}
+        assert result["justification"] is None
+
+
+def test_scenario_grid_matches_scalar(engine):
+    for job in make_jobs(12):
+        levels, zones, locations = [1, 3, 99], ZONES, ["Seattle", None]
+        scenarios = engine.calculate_scenario_grid(job, levels, zones, locations)
+
+        assert len(scenarios) == len(levels) * len(zones) * len(locations)
+        for scenario in scenarios:
+            overrides = {key: scenario[key] for key in ("level", "zone", "location")}
+            expected = engine.calculate_salary(job, overrides, include=())
+            for key in NUMERIC_KEYS:
+                assert scenario[key] == pytest.approx(expected[key]), key
+            assert sorted(scenario["sources"]) == sorted(expected["sources"])
+
+
+@pytest.fixture
+def query_engine(monkeypatch, benchmark_rows):
+    """Engine on the database path, with the stats loaders answered from rows
+
+    Sales has no benchmarks at levels 4 and 5, so its grid needs the fallback.
+    """
+    rows = [row for row in benchmark_rows if not (row[0] == "Sales" and row[1] >= 4)]
+
+    def load_benchmark_stats(db, level, zone, job_family=None, source_types=None, limit=None):
+        matched = [row for row in rows if row[1:3] == (level, zone) and (not job_family or row[0] == job_family)]
+        return source_stats(matched[:limit] if limit else matched)
+
+    def load_benchmark_grid(db, levels, zones, job_family=None):
+        grid = {}
+        for level in levels:
+            for zone in zones:
+                stats = load_benchmark_stats(db, level, zone, job_family) if job_family else {}
+                if stats:
+                    grid[(level, zone)] = combine_benchmark_stats(stats)
+        return grid
+
+    monkeypatch.setattr(benchmark_stats, "load_benchmark_stats", load_benchmark_stats)
+    def load_fallback_grid(db, cells):
+        grid = {}
+        for level, zone in cells:
+            stats = load_benchmark_stats(db, level, zone, limit=FALLBACK_LIMIT)
+            if stats:
+                grid[(level, zone)] = combine_benchmark_stats(stats)
+        return grid
+
+    monkeypatch.setattr(salary_engine, "load_benchmark_grid", load_benchmark_grid)
+    monkeypatch.setattr(salary_engine, "load_fallback_grid", load_fallback_grid)
+    return SalaryEngine(None, cube=BenchmarkCube())
+
+
+@pytest.mark.parametrize("job_family", ["Sales", "Unknown Family", None])
+def test_scenario_grid_fallback_matches_scalar_queries(query_engine, job_family):
+    job = make_jobs(1)[0]
+    job.job_family = job_family
+
+    for scenario in query_engine.calculate_scenario_grid(job, LEVELS, ZONES, ["Austin"]):
+        overrides = {key: scenario[key] for key in ("level", "zone", "location")}
+        expected = query_engine.calculate_salary(job, overrides, include=())
+        for key in NUMERIC_KEYS:
+            assert scenario[key] == pytest.approx(expected[key]), key
+        assert sorted(scenario["sources"]) == sorted(expected["sources"])
+
+
+def test_unknown_include_section_is_rejected(engine):
+    with pytest.raises(ValueError):
+        engine.calculate_salary(make_jobs(1)[0], include=["bogus"])
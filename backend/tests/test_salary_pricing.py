@@ -0,0 +1,137 @@
+"""
+Async pricing entry points: result cache, prefetched market data, threadpool
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.services import salary_pricing
+from app.services.salary_cache import SalaryResultCache
+from app.services.salary_engine import SalaryEngine
+
+from tests.conftest import LEVELS, ZONES
+from tests.test_salary_engine import make_jobs, normalized
+
+
+class FakeSession:
+    """Answers the dataset version query; pricing must not issue any other"""
+
+    async def scalar(self, statement):
+        return 7
+
+
+@pytest.fixture
+def shared_cube(monkeypatch, cube):
+    monkeypatch.setattr(settings, "BENCHMARK_CUBE_ENABLED", True)
+    monkeypatch.setattr(settings, "BENCHMARK_SKETCH_BLENDING", False)
+    monkeypatch.setattr("app.services.salary_engine.benchmark_cube", cube)
+    return cube
+
+
+@pytest.fixture
+def fetched(monkeypatch, cube):
+    """Serve fetch_market_grid from the cube and record each fetch's keys and thread"""
+    monkeypatch.setattr(settings, "BENCHMARK_CUBE_ENABLED", False)
+    calls = {"fetches": [], "threads": set()}
+
+    async def fetch_market_grid(db, keys):
+        keys = list(keys)
+        calls["fetches"].append(keys)
+        calls["threads"].add(threading.get_ident())
+        return {key: cube.lookup(*key) for key in keys}
+
+    monkeypatch.setattr(salary_pricing, "fetch_market_grid", fetch_market_grid)
+    return calls
+
+
+def test_cache_hit_skips_the_engine(monkeypatch, shared_cube):
+    cache = SalaryResultCache()
+    monkeypatch.setattr(settings, "SALARY_CACHE_ENABLED", True)
+    monkeypatch.setattr(salary_pricing, "salary_cache", cache)
+    job = make_jobs(1)[0]
+
+    first = asyncio.run(salary_pricing.price_salary(FakeSession(), job))
+    monkeypatch.setattr(SalaryEngine, "calculate_salary", lambda *args: pytest.fail("engine ran"))
+    second = asyncio.run(salary_pricing.price_salary(FakeSession(), job))
+
+    assert second == first
+    assert cache.stats()["hits"] == 1
+
+
+def test_cube_rebuild_changes_the_cache_key(monkeypatch, shared_cube, benchmark_rows):
+    cache = SalaryResultCache()
+    monkeypatch.setattr(settings, "SALARY_CACHE_ENABLED", True)
+    monkeypatch.setattr(salary_pricing, "salary_cache", cache)
+    job = make_jobs(1)[0]
+
+    asyncio.run(salary_pricing.price_salary(FakeSession(), job))
+    generation = shared_cube.generation
+
+    # Reloading the same rows keeps the generation, so workers share entries
+    shared_cube.load_rows(benchmark_rows)
+    asyncio.run(salary_pricing.price_salary(FakeSession(), job))
+    assert shared_cube.generation == generation
+    assert cache.stats()["hits"] == 1
+
+    # New data must miss without clearing the cache, as Redis is not cleared
+    shared_cube.load_rows(benchmark_rows[1:])
+    asyncio.run(salary_pricing.price_salary(FakeSession(), job))
+    assert shared_cube.generation != generation
+    assert cache.stats()["hits"] == 1
+
+
+def test_sketch_blending_bypasses_the_cube(monkeypatch, shared_cube):
+    monkeypatch.setattr(settings, "BENCHMARK_SKETCH_BLENDING", True)
+    engine = SalaryEngine(None)
+
+    assert engine.cube is None
+    assert not engine.reads_cube
+
+
+def test_prefetched_batch_matches_cube(fetched, cube):
+    jobs = make_jobs(60)
+
+    async def price():
+        return threading.get_ident(), await salary_pricing.price_salary_batch(FakeSession(), jobs)
+
+    loop_thread, results = asyncio.run(price())
+
+    expected = SalaryEngine(None, cube=cube).calculate_salary_batch(jobs)
+    assert [normalized(r) for r in results] == [normalized(r) for r in expected]
+    # One grouped fetch for every market cell, on the event loop
+    assert len(fetched["fetches"]) == 1
+    assert set(fetched["fetches"][0]) == {(job.job_family, job.detected_level, job.zone) for job in jobs}
+    assert fetched["threads"] == {loop_thread}
+
+
+def test_engine_runs_off_the_event_loop(monkeypatch, fetched):
+    threads = []
+    calculate = SalaryEngine.calculate_salary
+
+    def recording(self, *args):
+        threads.append(threading.get_ident())
+        return calculate(self, *args)
+
+    monkeypatch.setattr(SalaryEngine, "calculate_salary", recording)
+
+    async def price():
+        await salary_pricing.price_salary(FakeSession(), make_jobs(1)[0])
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(price())
+    assert threads and threads[0] != loop_thread
+
+
+@pytest.mark.parametrize("job_family", ["Engineering", "Unknown Family"])
+def test_prefetched_scenarios_match_cube(fetched, cube, job_family):
+    job = make_jobs(1)[0]
+    job.job_family = job_family
+    scenarios = asyncio.run(salary_pricing.price_scenario_grid(FakeSession(), job, LEVELS, ZONES, ["Austin"]))
+
+    expected = SalaryEngine(None, cube=cube).calculate_scenario_grid(job, LEVELS, ZONES, ["Austin"])
+    assert [normalized(s) for s in scenarios] == [normalized(s) for s in expected]
+    # The whole grid, fallback included, is one grouped fetch
+    assert fetched["fetches"] == [[(job_family, level, zone) for level in LEVELS for zone in ZONES]]
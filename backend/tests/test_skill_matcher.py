@@ -0,0 +1,38 @@
+"""
+Word-boundary skill and title matching
+"""
+
+import pytest
+
+from app.services.skill_matcher import SkillMatcher
+
+
+@pytest.fixture
+def matcher():
+    return SkillMatcher({"ai": 0.08, "machine learning": 0.05, "go": 0.04, "c++": 0.02})
+
+
+@pytest.mark.parametrize("text", ["AI", "AI/ML", "applied ai", "Generative-AI"])
+def test_matches_on_word_boundaries(matcher, text):
+    assert "ai" in matcher.matches(text)
+
+
+@pytest.mark.parametrize("text", ["maintain", "email", "paid", "Django", "golang"])
+def test_ignores_matches_inside_words(matcher, text):
+    assert matcher.matches(text) == []
+
+
+def test_separators_are_normalized(matcher):
+    assert matcher.matches("Machine-Learning") == ["machine learning"]
+    assert matcher.matches("machine_learning engineer") == ["machine learning"]
+
+
+def test_weights_count_distinct_patterns(matcher):
+    assert matcher.total_weight("AI and more AI, plus machine learning") == pytest.approx(0.13)
+    assert matcher.max_weight("machine learning and AI") == pytest.approx(0.08)
+    assert matcher.max_weight(None) == 0.0
+
+
+def test_overlapping_patterns_are_all_found():
+    matcher = SkillMatcher({"learning": 0.01, "machine learning": 0.05})
+    assert sorted(matcher.matches("machine learning")) == ["learning", "machine learning"]
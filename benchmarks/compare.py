@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark JSON reports from micro.py or endpoints.py
+
+Benchmarks are matched by name and compared on median time. The exit status
+is 1 when any benchmark slowed down by more than --threshold percent, so the
+script can gate CI runs.
+
+Usage:
+    python benchmarks/compare.py before.json after.json
+    python benchmarks/compare.py before.json after.json --threshold 5
+"""
+
+from typing import Dict, Tuple
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> Tuple[Dict, Dict]:
+    with open(path) as f:
+        report = json.load(f)
+    return report, {r["name"]: r for r in report["results"] if "skipped" not in r}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args()
+
+    before_report, before = load_results(args.before)
+    after_report, after = load_results(args.after)
+
+    print(f"📊 {before_report['meta'].get('commit')} → {after_report['meta'].get('commit')}")
+    print("=" * 50)
+
+    regressions = 0
+    for name, result in after.items():
+        baseline = before.get(name)
+        if baseline is None:
+            print(f"  {name:<48} new")
+            continue
+        change = (result["median_ms"] - baseline["median_ms"]) / baseline["median_ms"] * 100
+        marker = "✓"
+        if change > args.threshold:
+            marker = "⚠️ "
+            regressions += 1
+        print(
+            f"{marker} {name:<48} {baseline['median_ms']:>10.3f}ms → {result['median_ms']:>10.3f}ms"
+            f"  ({change:+.1f}%)"
+        )
+
+    for name in before.keys() - after.keys():
+        print(f"  {name:<48} missing")
+
+    if regressions:
+        print(f"\n⚠️  {regressions} benchmark(s) slower by more than {args.threshold:.0f}%")
+        sys.exit(1)
+    print("\n✓ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Concurrency benchmark: request latency under mixed load
+
+Runs against a live API server. Slow, database-heavy requests (benchmark
+details, salary calculations) run alongside a steady stream of fast probes
+(/health/live, job lookups). With blocking database calls, every slow query
+stalls the worker's event loop and the probes' p99 climbs to the slow query
+time. With the async session layer they should stay flat.
+
+Usage:
+    python benchmarks/concurrency.py --job-id <uuid> --label async --output after.json
+    python benchmarks/concurrency.py --compare before.json after.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list of latencies"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], errors: int) -> Dict:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2)
+    }
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    requests: List[tuple],
+    deadline: float,
+    latencies: List[float],
+    errors: List[int]
+):
+    """Cycle through requests until the deadline, recording latencies"""
+    i = 0
+    while time.perf_counter() < deadline:
+        method, path = requests[i % len(requests)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path)
+            if response.status_code >= 500:
+                errors[0] += 1
+        except httpx.HTTPError:
+            errors[0] += 1
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args) -> Dict:
+    slow_requests = [
+        ("GET", f"/api/benchmarks/details/{args.job_id}"),
+        ("POST", f"/api/analysis/calculate/{args.job_id}?include=none")
+    ]
+    fast_requests = [
+        ("GET", "/health/live"),
+        ("GET", f"/api/jobs/{args.job_id}")
+    ]
+
+    results = {}
+    limits = httpx.Limits(max_connections=args.slow_clients + args.fast_clients)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        # Warm up connections, caches and the benchmark cube
+        for method, path in slow_requests + fast_requests:
+            try:
+                await client.request(method, path)
+            except httpx.HTTPError as e:
+                print(f"⚠️  Warm-up {method} {path} failed: {e!r}", file=sys.stderr)
+
+        deadline = time.perf_counter() + args.duration
+        slow_latencies, slow_errors = [], [0]
+        fast_latencies, fast_errors = [], [0]
+
+        await asyncio.gather(
+            *[
+                worker(client, slow_requests, deadline, slow_latencies, slow_errors)
+                for _ in range(args.slow_clients)
+            ],
+            *[
+                worker(client, fast_requests, deadline, fast_latencies, fast_errors)
+                for _ in range(args.fast_clients)
+            ]
+        )
+
+    results["slow"] = summarize(slow_latencies, slow_errors[0])
+    results["fast"] = summarize(fast_latencies, fast_errors[0])
+
+    return {
+        "label": args.label,
+        "base_url": args.base_url,
+        "duration_seconds": args.duration,
+        "slow_clients": args.slow_clients,
+        "fast_clients": args.fast_clients,
+        "results": results
+    }
+
+
+def compare(before_path: str, after_path: str):
+    """Print p99 latency per request class for two result files"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"{'class':<8}{before['label']:>16}{after['label']:>16}{'change':>10}")
+    for name in ("fast", "slow"):
+        b = before["results"][name]["p99_ms"]
+        a = after["results"][name]["p99_ms"]
+        change = f"{(a - b) / b * 100:+.0f}%" if b else "n/a"
+        print(f"{name:<8}{b:>14.1f}ms{a:>14.1f}ms{change:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--job-id", help="Existing job analysis id to exercise")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--slow-clients", type=int, default=8)
+    parser.add_argument("--fast-clients", type=int, default=32)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if not args.job_id:
+        parser.error("--job-id is required unless --compare is given")
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+End-to-end endpoint benchmarks through an in-process ASGI client
+
+Requests go through the full FastAPI stack (middleware, dependencies,
+database, SalaryEngine) with MockOpenAIService standing in for OpenAI, so no
+network or API key is needed. A scratch PostgreSQL database with the schema
+from scripts/create_database.sql is required; synthetic benchmark rows are
+seeded before the run and removed afterwards, while uploaded jobs are left in
+place. Without a reachable database every benchmark is reported as skipped.
+
+Usage:
+    python benchmarks/endpoints.py --database-url postgresql://... --output endpoints.json
+"""
+
+from typing import Awaitable, Callable, Dict, List
+import argparse
+import asyncio
+import os
+import time
+
+from common import setup_backend_path, skipped, summarize, write_report
+from synthetic_data import SyntheticSurvey
+
+SOURCE_FILE = "synthetic-benchmark"
+BENCHMARKS = [
+    "POST /api/jobs/upload",
+    "GET /api/jobs/{job_id}",
+    "POST /api/analysis/calculate/{job_id}",
+    "POST /api/analysis/calculate/{job_id}?include=none",
+    "GET /api/benchmarks/details/{job_id}"
+]
+
+JOB_TEMPLATES = [
+    "Senior Software Engineer\nEngineering\nSan Francisco, CA\nPython, Kubernetes, AWS, 5+ years.",
+    "Data Scientist\nData Science\nNew York, NY\nPython, SQL, Machine Learning, 3+ years.",
+    "Junior Product Designer\nDesign\nAustin, TX\nFigma, user research, 1+ years.",
+    "Staff Engineer\nEngineering\nRemote\nGolang, distributed systems, 8+ years.",
+    "Sales Associate\nSales\nBoise, ID\nCRM, negotiation, 2+ years."
+]
+
+
+def seed_benchmarks(survey: SyntheticSurvey, rows: int) -> int:
+    """Insert synthetic survey rows, tagged so they can be removed afterwards"""
+    from sqlalchemy import delete, insert
+    from app.models.benchmark import Benchmark
+    from app.models.database import engine
+
+    with engine.begin() as conn:
+        conn.execute(delete(Benchmark).where(Benchmark.source_file == SOURCE_FILE))
+        for source_type in ("mercer", "lattice"):
+            for df in survey.frames(source_type, rows // 2, chunk_rows=50_000):
+                # Plain Python scalars and None, which the DB driver can adapt
+                df = df.astype(object).where(df.notna(), None).map(
+                    lambda value: value.item() if hasattr(value, "item") else value
+                )
+                columns = [c.name for c in Benchmark.__table__.columns]
+                records = [
+                    {
+                        **{key: value for key, value in record.items() if key in columns},
+                        "source_type": source_type,
+                        "source_file": SOURCE_FILE,
+                        "trend_velocity": None if record.get("trend_velocity") is None else str(record["trend_velocity"])
+                    }
+                    for record in df.to_dict("records")
+                ]
+                conn.execute(insert(Benchmark), records)
+    return rows // 2 * 2
+
+
+def remove_benchmarks() -> None:
+    from sqlalchemy import delete
+    from app.models.benchmark import Benchmark
+    from app.models.database import engine
+
+    with engine.begin() as conn:
+        conn.execute(delete(Benchmark).where(Benchmark.source_file == SOURCE_FILE))
+
+
+async def measure_async(
+    name: str,
+    func: Callable[[int], Awaitable],
+    iterations: int,
+    warmup: int = 2,
+    **params
+) -> Dict:
+    """Async counterpart of common.measure; ``func`` receives the iteration index"""
+    for i in range(warmup):
+        await func(i)
+
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        await func(warmup + i)
+        timings.append(time.perf_counter() - start)
+    return summarize(name, timings, **params)
+
+
+async def run_benchmarks(iterations: int) -> List[Dict]:
+    import httpx
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+            def ok(response: httpx.Response) -> httpx.Response:
+                response.raise_for_status()
+                return response
+
+            job_ids: List[str] = []
+
+            async def upload(i: int):
+                text = JOB_TEMPLATES[i % len(JOB_TEMPLATES)]
+                response = ok(await client.post(
+                    "/api/jobs/upload", files={"file": (f"benchmark-{i}.txt", text.encode(), "text/plain")}
+                ))
+                job_ids.append(response.json()["id"])
+
+            results = [await measure_async("POST /api/jobs/upload", upload, iterations)]
+
+            def job_id(i: int) -> str:
+                return job_ids[i % len(job_ids)]
+
+            async def get_job(i: int):
+                ok(await client.get(f"/api/jobs/{job_id(i)}"))
+
+            async def calculate(i: int):
+                ok(await client.post(f"/api/analysis/calculate/{job_id(i)}"))
+
+            async def calculate_minimal(i: int):
+                ok(await client.post(f"/api/analysis/calculate/{job_id(i)}", params={"include": "none"}))
+
+            async def details(i: int):
+                ok(await client.get(f"/api/benchmarks/details/{job_id(i)}"))
+
+            results.append(await measure_async("GET /api/jobs/{job_id}", get_job, iterations))
+            results.append(await measure_async("POST /api/analysis/calculate/{job_id}", calculate, iterations))
+            results.append(await measure_async(
+                "POST /api/analysis/calculate/{job_id}?include=none", calculate_minimal, iterations
+            ))
+            # Details reads the stored salary calculation, so it runs after calculate
+            results.append(await measure_async("GET /api/benchmarks/details/{job_id}", details, iterations))
+            return results
+
+
+async def database_reachable() -> bool:
+    from app.models.database import async_engine
+
+    try:
+        async with async_engine.connect():
+            return True
+    except Exception as e:
+        print(f"⚠️  Database unavailable: {e}")
+        return False
+    finally:
+        # Pooled connections are bound to this event loop
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000, help="Synthetic benchmark rows to seed")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"),
+                        help="Scratch PostgreSQL database (overrides DATABASE_URL)")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so the URL must be in place first
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ["OPENAI_MOCK_ENABLED"] = "true"
+    os.environ["MOCK_OPENAI_SEED"] = str(args.seed)
+    setup_backend_path()
+
+    print("🚀 Running endpoint benchmarks...")
+    print("=" * 50)
+
+    if not asyncio.run(database_reachable()):
+        results = [skipped(name, "database unavailable") for name in BENCHMARKS]
+    else:
+        print(f"✓ Seeded {seed_benchmarks(SyntheticSurvey(seed=args.seed), args.rows):,} benchmark rows")
+        try:
+            results = asyncio.run(run_benchmarks(args.iterations))
+        finally:
+            remove_benchmarks()
+
+    write_report("endpoints", results, args.output, rows=args.rows, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
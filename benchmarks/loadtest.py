@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Load-test driver: replay a traffic mix against a live API at a target RPS
+
+Requests arrive open-loop (Poisson arrivals at --rps), so a slow server does
+not slow the arrival rate down. Latency is measured from each request's
+scheduled start, which includes any time it waited behind the driver, to avoid
+coordinated omission. The mix covers job uploads, salary calculations,
+benchmark details and chat over WebSocket; for chat, time to the first
+streamed chunk is reported separately.
+
+The schedule is seeded. --record saves it as JSON lines ({"at": seconds,
+"op": name}), and --replay runs a saved or hand-written schedule instead.
+
+Run the API with a mock LLM so results reflect the app rather than OpenAI:
+either OPENAI_MOCK_ENABLED=true with MOCK_OPENAI_LATENCY_MS, or
+OPENAI_BASE_URL pointed at benchmarks/mock_openai_server.py.
+
+Usage:
+    python benchmarks/loadtest.py --rps 20 --duration 60 --mix upload=1,calculate=4,details=4,chat=1 --output load.json
+    python benchmarks/loadtest.py --replay traffic.jsonl --output load.json
+"""
+
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import httpx
+import websockets
+
+from common import skipped, summarize, write_report
+
+OPERATIONS = ("upload", "calculate", "details", "chat", "health")
+DEFAULT_MIX = "upload=1,calculate=4,details=4,chat=1"
+
+JOB_DESCRIPTIONS = [
+    "Senior Software Engineer\nSan Francisco, CA\nPython, Kubernetes, AWS. 5+ years building distributed systems.",
+    "Data Analyst\nNew York, NY\nSQL, Python, dashboards. 2+ years of analytics experience.",
+    "Junior Product Designer\nAustin, TX\nFigma, prototyping, user research.",
+    "Staff Engineer\nRemote\nGolang, Rust, platform architecture. 10+ years.",
+    "Engineering Manager\nSeattle, WA\nLead a team of 8 engineers, hiring and delivery.",
+    "Associate Operations Analyst\nBoise, ID\nExcel, process improvement, reporting."
+]
+CHAT_MESSAGES = [
+    "What salary range should we offer?",
+    "How does remote work affect this range?",
+    "What benefits are typical for this role?",
+    "Which skills drive the premium here?"
+]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' (expected one of {', '.join(OPERATIONS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def synthetic_schedule(rps: float, duration: float, mix: Dict[str, float], seed: int) -> List[Dict]:
+    """Poisson arrivals with operations drawn from the mix"""
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    schedule, at = [], 0.0
+    while True:
+        at += rng.expovariate(rps)
+        if at >= duration:
+            return schedule
+        schedule.append({"at": round(at, 6), "op": rng.choices(names, weights)[0]})
+
+
+def load_schedule(path: str) -> List[Dict]:
+    with open(path) as f:
+        schedule = [json.loads(line) for line in f if line.strip()]
+    unknown = {entry["op"] for entry in schedule} - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in {path}: {', '.join(sorted(unknown))}")
+    return sorted(schedule, key=lambda entry: entry["at"])
+
+
+class TrafficDriver:
+    """Issues scheduled requests and collects latencies per operation"""
+
+    def __init__(self, client: httpx.AsyncClient, ws_url: str, job_ids: List[str], seed: int):
+        self.client = client
+        self.ws_url = ws_url
+        self.job_ids = job_ids
+        self.rng = random.Random(seed)
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def _record(self, name: str, started: float):
+        self.latencies.setdefault(name, []).append(time.perf_counter() - started)
+
+    async def run(self, schedule: List[Dict]) -> float:
+        """Run the schedule and return the elapsed wall time"""
+        tasks = []
+        start = time.perf_counter()
+        for entry in schedule:
+            scheduled = start + entry["at"]
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._issue(entry["op"], scheduled)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start
+
+    async def _issue(self, op: str, scheduled: float):
+        try:
+            await getattr(self, f"_{op}")(scheduled)
+            self._record(op, scheduled)
+        except (httpx.HTTPError, websockets.WebSocketException, OSError, RuntimeError) as e:
+            self.errors[op] = self.errors.get(op, 0) + 1
+            if self.errors[op] == 1:
+                print(f"⚠️  {op} failed: {e!r}", file=sys.stderr)
+
+    def _job_id(self) -> str:
+        return self.rng.choice(self.job_ids)
+
+    async def _upload(self, scheduled: float):
+        text = self.rng.choice(JOB_DESCRIPTIONS)
+        # A unique suffix keeps the OpenAI analysis cache from absorbing uploads
+        content = f"{text}\nReference {self.rng.getrandbits(32):08x}".encode()
+        response = await self.client.post("/api/jobs/upload", files={"file": ("job.txt", content, "text/plain")})
+        response.raise_for_status()
+
+    async def _calculate(self, scheduled: float):
+        response = await self.client.post(f"/api/analysis/calculate/{self._job_id()}")
+        response.raise_for_status()
+
+    async def _details(self, scheduled: float):
+        response = await self.client.get(f"/api/benchmarks/details/{self._job_id()}")
+        response.raise_for_status()
+
+    async def _health(self, scheduled: float):
+        response = await self.client.get("/health/live")
+        response.raise_for_status()
+
+    async def _chat(self, scheduled: float):
+        response = await self.client.post("/api/chat/session", params={"job_id": self._job_id()})
+        response.raise_for_status()
+        session_id = response.json()["session_id"]
+
+        async with websockets.connect(f"{self.ws_url}/api/chat/ws/{session_id}") as ws:
+            await ws.send(json.dumps({"content": self.rng.choice(CHAT_MESSAGES)}))
+            first_chunk = True
+            while True:
+                message = json.loads(await ws.recv())
+                if "error" in message:
+                    raise RuntimeError(message["error"])
+                if "chunk" in message and first_chunk:
+                    self._record("chat (first chunk)", scheduled)
+                    first_chunk = False
+                if message.get("complete"):
+                    return
+
+
+async def create_jobs(client: httpx.AsyncClient, count: int) -> List[str]:
+    """Upload job descriptions for calculate, details and chat to use"""
+    job_ids = []
+    for i in range(count):
+        text = JOB_DESCRIPTIONS[i % len(JOB_DESCRIPTIONS)]
+        response = await client.post(
+            "/api/jobs/upload", files={"file": (f"loadtest-{i}.txt", text.encode(), "text/plain")}
+        )
+        response.raise_for_status()
+        job_ids.append(response.json()["id"])
+    return job_ids
+
+
+async def run(args, schedule: List[Dict]) -> Dict:
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        job_ids = list(args.job_id or [])
+        if not job_ids and args.jobs:
+            print(f"🚀 Creating {args.jobs} job analyses...")
+            try:
+                job_ids = await create_jobs(client, args.jobs)
+            except httpx.HTTPError as e:
+                sys.exit(f"Could not create job analyses: {e}")
+
+        ws_url = "ws" + args.base_url[len("http"):] if args.base_url.startswith("http") else args.base_url
+        driver = TrafficDriver(client, ws_url, job_ids, args.seed)
+        print(f"🚀 Replaying {len(schedule)} requests over {schedule[-1]['at']:.1f}s...")
+        elapsed = await driver.run(schedule)
+
+    scheduled = {}
+    for entry in schedule:
+        scheduled[entry["op"]] = scheduled.get(entry["op"], 0) + 1
+
+    results = []
+    names = [op for op in OPERATIONS if op in scheduled]
+    if "chat" in scheduled:
+        names.insert(names.index("chat") + 1, "chat (first chunk)")
+    for name in names:
+        timings = driver.latencies.get(name)
+        errors = driver.errors.get(name, 0)
+        if timings:
+            results.append(summarize(name, timings, requests=scheduled.get(name, len(timings)), errors=errors))
+        else:
+            results.append(skipped(name, f"no successful requests ({errors} errors)"))
+
+    return {
+        "results": results,
+        "elapsed_seconds": round(elapsed, 2),
+        "achieved_rps": round(len(schedule) / elapsed, 2) if elapsed else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rps", type=float, default=10.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of traffic")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights ({', '.join(OPERATIONS)})")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--replay", help="JSON lines schedule to replay instead of synthetic traffic")
+    parser.add_argument("--record", help="Write the schedule as JSON lines")
+    parser.add_argument("--jobs", type=int, default=10, help="Job analyses to create when no --job-id is given")
+    parser.add_argument("--job-id", action="append", help="Existing job analysis id (repeatable)")
+    parser.add_argument("--max-connections", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    try:
+        schedule = (
+            load_schedule(args.replay) if args.replay
+            else synthetic_schedule(args.rps, args.duration, parse_mix(args.mix), args.seed)
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    if not schedule:
+        parser.error("The schedule is empty")
+    if not args.jobs and not args.job_id and {"calculate", "details", "chat"} & {e["op"] for e in schedule}:
+        parser.error("calculate, details and chat need --jobs or --job-id")
+
+    if args.record:
+        with open(args.record, "w") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in schedule)
+        print(f"📄 Recorded {len(schedule)} requests to {args.record}")
+
+    print("=" * 50)
+    outcome = asyncio.run(run(args, schedule))
+    write_report(
+        "loadtest",
+        outcome["results"],
+        args.output,
+        base_url=args.base_url,
+        target_rps=None if args.replay else args.rps,
+        achieved_rps=outcome["achieved_rps"],
+        elapsed_seconds=outcome["elapsed_seconds"],
+        mix=args.replay or args.mix,
+        seed=args.seed
+    )
+
+
+if __name__ == "__main__":
+    main()
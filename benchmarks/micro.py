@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for salary pricing, benchmark aggregation, document
+extraction and the CSV import loaders
+
+Everything except the import loaders runs without a database: SalaryEngine
+reads from a BenchmarkCube loaded with synthetic rows. The loaders need a
+scratch PostgreSQL database (--database-url) and are skipped otherwise.
+
+Usage:
+    python benchmarks/micro.py --output micro.json
+    python benchmarks/micro.py --rows 1000000 --database-url postgresql://... --output micro.json
+"""
+
+from typing import Dict, List
+import argparse
+import asyncio
+import io
+import os
+import random
+import tempfile
+
+import pandas as pd
+
+from common import measure, setup_backend_path, skipped, write_report
+from synthetic_data import PERCENTILE_SPREAD, SyntheticSurvey, write_dataset
+
+setup_backend_path()
+
+from docx import Document  # noqa: E402
+from fastapi import UploadFile  # noqa: E402
+
+from app.api.benchmarks import calculate_benchmark_stats  # noqa: E402
+from app.models.job_analysis import JobAnalysis  # noqa: E402
+from app.services.benchmark_cube import BenchmarkCube  # noqa: E402
+from app.services.benchmark_stats import combine_benchmark_stats  # noqa: E402
+from app.services.document_processor import DocumentProcessor  # noqa: E402
+from app.services.salary_engine import SalaryEngine  # noqa: E402
+
+SKILLS = [
+    "Python", "Machine Learning", "Kubernetes", "AWS", "SQL", "Rust",
+    "Security", "React", "Golang", "Terraform", "Spark", "Communication"
+]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Austin, TX", "Remote", "Boise, ID", "Seattle", None]
+TITLES = ["Software Engineer", "Staff Engineer", "Data Analyst", "Principal Architect", "Product Manager"]
+
+
+def synthetic_jobs(survey: SyntheticSurvey, count: int, seed: int = 7) -> List[JobAnalysis]:
+    """Transient JobAnalysis objects spread over the survey's cells"""
+    rng = random.Random(seed)
+    return [
+        JobAnalysis(
+            job_title=rng.choice(TITLES),
+            job_family=rng.choice(survey.families + ["Unknown Family"]),
+            detected_level=rng.choice(survey.levels),
+            detected_band=rng.choice([1, 2]),
+            zone=rng.choice(survey.zones),
+            location=rng.choice(LOCATIONS),
+            skills_extracted=rng.sample(SKILLS, rng.randint(0, 6)),
+            years_experience_min=2,
+            years_experience_max=6
+        )
+        for _ in range(count)
+    ]
+
+
+def source_stats(df) -> Dict:
+    """Per-source stats in the shape returned by load_benchmark_stats"""
+    stats = {}
+    for source_type, group in df.groupby("source_type"):
+        entry = {"count": len(group)}
+        for name in PERCENTILE_SPREAD:
+            values = group[f"{name}_salary"].dropna().astype(float)
+            entry[name] = {
+                "count": int(values.count()),
+                "avg": float(values.mean()) if len(values) else 0,
+                "min": float(values.min()) if len(values) else 0,
+                "max": float(values.max()) if len(values) else 0,
+                "median": float(values.median()) if len(values) else 0
+            }
+        stats[source_type] = entry
+    return stats
+
+
+def make_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """Build a minimal text PDF with the given number of pages"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(pages):
+        text = " ".join(
+            f"BT /F1 10 Tf 50 {760 - line * 18} Td (Line {line} of page {page}: "
+            f"Senior Software Engineer, Python, Kubernetes, AWS.) Tj ET"
+            for line in range(lines_per_page)
+        ).encode()
+        objects.append(f"<< /Length {len(text)} >>\nstream\n{text.decode()}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode())
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(paragraphs: int) -> bytes:
+    document = Document()
+    for i in range(paragraphs):
+        document.add_paragraph(f"Responsibility {i}: design, build and operate distributed Python services on AWS.")
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def extract(content: bytes, filename: str) -> str:
+    upload = UploadFile(file=io.BytesIO(content), filename=filename)
+    return asyncio.run(DocumentProcessor().extract_text(upload))
+
+
+def engine_benchmarks(survey: SyntheticSurvey, rows: int, iterations: int) -> List[Dict]:
+    cube_rows = survey.cube_rows(rows)
+    cube = BenchmarkCube()
+
+    results = [
+        measure("BenchmarkCube.load_rows", lambda: cube.load_rows(cube_rows), iterations=3, warmup=1,
+                items=len(cube_rows), rows=len(cube_rows))
+    ]
+    cube.load_rows(cube_rows)
+
+    engine = SalaryEngine(None, cube=cube)
+    jobs = synthetic_jobs(survey, 1000)
+
+    results.append(measure(
+        "SalaryEngine.calculate_salary", lambda: [engine.calculate_salary(job) for job in jobs],
+        iterations=iterations, items=len(jobs), rows=len(cube_rows)
+    ))
+    results.append(measure(
+        "SalaryEngine.calculate_salary (include=none)",
+        lambda: [engine.calculate_salary(job, include=()) for job in jobs],
+        iterations=iterations, items=len(jobs), rows=len(cube_rows)
+    ))
+
+    batch = synthetic_jobs(survey, 10_000, seed=11)
+    results.append(measure(
+        "SalaryEngine.calculate_salary_batch", lambda: engine.calculate_salary_batch(batch),
+        iterations=max(3, iterations // 4), items=len(batch), rows=len(cube_rows)
+    ))
+
+    # Stats for every (family, level, zone) cell, as load_benchmark_stats returns them
+    frame = pd.concat([
+        survey.frame("mercer", rows // 2).assign(source_type="mercer"),
+        survey.frame("lattice", rows // 2).assign(source_type="lattice")
+    ], ignore_index=True)
+    cells = [source_stats(group) for _, group in frame.groupby(["job_family", "level", "zone"])]
+
+    # combine_benchmark_stats replaced SalaryEngine._aggregate_benchmarks
+    results.append(measure(
+        "combine_benchmark_stats", lambda: [combine_benchmark_stats(stats) for stats in cells],
+        iterations=iterations, items=len(cells)
+    ))
+    results.append(measure(
+        "calculate_benchmark_stats",
+        lambda: [calculate_benchmark_stats(stats.get(source)) for stats in cells for source in ("mercer", "lattice")],
+        iterations=iterations, items=len(cells) * 2
+    ))
+    return results
+
+
+def document_benchmarks(pages: int, iterations: int) -> List[Dict]:
+    pdf = make_pdf(pages)
+    docx = make_docx(pages * 40)
+    text = ("Senior Software Engineer in San Francisco. Python, Kubernetes, AWS.\n" * pages * 40).encode()
+
+    return [
+        measure("DocumentProcessor.extract_text (pdf)", lambda: extract(pdf, "job.pdf"),
+                iterations=iterations, pages=pages, bytes=len(pdf)),
+        measure("DocumentProcessor.extract_text (docx)", lambda: extract(docx, "job.docx"),
+                iterations=iterations, paragraphs=pages * 40, bytes=len(docx)),
+        measure("DocumentProcessor.extract_text (txt)", lambda: extract(text, "job.txt"),
+                iterations=iterations, bytes=len(text))
+    ]
+
+
+def import_benchmarks(survey: SyntheticSurvey, rows: int, database_url: str) -> List[Dict]:
+    """Time the import_data.py loaders against a scratch database"""
+    if not database_url:
+        return [
+            skipped("import_data.import_mercer_data", "no --database-url"),
+            skipped("import_data.import_lattice_data", "no --database-url")
+        ]
+
+    import import_data
+
+    import_data.DATABASE_URL = database_url
+    with tempfile.TemporaryDirectory() as data_dir:
+        paths = write_dataset(data_dir, rows, survey)
+        return [
+            measure("import_data.import_mercer_data", lambda: import_data.import_mercer_data(paths["mercer"], mode="append"),
+                    iterations=1, warmup=0, items=rows // 2, rows=rows // 2),
+            measure("import_data.import_lattice_data", lambda: import_data.import_lattice_data(paths["lattice"], mode="append"),
+                    iterations=1, warmup=0, items=rows - rows // 2, rows=rows - rows // 2)
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic survey rows")
+    parser.add_argument("--import-rows", type=int, default=20_000, help="Rows per import loader run")
+    parser.add_argument("--pages", type=int, default=20, help="Pages in the synthetic documents")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"),
+                        help="Scratch PostgreSQL database for the import loaders (data is appended)")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    survey = SyntheticSurvey(seed=args.seed)
+
+    print("🚀 Running microbenchmarks...")
+    print("=" * 50)
+    results = []
+    results += engine_benchmarks(survey, args.rows, args.iterations)
+    results += document_benchmarks(args.pages, args.iterations)
+    results += import_benchmarks(survey, args.import_rows, args.database_url)
+
+    write_report("micro", results, args.output, rows=args.rows, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI HTTP API, for load tests
+
+Serves /v1/chat/completions (plain, function calling and streamed) and
+/v1/embeddings with MockOpenAIService content, so responses are seeded and
+repeatable. Latency is lognormal around --latency-ms, and streamed responses
+wait --chunk-delay-ms between chunks. Point the API at it with:
+
+    OPENAI_BASE_URL=http://localhost:9100/v1
+
+Unlike OPENAI_MOCK_ENABLED, this exercises the real OpenAIService code path,
+including its synchronous HTTP client.
+
+Usage:
+    python benchmarks/mock_openai_server.py --port 9100 --latency-ms 800 --latency-sigma 0.4 --chunk-delay-ms 30
+"""
+
+from typing import Dict, List
+import argparse
+import json
+import random
+import time
+import uuid
+
+from common import setup_backend_path
+
+setup_backend_path()
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse, StreamingResponse  # noqa: E402
+
+from app.services.mock_openai_service import LatencyModel, MockOpenAIService  # noqa: E402
+
+
+def count_tokens(text: str) -> int:
+    """Rough token estimate (about 4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def create_app(service: MockOpenAIService, error_rate: float = 0.0, seed: int = 0) -> FastAPI:
+    app = FastAPI(title="Mock OpenAI API")
+    error_rng = random.Random(seed)
+
+    def completion(model: str, message: Dict, finish_reason: str, prompt: str, output: str) -> Dict:
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(output)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    def chunk(completion_id: str, model: str, delta: Dict, finish_reason=None) -> str:
+        body = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    @app.middleware("http")
+    async def inject_errors(request: Request, call_next):
+        if error_rate and error_rng.random() < error_rate:
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached (simulated)", "type": "requests"}}
+            )
+        return await call_next(request)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "mock")
+        messages: List[Dict] = body.get("messages", [])
+        prompt = "\n".join(str(m.get("content") or "") for m in messages)
+        user_messages = [m for m in messages if m.get("role") != "system"]
+
+        # Function calling (functions/function_call or tools/tool_choice)
+        function_name = None
+        if body.get("functions"):
+            function_name = body["functions"][0]["name"]
+        elif body.get("tools"):
+            function_name = body["tools"][0]["function"]["name"]
+        if function_name:
+            text = user_messages[-1]["content"] if user_messages else ""
+            arguments = json.dumps(await service.analyze_job_description(text))
+            if body.get("tools"):
+                message = {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [{
+                        "id": f"call_{uuid.uuid4().hex[:24]}",
+                        "type": "function",
+                        "function": {"name": function_name, "arguments": arguments}
+                    }]
+                }
+                return completion(model, message, "tool_calls", prompt, arguments)
+            message = {"role": "assistant", "content": None,
+                       "function_call": {"name": function_name, "arguments": arguments}}
+            return completion(model, message, "function_call", prompt, arguments)
+
+        if body.get("stream"):
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+            async def events():
+                yield chunk(completion_id, model, {"role": "assistant", "content": ""})
+                async for content in service.chat_completion_stream(user_messages):
+                    yield chunk(completion_id, model, {"content": content})
+                yield chunk(completion_id, model, {}, "stop")
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        content = await service.chat_completion(user_messages)
+        return completion(model, {"role": "assistant", "content": content}, "stop", prompt, content)
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input", "")
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        tokens = sum(count_tokens(str(text)) for text in inputs)
+        return {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": i, "embedding": service.generate_embeddings(str(text))}
+                for i, text in enumerate(inputs)
+            ],
+            "model": body.get("model", "mock"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="Lognormal sigma; 0 for a fixed delay")
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0, help="Delay between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    service = MockOpenAIService(
+        seed=args.seed,
+        latency=LatencyModel(args.latency_ms, args.latency_sigma),
+        chunk_delay_ms=args.chunk_delay_ms
+    )
+    print(f"🚀 Mock OpenAI API on http://{args.host}:{args.port}/v1")
+    uvicorn.run(create_app(service, args.error_rate, args.seed), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression checks for the API's hot-path SQL
+
+Seeds a scratch PostgreSQL database at production-like volume, then runs
+EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) for every query the request path
+issues, built with the same statement builders the app uses. A case fails if
+its plan:
+
+  * sequentially scans a large table (benchmarks and its partitions,
+    benchmark_rollups, job_analyses, salary_ranges, conversations),
+  * misestimates a scan's row count by more than --max-misestimate times
+    (scans under a LIMIT are skipped; they stop early by design), or
+  * reads a benchmarks partition outside the vintage window, for the cases
+    that set BENCHMARK_VINTAGE_YEARS.
+
+The database must already have scripts/create_database.sql and
+scripts/create_indexes.sql applied. Seeding TRUNCATEs the benchmark, job,
+salary and conversation tables, so only point this at a scratch database;
+--no-seed reuses the data already there. Cases are skipped without
+--database-url. The exit status is 1 if any case fails, so it can gate CI.
+
+Usage:
+    python benchmarks/query_plans.py --database-url postgresql://... --output plans.json
+    python benchmarks/query_plans.py --database-url postgresql://... --no-seed --rows 1000000
+"""
+
+from contextlib import contextmanager
+from datetime import date
+from typing import Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+import argparse
+import os
+import sys
+import tempfile
+
+from common import setup_backend_path, skipped, summarize, write_report
+from synthetic_data import DEFAULT_FAMILIES, SyntheticSurvey, write_dataset
+
+setup_backend_path()
+
+import psycopg2  # noqa: E402
+from psycopg2.extras import register_uuid  # noqa: E402
+from sqlalchemy import select, true  # noqa: E402
+from sqlalchemy.dialects.postgresql import psycopg2 as postgresql_psycopg2  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models.benchmark_rollup import BenchmarkRollup  # noqa: E402
+from app.models.conversation import Conversation  # noqa: E402
+from app.models.job_analysis import JobAnalysis  # noqa: E402
+from app.models.salary_range import SalaryRange  # noqa: E402
+from app.services.benchmark_stats import (  # noqa: E402
+    FALLBACK_LIMIT,
+    active_rollup_filters,
+    benchmark_cells_statement,
+    benchmark_details_statement,
+    benchmark_fallback_statement,
+    benchmark_grid_statement,
+    benchmark_stats_statement,
+    rollup_fallback_statement,
+    rollup_stats_statement
+)
+from app.services.market_data import DEFAULT_PAGE_SIZE, MARKET_DATA_COLUMNS, market_data_statement  # noqa: E402
+
+LARGE_TABLES = frozenset({"benchmarks", "benchmark_rollups", "job_analyses", "salary_ranges", "conversations"})
+SEEDED_TABLES = (
+    "benchmarks", "benchmark_rollups", "benchmark_imports", "conversations", "salary_ranges", "job_analyses"
+)
+DIALECT = postgresql_psycopg2.dialect()
+
+
+class Sample(NamedTuple):
+    """Parameter values picked from the seeded data"""
+    job_family: str
+    level: int
+    zone: int
+    job_id: object
+    job_ids: List
+    session_id: str
+    market_cursor: Tuple
+    latest_year: int
+
+
+class PlanCase(NamedTuple):
+    name: str
+    # Builds the statement from a Sample; settings overrides are applied first
+    statement: Callable[[Sample], object]
+    settings: Dict = {}
+    # benchmarks partitions the plan may read; None means any
+    partitions: Optional[Callable[[Sample], FrozenSet[str]]] = None
+
+
+def vintage_partitions(sample: Sample) -> FrozenSet[str]:
+    return frozenset(f"benchmarks_y{year}" for year in range(sample.latest_year, date.today().year + 2))
+
+
+def latest_salary(sample: Sample):
+    # Mirrors app/api/analysis.py get_salary_calculation
+    return select(SalaryRange).where(
+        SalaryRange.job_analysis_id == sample.job_id
+    ).order_by(SalaryRange.created_at.desc()).limit(1)
+
+
+def details_version(sample: Sample):
+    # Mirrors the revalidation query in app/api/benchmarks.py get_benchmark_details
+    latest = select(SalaryRange.id, SalaryRange.updated_at).where(
+        SalaryRange.job_analysis_id == sample.job_id
+    ).order_by(SalaryRange.created_at.desc()).limit(1).subquery()
+    return select(
+        JobAnalysis.created_at, JobAnalysis.updated_at, latest.c.id, latest.c.updated_at
+    ).outerjoin(latest, true()).where(JobAnalysis.id == sample.job_id)
+
+
+def rollup_cell(sample: Sample):
+    # load_sketch_market_data and the rollup branch of load_benchmark_grid
+    return select(BenchmarkRollup).where(
+        BenchmarkRollup.level == sample.level,
+        BenchmarkRollup.zone == sample.zone,
+        BenchmarkRollup.job_family == sample.job_family,
+        *active_rollup_filters()
+    )
+
+
+# The full cube load, geo_metros and the dataset_versions row are read whole
+# on purpose and are not checked here.
+CASES = [
+    PlanCase("benchmark stats (family)",
+             lambda s: benchmark_stats_statement(s.level, s.zone, s.job_family)),
+    PlanCase("benchmark stats (level/zone fallback)",
+             lambda s: benchmark_stats_statement(s.level, s.zone, limit=FALLBACK_LIMIT)),
+    PlanCase("benchmark stats (vintage window)",
+             lambda s: benchmark_stats_statement(s.level, s.zone, s.job_family),
+             settings={"BENCHMARK_VINTAGE_YEARS": "latest"}, partitions=vintage_partitions),
+    PlanCase("rollup stats", lambda s: rollup_stats_statement(s.level, s.zone, s.job_family)),
+    PlanCase("rollup cell", rollup_cell),
+    PlanCase("rollup stats (vintage window)", lambda s: rollup_stats_statement(s.level, s.zone, s.job_family),
+             settings={"BENCHMARK_VINTAGE_YEARS": "latest"}),
+    PlanCase("benchmark grid",
+             lambda s: benchmark_grid_statement([s.level, s.level + 1], [s.zone], s.job_family)),
+    PlanCase("benchmark cells",
+             lambda s: benchmark_cells_statement([(s.job_family, s.level, s.zone), (s.job_family, s.level + 1, s.zone)])),
+    PlanCase("benchmark fallback grid",
+             lambda s: benchmark_fallback_statement([(s.level, s.zone), (s.level + 1, s.zone)])),
+    PlanCase("rollup fallback grid", lambda s: rollup_fallback_statement([(s.level, s.zone), (s.level + 1, s.zone)])),
+    PlanCase("benchmark details", lambda s: benchmark_details_statement(s.level, s.zone),
+             settings={"BENCHMARK_ROLLUPS_ENABLED": False}),
+    PlanCase("benchmark details (rollups)", lambda s: benchmark_details_statement(s.level, s.zone),
+             settings={"BENCHMARK_ROLLUPS_ENABLED": True}),
+    PlanCase("benchmark details (vintage window)", lambda s: benchmark_details_statement(s.level, s.zone),
+             settings={"BENCHMARK_ROLLUPS_ENABLED": False, "BENCHMARK_VINTAGE_YEARS": "latest"},
+             partitions=vintage_partitions),
+    PlanCase("market data (first page)",
+             lambda s: market_data_statement(MARKET_DATA_COLUMNS, limit=DEFAULT_PAGE_SIZE + 1)),
+    PlanCase("market data (cursor page)",
+             lambda s: market_data_statement(MARKET_DATA_COLUMNS, after=s.market_cursor, limit=DEFAULT_PAGE_SIZE + 1)),
+    PlanCase("market data (filtered page)",
+             lambda s: market_data_statement(MARKET_DATA_COLUMNS, job_family=s.job_family, level=s.level,
+                                             zone=s.zone, limit=DEFAULT_PAGE_SIZE + 1)),
+    PlanCase("job by id", lambda s: select(JobAnalysis).where(JobAnalysis.id == s.job_id)),
+    PlanCase("jobs by id batch", lambda s: select(JobAnalysis).where(JobAnalysis.id.in_(s.job_ids))),
+    PlanCase("job list", lambda s: select(JobAnalysis).order_by(JobAnalysis.created_at.desc()).limit(100)),
+    PlanCase("latest salary for job", latest_salary),
+    PlanCase("benchmark details version", details_version),
+    PlanCase("conversation by session",
+             lambda s: select(Conversation).where(Conversation.session_id == s.session_id))
+]
+
+
+@contextmanager
+def overridden(sample: Sample, values: Dict) -> Iterator[None]:
+    """Temporarily set settings; "latest" windows BENCHMARK_VINTAGE_YEARS to the newest seeded year"""
+    saved = {name: getattr(settings, name) for name in values}
+    try:
+        for name, value in values.items():
+            if name == "BENCHMARK_VINTAGE_YEARS" and value == "latest":
+                value = date.today().year - sample.latest_year + 1
+            setattr(settings, name, value)
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+
+def compile_statement(statement) -> Tuple[str, Dict]:
+    """Render a SQLAlchemy statement as psycopg2 SQL with its parameters"""
+    compiled = statement.compile(dialect=DIALECT, compile_kwargs={"render_postcompile": True})
+    return str(compiled), compiled.params
+
+
+def survey_for(families: int, seed: int) -> SyntheticSurvey:
+    names = DEFAULT_FAMILIES[:families] + [f"Family {i}" for i in range(len(DEFAULT_FAMILIES), families)]
+    return SyntheticSurvey(families=names, seed=seed)
+
+
+def seed_database(database_url: str, survey: SyntheticSurvey, rows: int, jobs: int) -> None:
+    """Replace the seeded tables' contents with synthetic data and analyze them"""
+    import import_data
+
+    conn = psycopg2.connect(database_url)
+    try:
+        with conn.cursor() as cursor:
+            tables = ", ".join(f"compensation.{name}" for name in SEEDED_TABLES)
+            cursor.execute(f"TRUNCATE {tables} CASCADE")
+        conn.commit()
+
+        import_data.DATABASE_URL = database_url
+        with tempfile.TemporaryDirectory() as data_dir:
+            for source_type, path in write_dataset(data_dir, rows, survey).items():
+                import_data.load_benchmark_csv(path, source_type, mode="append")
+
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO compensation.job_analyses
+                    (job_title, parsed_data, job_family, detected_level, zone, created_at)
+                SELECT 'Job ' || g, '{}'::jsonb,
+                    (%(families)s::text[])[1 + g %% cardinality(%(families)s::text[])],
+                    (%(levels)s::int[])[1 + g %% cardinality(%(levels)s::int[])],
+                    (%(zones)s::int[])[1 + g %% cardinality(%(zones)s::int[])],
+                    NOW() - g * INTERVAL '1 minute'
+                FROM generate_series(1, %(jobs)s) g
+            """, {"families": survey.families, "levels": survey.levels, "zones": survey.zones, "jobs": jobs})
+            # A few recalculations per job, so "latest" has something to pick from
+            cursor.execute("""
+                INSERT INTO compensation.salary_ranges (job_analysis_id, job_title, job_family, level, zone, created_at)
+                SELECT j.id, j.job_title, j.job_family, j.detected_level, j.zone, j.created_at + n * INTERVAL '1 hour'
+                FROM compensation.job_analyses j
+                CROSS JOIN generate_series(1, 3) n
+            """)
+            cursor.execute("""
+                INSERT INTO compensation.conversations (session_id, job_analysis_id)
+                SELECT 'session-' || id, id FROM compensation.job_analyses
+            """)
+        conn.commit()
+
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            for name in SEEDED_TABLES:
+                cursor.execute(f"VACUUM ANALYZE compensation.{name}")
+    finally:
+        conn.close()
+
+
+def pick_sample(cursor) -> Sample:
+    cursor.execute("""
+        SELECT job_family, level, zone FROM compensation.benchmark_rollups
+        ORDER BY row_count DESC LIMIT 1
+    """)
+    job_family, level, zone = cursor.fetchone()
+    cursor.execute("SELECT id FROM compensation.job_analyses ORDER BY created_at DESC LIMIT 20")
+    job_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT session_id FROM compensation.conversations WHERE job_analysis_id = %s", (job_ids[0],))
+    session_id = cursor.fetchone()[0]
+    cursor.execute(f"""
+        SELECT data_date, id FROM compensation.benchmarks WHERE deleted_at IS NULL
+        ORDER BY data_date, id OFFSET {DEFAULT_PAGE_SIZE} LIMIT 1
+    """)
+    market_cursor = tuple(cursor.fetchone())
+    cursor.execute("SELECT EXTRACT(YEAR FROM MAX(data_date))::int FROM compensation.benchmarks")
+    latest_year = cursor.fetchone()[0]
+    return Sample(job_family, level, zone, job_ids[0], job_ids, session_id, market_cursor, latest_year)
+
+
+def partition_parents(cursor) -> Dict[str, str]:
+    cursor.execute("""
+        SELECT c.relname, p.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+    """)
+    return dict(cursor.fetchall())
+
+
+def plan_nodes(node: Dict, limited: bool = False) -> Iterator[Tuple[Dict, bool]]:
+    """Every plan node, with whether it runs under a Limit"""
+    yield node, limited
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child, limited or node["Node Type"] == "Limit")
+
+
+def check_plan(
+    plan: Dict,
+    parents: Dict[str, str],
+    max_misestimate: float,
+    partitions: Optional[FrozenSet[str]] = None
+) -> Tuple[List[str], List[Dict]]:
+    """Return ``(failures, scans)`` for one EXPLAIN (FORMAT JSON) plan"""
+    failures, scans = [], []
+    for node, limited in plan_nodes(plan["Plan"]):
+        relation = node.get("Relation Name")
+        if relation is None:
+            continue
+        table = parents.get(relation, relation)
+        scans.append({
+            "node": node["Node Type"],
+            "relation": relation,
+            "index": node.get("Index Name"),
+            "plan_rows": node["Plan Rows"],
+            "actual_rows": node.get("Actual Rows"),
+            "loops": node.get("Actual Loops"),
+            "shared_read_blocks": node.get("Shared Read Blocks")
+        })
+
+        if node["Node Type"] == "Seq Scan" and table in LARGE_TABLES:
+            failures.append(f"Seq Scan on {relation}")
+        if partitions is not None and table == "benchmarks" and relation not in partitions:
+            failures.append(f"read partition {relation} outside the vintage window")
+
+        # Never-executed nodes have nothing to compare; both sides are per loop
+        if limited or not node.get("Actual Loops"):
+            continue
+        estimated, actual = max(node["Plan Rows"], 1), max(node["Actual Rows"], 1)
+        if max(estimated / actual, actual / estimated) > max_misestimate:
+            failures.append(
+                f"{node['Node Type']} on {relation}: estimated {node['Plan Rows']:,} rows, got {node['Actual Rows']:,}"
+            )
+    return failures, scans
+
+
+def explain(cursor, case: PlanCase, sample: Sample, parents: Dict[str, str], iterations: int,
+            max_misestimate: float) -> Dict:
+    with overridden(sample, case.settings):
+        query, params = compile_statement(case.statement(sample))
+
+    timings, plans = [], []
+    for _ in range(iterations):
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params)
+        plan = cursor.fetchone()[0][0]
+        plans.append(plan)
+        timings.append(plan["Execution Time"] / 1000)
+
+    partitions = case.partitions(sample) if case.partitions else None
+    # The last run is the warmest; judge the plan on it
+    failures, scans = check_plan(plans[-1], parents, max_misestimate, partitions)
+    return {
+        **summarize(case.name, timings),
+        "planning_ms": plans[-1]["Planning Time"],
+        "passed": not failures,
+        "failures": failures,
+        "scans": scans,
+        "plan": plans[-1]["Plan"]
+    }
+
+
+def run_cases(database_url: str, iterations: int, max_misestimate: float) -> List[Dict]:
+    register_uuid()
+    conn = psycopg2.connect(database_url)
+    try:
+        with conn.cursor() as cursor:
+            sample = pick_sample(cursor)
+            parents = partition_parents(cursor)
+            results = []
+            for case in CASES:
+                results.append(explain(cursor, case, sample, parents, iterations, max_misestimate))
+                conn.rollback()
+            return results
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"),
+                        help="Scratch PostgreSQL database (seeding truncates its tables)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Benchmark rows across both sources")
+    parser.add_argument("--families", type=int, default=50, help="Number of job families")
+    parser.add_argument("--jobs", type=int, default=100_000, help="Job analyses (each with 3 salary ranges)")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse the data already in the database")
+    parser.add_argument("--iterations", type=int, default=3, help="EXPLAIN ANALYZE runs per query")
+    parser.add_argument("--max-misestimate", type=float, default=10.0,
+                        help="Fail when a scan's estimated and actual rows differ by more than this factor")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    print("🚀 Checking query plans...")
+    print("=" * 50)
+
+    if not args.database_url:
+        write_report("query_plans", [skipped(case.name, "no --database-url") for case in CASES], args.output)
+        return
+
+    if not args.no_seed:
+        print(f"Seeding {args.rows:,} benchmark rows and {args.jobs:,} jobs...")
+        seed_database(args.database_url, survey_for(args.families, args.seed), args.rows, args.jobs)
+
+    results = run_cases(args.database_url, args.iterations, args.max_misestimate)
+    for result in results:
+        scans = ", ".join(f"{scan['node']} {scan['index'] or scan['relation']}" for scan in result["scans"])
+        print(f"{'✓' if result['passed'] else '❌'} {result['name']}: {scans}")
+        for failure in result["failures"]:
+            print(f"    {failure}")
+    print()
+
+    write_report("query_plans", results, args.output, rows=args.rows, jobs=args.jobs, seeded=not args.no_seed,
+                 max_misestimate=args.max_misestimate)
+
+    failed = [result["name"] for result in results if not result["passed"]]
+    if failed:
+        print(f"\n❌ {len(failed)} plan regression(s): {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
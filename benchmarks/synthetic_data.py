@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Synthetic Mercer/Lattice survey data for benchmarks
+
+Rows follow the CSV layouts read by scripts/import_data.py. Output is fully
+determined by the seed, and large datasets (up to 10M+ rows) are generated
+and written in chunks so memory stays bounded.
+
+Usage:
+    python benchmarks/synthetic_data.py --rows 1000000 --out-dir /tmp/bench-data
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_FAMILIES = [
+    "Engineering", "Data Science", "Product", "Design", "Sales",
+    "Marketing", "Finance", "Operations", "People", "Legal"
+]
+DEFAULT_LEVELS = list(range(1, 11))
+DEFAULT_ZONES = [1, 2, 3]
+
+GEOGRAPHIES = {
+    1: ["San Francisco", "New York", "Seattle", "Boston"],
+    2: ["Austin", "Denver", "Chicago", "Atlanta"],
+    3: ["Boise", "Omaha", "Tulsa", "Remote"]
+}
+ZONE_FACTORS = {1: 1.25, 2: 1.0, 3: 0.9}
+
+# Spread of each percentile around the median
+PERCENTILE_SPREAD = {"p10": 0.78, "p25": 0.88, "p50": 1.0, "p75": 1.14, "p90": 1.3}
+
+CHUNK_ROWS = 500_000
+
+
+class SyntheticSurvey:
+    """Deterministic generator of survey rows across family × level × zone cells"""
+
+    def __init__(
+        self,
+        families: Sequence[str] = DEFAULT_FAMILIES,
+        levels: Sequence[int] = DEFAULT_LEVELS,
+        zones: Sequence[int] = DEFAULT_ZONES,
+        seed: int = 42,
+        null_rate: float = 0.02
+    ):
+        self.families = list(families)
+        self.levels = list(levels)
+        self.zones = list(zones)
+        self.seed = seed
+        self.null_rate = null_rate
+        # Stable per-family pay multiplier
+        self.family_factors = {
+            family: 0.85 + 0.3 * ((sum(map(ord, family)) * 2654435761) % 1000) / 1000
+            for family in self.families
+        }
+
+    def frames(self, source_type: str, rows: int, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """Yield DataFrames totalling ``rows`` rows for 'mercer' or 'lattice'"""
+        offset = 0
+        chunk = 0
+        while offset < rows:
+            size = min(chunk_rows, rows - offset)
+            yield self._frame(source_type, size, chunk)
+            offset += size
+            chunk += 1
+
+    def frame(self, source_type: str, rows: int) -> pd.DataFrame:
+        return pd.concat(list(self.frames(source_type, rows)), ignore_index=True)
+
+    def _frame(self, source_type: str, size: int, chunk: int) -> pd.DataFrame:
+        rng = np.random.default_rng([self.seed, chunk, 0 if source_type == "mercer" else 1])
+
+        family_idx = rng.integers(0, len(self.families), size)
+        levels = np.asarray(self.levels)[rng.integers(0, len(self.levels), size)]
+        zone_idx = rng.integers(0, len(self.zones), size)
+        zones = np.asarray(self.zones)[zone_idx]
+
+        families = np.asarray(self.families, dtype=object)[family_idx]
+        family_factor = np.asarray([self.family_factors[f] for f in self.families])[family_idx]
+        zone_factor = np.vectorize(ZONE_FACTORS.get, otypes=[float])(zones)
+
+        median = 60_000 * 1.18 ** (levels - 1) * zone_factor * family_factor
+        median *= rng.lognormal(0.0, 0.08, size)
+
+        data = {"job_family": families, "level": levels, "zone": zones}
+        # Whole-dollar nullable integers, which also write to CSV much faster than floats
+        for name, spread in PERCENTILE_SPREAD.items():
+            values = np.round(median * spread * rng.normal(1.0, 0.015, size), -2).astype(np.int64)
+            data[f"{name}_salary"] = pd.arrays.IntegerArray(values, rng.random(size) < self.null_rate)
+        data["mean_salary"] = np.round(median * 1.03, -2).astype(np.int64)
+
+        geo_table = np.asarray([GEOGRAPHIES.get(z, GEOGRAPHIES[3]) for z in self.zones], dtype=object)
+        data["geography"] = geo_table[zone_idx, rng.integers(0, 4, size)]
+
+        days = rng.integers(0, 730, size)
+        data["data_date"] = (np.datetime64("2023-01-01") + days).astype("datetime64[D]").astype(str)
+        data["currency"] = "USD"
+
+        if source_type == "mercer":
+            codes = np.asarray([f[:3].upper() for f in self.families], dtype=object)
+            data["job_code"] = codes[family_idx] + np.char.zfill(levels.astype(str), 2).astype(object)
+            data["market_segment"] = "Technology"
+            data["industry"] = "Software"
+            data["trend_indicator"] = rng.choice(["up", "flat", "down"], size)
+            data["trend_velocity"] = np.round(rng.normal(0.03, 0.02, size), 3)
+        else:
+            data["job_title"] = families + " L" + levels.astype(str).astype(object)
+            data["band"] = np.where(np.isin(family_idx, [0, 1]), 1, 2)
+            data["industry_segment"] = "Software"
+            data["company_count"] = rng.integers(5, 200, size)
+            data["employee_count"] = rng.integers(20, 5000, size)
+
+        return pd.DataFrame(data)
+
+    def cube_rows(self, rows: int) -> List[Tuple]:
+        """(job_family, level, zone, source_type, p10..p90) tuples for BenchmarkCube.load_rows"""
+        result = []
+        for source_type in ("mercer", "lattice"):
+            df = self.frame(source_type, rows // 2)
+            columns = [f"{name}_salary" for name in PERCENTILE_SPREAD]
+            for family, level, zone, *values in df[["job_family", "level", "zone", *columns]].itertuples(index=False):
+                result.append((family, int(level), int(zone), source_type, *[None if v is pd.NA else float(v) for v in values]))
+        return result
+
+    def write_csv(self, source_type: str, rows: int, path: str) -> str:
+        """Write ``rows`` rows to a CSV, chunk by chunk"""
+        for i, df in enumerate(self.frames(source_type, rows)):
+            df.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        return path
+
+
+def write_dataset(out_dir: str, rows: int, survey: Optional[SyntheticSurvey] = None) -> Dict[str, str]:
+    """Write mercer_benchmarks.csv and lattice_peer_parity.csv, split evenly"""
+    survey = survey or SyntheticSurvey()
+    os.makedirs(out_dir, exist_ok=True)
+    return {
+        "mercer": survey.write_csv("mercer", rows // 2, os.path.join(out_dir, "mercer_benchmarks.csv")),
+        "lattice": survey.write_csv("lattice", rows - rows // 2, os.path.join(out_dir, "lattice_peer_parity.csv"))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="Total rows across both sources")
+    parser.add_argument("--out-dir", required=True)
+    parser.add_argument("--families", type=int, default=len(DEFAULT_FAMILIES), help="Number of job families")
+    parser.add_argument("--levels", type=int, default=len(DEFAULT_LEVELS))
+    parser.add_argument("--zones", type=int, default=len(DEFAULT_ZONES))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    families = DEFAULT_FAMILIES[:args.families] + [
+        f"Family {i}" for i in range(len(DEFAULT_FAMILIES), args.families)
+    ]
+    survey = SyntheticSurvey(
+        families=families,
+        levels=range(1, args.levels + 1),
+        zones=range(1, args.zones + 1),
+        seed=args.seed
+    )
+
+    print(f"🚀 Generating {args.rows:,} synthetic survey rows...")
+    for source_type, path in write_dataset(args.out_dir, args.rows, survey).items():
+        print(f"✓ {source_type.title()}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark retention: retire old survey vintages and expired rows
+
+compensation.benchmarks is partitioned by calendar year of data_date. Partitions
+entirely older than the last --keep-years years are detached (left as
+standalone tables for archiving) or, with --drop, dropped. Remaining rows whose
+expires_at has passed are tombstoned. Rollups for every affected cell are
+refreshed and the benchmarks dataset version is bumped, so cached salary
+results are invalidated. Next year's partition is created ahead of time.
+
+Lookups already skip vintages outside BENCHMARK_VINTAGE_YEARS, in raw rows and
+in the per-year rollups alike; retention only bounds what is stored.
+
+Usage:
+    python scripts/benchmark_retention.py --keep-years 3 --dry-run
+    python scripts/benchmark_retention.py --keep-years 3 --drop
+"""
+
+from datetime import date
+import argparse
+import re
+
+from psycopg2 import sql
+
+import import_data
+from import_data import bump_dataset_version, lock_source, refresh_benchmark_rollups
+
+PARTITION_UPPER_BOUND = re.compile(r"TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+def retention_cutoff(keep_years, today=None):
+    """First data_date kept: January 1st, keep_years - 1 years before this year"""
+    today = today or date.today()
+    return date(today.year - keep_years + 1, 1, 1)
+
+def expired_partitions(cursor, cutoff):
+    """Names of benchmarks partitions whose range ends on or before ``cutoff``"""
+    cursor.execute("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'compensation.benchmarks'::regclass
+        ORDER BY c.relname
+    """)
+    expired = []
+    for name, bound in cursor.fetchall():
+        match = PARTITION_UPPER_BOUND.search(bound or '')
+        if match and date.fromisoformat(match.group(1)) <= cutoff:
+            expired.append(name)
+    return expired
+
+def collect_partition_cells(cursor, partition):
+    """Record the cells with active rows in a partition about to be retired"""
+    cursor.execute(sql.SQL("""
+        INSERT INTO retired_cells
+        SELECT DISTINCT source_type, job_family, level, zone
+        FROM compensation.{}
+        WHERE deleted_at IS NULL
+    """).format(sql.Identifier(partition)))
+    return cursor.rowcount
+
+def tombstone_expired_rows(cursor, cutoff):
+    cursor.execute("""
+        WITH expired AS (
+            UPDATE compensation.benchmarks
+            SET deleted_at = NOW()
+            WHERE expires_at <= NOW()
+                AND deleted_at IS NULL
+                AND data_date >= %s
+            RETURNING source_type, job_family, level, zone
+        ), cells AS (
+            INSERT INTO retired_cells SELECT DISTINCT * FROM expired
+        )
+        SELECT COUNT(*) FROM expired
+    """, (cutoff,))
+    return cursor.fetchone()[0]
+
+def retire_partition(cursor, partition, drop):
+    partition_table = sql.Identifier('compensation', partition)
+    if drop:
+        cursor.execute(sql.SQL("DROP TABLE {}").format(partition_table))
+    else:
+        cursor.execute(sql.SQL("ALTER TABLE compensation.benchmarks DETACH PARTITION {}").format(partition_table))
+
+def refresh_retired_cells(cursor):
+    """Recompute rollups for every retired cell, one source at a time"""
+    cursor.execute("SELECT DISTINCT source_type FROM retired_cells ORDER BY source_type")
+    for (source_type,) in cursor.fetchall():
+        keys_query = cursor.mogrify(
+            "SELECT DISTINCT job_family, level, zone FROM retired_cells WHERE source_type = %s",
+            (source_type,)
+        ).decode()
+        refresh_benchmark_rollups(cursor, source_type, keys_query)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keep-years", type=int, required=True, help="Calendar years of data_date to keep")
+    parser.add_argument("--drop", action="store_true", help="Drop expired partitions instead of detaching them")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be retired and roll back")
+    parser.add_argument("--database-url", default=import_data.DATABASE_URL)
+    args = parser.parse_args()
+    if args.keep_years < 1:
+        parser.error("--keep-years must be at least 1")
+
+    import_data.DATABASE_URL = args.database_url
+    cutoff = retention_cutoff(args.keep_years)
+    print(f"🚀 Retiring benchmarks with data_date before {cutoff}...")
+    print("=" * 50)
+
+    conn = import_data.connect_db()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            CREATE TEMP TABLE retired_cells (
+                source_type VARCHAR(50),
+                job_family VARCHAR(100),
+                level INTEGER,
+                zone INTEGER
+            ) ON COMMIT DROP
+        """)
+
+        # Take every source's import lock before any table lock, in the order
+        # imports take them, so retention cannot deadlock with a running import
+        cursor.execute("SELECT DISTINCT source_type FROM compensation.benchmark_rollups ORDER BY source_type")
+        for (source_type,) in cursor.fetchall():
+            lock_source(cursor, source_type)
+
+        partitions = expired_partitions(cursor, cutoff)
+        for partition in partitions:
+            cells = collect_partition_cells(cursor, partition)
+            retire_partition(cursor, partition, args.drop)
+            print(f"✓ {'Dropped' if args.drop else 'Detached'} {partition} ({cells} cells affected)")
+
+        expired = tombstone_expired_rows(cursor, cutoff)
+        print(f"✓ Tombstoned {expired:,} rows past expires_at")
+
+        cursor.execute("SELECT compensation.ensure_benchmark_partitions(CURRENT_DATE, (CURRENT_DATE + INTERVAL '1 year')::DATE)")
+
+        if partitions or expired:
+            refresh_retired_cells(cursor)
+            bump_dataset_version(cursor)
+
+        if args.dry_run:
+            conn.rollback()
+            print("\n⚠️  Dry run: rolled back")
+        else:
+            conn.commit()
+            print("\n✅ Retention completed successfully!")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Check that the in-memory benchmark cube matches the SalaryEngine query path,
+and that blended rollup sketches agree with the SQL median of mixed-source cells
+"""
+
+import sys
+import os
+import math
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.models.database import SessionLocal
+from sqlalchemy import func
+
+from app.models.benchmark import Benchmark
+from app.models.benchmark_rollup import BenchmarkRollup
+from app.services.benchmark_cube import BenchmarkCube, PERCENTILES
+from app.services.benchmark_stats import active_benchmark_filters, active_rollup_filters, load_sketch_market_data
+from app.services.salary_engine import SalaryEngine
+
+TOLERANCE = 0.01  # cents
+SKETCH_TOLERANCE = 0.05  # relative
+
+def compare(expected, actual):
+    """Return a list of differences between two aggregate results"""
+    if expected is None or actual is None:
+        return [] if expected is actual else [f"expected {expected}, got {actual}"]
+
+    diffs = []
+    for name in PERCENTILES:
+        if not math.isclose(expected[name], actual[name], abs_tol=TOLERANCE):
+            diffs.append(f"{name}: {expected[name]:.2f} != {actual[name]:.2f}")
+
+    if sorted(expected["sources"]) != sorted(actual["sources"]):
+        diffs.append(f"sources: {sorted(expected['sources'])} != {sorted(actual['sources'])}")
+    if expected["data_points"] != actual["data_points"]:
+        diffs.append(f"data_points: {expected['data_points']} != {actual['data_points']}")
+
+    return diffs
+
+def check_sketches(db):
+    """Compare each mixed-source cell's sketch median with PERCENTILE_CONT over its rows"""
+    cells = db.query(BenchmarkRollup.job_family, BenchmarkRollup.level, BenchmarkRollup.zone).filter(
+        *active_rollup_filters()
+    ).group_by(
+        BenchmarkRollup.job_family, BenchmarkRollup.level, BenchmarkRollup.zone
+    ).having(func.count(func.distinct(BenchmarkRollup.source_type)) > 1).all()
+
+    failures = 0
+    for job_family, level, zone in cells:
+        sketch = load_sketch_market_data(db, level, zone, job_family)
+        expected = db.query(
+            func.percentile_cont(0.5).within_group(func.nullif(Benchmark.p50_salary, 0))
+        ).filter(
+            Benchmark.job_family == job_family,
+            Benchmark.level == level,
+            Benchmark.zone == zone,
+            *active_benchmark_filters()
+        ).scalar()
+        if not sketch or expected is None:
+            continue
+
+        expected = float(expected)
+        if abs(sketch["p50"] - expected) > SKETCH_TOLERANCE * expected:
+            failures += 1
+            print(f"✗ sketch {job_family} L{level} Z{zone}: p50 {sketch['p50']:.2f} != {expected:.2f}")
+
+    print(f"Checked {len(cells)} mixed-source sketches, {failures} outside {SKETCH_TOLERANCE:.0%}")
+    return failures
+
+def main():
+    """Compare every (job_family, level, zone) lookup against the database"""
+    print("🔍 Checking benchmark cube parity...")
+    print("=" * 50)
+
+    db = SessionLocal()
+    try:
+        cube = BenchmarkCube()
+        cube.refresh(db)
+
+        query_engine = SalaryEngine(db, cube=BenchmarkCube())  # never loaded
+        cube_engine = SalaryEngine(db, cube=cube)
+
+        keys = db.query(Benchmark.job_family, Benchmark.level, Benchmark.zone).filter(
+            Benchmark.deleted_at.is_(None)
+        ).distinct().all()
+        # Also exercise the level/zone fallback for an unknown family
+        keys += [(None, level, zone) for _, level, zone in keys]
+
+        failures = 0
+        for job_family, level, zone in keys:
+            expected = query_engine._get_market_benchmarks(job_family, level, zone)
+            actual = cube_engine._get_market_benchmarks(job_family, level, zone)
+
+            # The fallback query has no ORDER BY, so only its shape is comparable
+            if job_family is None and expected and actual:
+                if expected["data_points"] == actual["data_points"]:
+                    continue
+
+            diffs = compare(expected, actual)
+            if diffs:
+                failures += 1
+                print(f"✗ {job_family} L{level} Z{zone}: {'; '.join(diffs)}")
+
+        print(f"\nChecked {len(keys)} lookups, {failures} mismatches")
+        failures += check_sketches(db)
+    finally:
+        db.close()
+
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,9 @@ CREATE SCHEMA IF NOT EXISTS compensation;
 SET search_path TO compensation, public;
 
 -- Create benchmarks table for Mercer and other market data
+-- Partitioned by survey vintage: one partition per calendar year of data_date,
+-- created by compensation.ensure_benchmark_partitions (called by the importer)
+-- and detached or dropped by scripts/benchmark_retention.py
 CREATE TABLE IF NOT EXISTS compensation.benchmarks (
     id UUID DEFAULT uuid_generate_v4(),
     source_type VARCHAR(50) NOT NULL, -- 'mercer', 'lattice', 'glassdoor'
@@ -42,14 +45,145 @@ CREATE TABLE IF NOT EXISTS compensation.benchmarks (
     trend_velocity VARCHAR(20),
 
     -- Metadata
-    data_date DATE,
+    data_date DATE NOT NULL, -- partition key
     currency VARCHAR(10) DEFAULT 'USD',
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW(),
-    expires_at TIMESTAMP,
+    expires_at TIMESTAMP, -- rows past this are tombstoned by scripts/benchmark_retention.py
+
+    -- Delta imports: identity of the survey row, hash of its values, and
+    -- removal time once it disappears from its source's file (tombstone)
+    natural_key CHAR(32),
+    row_fingerprint CHAR(32),
+    deleted_at TIMESTAMP,
+
+    -- Metadata (the partition key must be part of the primary key)
+    CONSTRAINT benchmarks_pkey_constraint PRIMARY KEY (id, data_date)
+) PARTITION BY RANGE (data_date);
+
+-- Create the yearly benchmarks partitions covering a data_date range, if missing
+CREATE OR REPLACE FUNCTION compensation.ensure_benchmark_partitions(from_date DATE, to_date DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    vintage_year INTEGER;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    FOR vintage_year IN EXTRACT(YEAR FROM from_date)::INTEGER .. EXTRACT(YEAR FROM to_date)::INTEGER LOOP
+        partition_name := format('benchmarks_y%s', vintage_year);
+        IF to_regclass(format('compensation.%I', partition_name)) IS NULL THEN
+            -- Concurrent imports may race to create the same partition
+            PERFORM pg_advisory_xact_lock(hashtext('benchmarks:partitions'));
+            IF to_regclass(format('compensation.%I', partition_name)) IS NULL THEN
+                EXECUTE format(
+                    'CREATE TABLE compensation.%I PARTITION OF compensation.benchmarks FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, make_date(vintage_year, 1, 1), make_date(vintage_year + 1, 1, 1)
+                );
+                created := created + 1;
+            END IF;
+        END IF;
+    END LOOP;
+    RETURN created;
+END;
+$$ language 'plpgsql';
+
+SELECT compensation.ensure_benchmark_partitions(make_date(2020, 1, 1), (CURRENT_DATE + INTERVAL '1 year')::DATE);
+
+-- Create benchmark_rollups table with precomputed aggregates per source cell and vintage year
+-- Maintained by scripts/import_data.py after each load
+CREATE TABLE IF NOT EXISTS compensation.benchmark_rollups (
+    id UUID DEFAULT uuid_generate_v4(),
+    job_family VARCHAR(100),
+    level INTEGER,
+    zone INTEGER,
+    source_type VARCHAR(50) NOT NULL,
+    vintage_year INTEGER NOT NULL, -- calendar year of data_date, so lookups can apply BENCHMARK_VINTAGE_YEARS
+    row_count INTEGER NOT NULL DEFAULT 0,
+
+    -- Percentile aggregates (zero and null values excluded)
+    p10_count INTEGER, p10_avg DECIMAL(12,2), p10_min DECIMAL(12,2), p10_max DECIMAL(12,2), p10_median DECIMAL(12,2),
+    p25_count INTEGER, p25_avg DECIMAL(12,2), p25_min DECIMAL(12,2), p25_max DECIMAL(12,2), p25_median DECIMAL(12,2),
+    p50_count INTEGER, p50_avg DECIMAL(12,2), p50_min DECIMAL(12,2), p50_max DECIMAL(12,2), p50_median DECIMAL(12,2),
+    p75_count INTEGER, p75_avg DECIMAL(12,2), p75_min DECIMAL(12,2), p75_max DECIMAL(12,2), p75_median DECIMAL(12,2),
+    p90_count INTEGER, p90_avg DECIMAL(12,2), p90_min DECIMAL(12,2), p90_max DECIMAL(12,2), p90_median DECIMAL(12,2),
+
+    -- Mergeable quantile sketch built from the cell's survey rows
+    sketch JSONB,
+
+    -- Metadata
+    latest_data_date DATE,
+    refreshed_at TIMESTAMP DEFAULT NOW(),
+
+    -- Primary key constraint
+    CONSTRAINT benchmark_rollups_pkey_constraint PRIMARY KEY (id)
+);
+
+-- Create geo_metros table used to resolve locations to geographic factors
+CREATE TABLE IF NOT EXISTS compensation.geo_metros (
+    id UUID DEFAULT uuid_generate_v4(),
+    metro VARCHAR(100) UNIQUE NOT NULL,
+    aliases JSONB DEFAULT '[]'::jsonb, -- e.g. ["sf", "bay area"]
+    state VARCHAR(10),
+    zone INTEGER,
+    geographic_factor DECIMAL(5,3) NOT NULL DEFAULT 1.0,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+
+    -- Primary key constraint
+    CONSTRAINT geo_metros_pkey_constraint PRIMARY KEY (id)
+);
+
+INSERT INTO compensation.geo_metros (metro, aliases, state, zone, geographic_factor) VALUES
+    ('San Francisco', '["sf", "san fran", "bay area", "sf bay area", "san francisco bay area"]', 'CA', 1, 1.40),
+    ('New York', '["nyc", "ny", "new york city", "manhattan", "brooklyn"]', 'NY', 1, 1.35),
+    ('Seattle', '[]', 'WA', 1, 1.25),
+    ('Boston', '[]', 'MA', 1, 1.25),
+    ('Los Angeles', '["la"]', 'CA', 1, 1.20),
+    ('Austin', '["atx"]', 'TX', 2, 1.10),
+    ('Denver', '[]', 'CO', 2, 1.05),
+    ('Chicago', '[]', 'IL', 2, 1.05),
+    ('Remote', '["anywhere", "work from home", "wfh", "distributed", "fully remote"]', NULL, NULL, 1.00)
+ON CONFLICT (metro) DO NOTHING;
+
+-- Create dataset_versions table, bumped by scripts/import_data.py after each load
+-- Cached salary results and ETags are keyed on these versions
+CREATE TABLE IF NOT EXISTS compensation.dataset_versions (
+    name VARCHAR(50) NOT NULL, -- 'benchmarks'
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT NOW(),
+
+    -- Primary key constraint
+    CONSTRAINT dataset_versions_pkey_constraint PRIMARY KEY (name)
+);
+
+INSERT INTO compensation.dataset_versions (name, version) VALUES ('benchmarks', 1)
+ON CONFLICT (name) DO NOTHING;
+
+-- Create benchmark_imports table, one manifest row per scripts/import_data.py file load
+CREATE TABLE IF NOT EXISTS compensation.benchmark_imports (
+    id UUID DEFAULT uuid_generate_v4(),
+    source_type VARCHAR(50) NOT NULL,
+    source_file VARCHAR(255),
+    file_sha256 CHAR(64) NOT NULL,
+    mode VARCHAR(20) NOT NULL, -- 'delta', 'append'
+    superseded_files TEXT[], -- earlier file names this delta import replaced
+    status VARCHAR(20) NOT NULL, -- 'completed', 'skipped'
+
+    -- Row counts
+    rows_read INTEGER NOT NULL DEFAULT 0,
+    rows_rejected INTEGER NOT NULL DEFAULT 0,
+    rows_inserted INTEGER NOT NULL DEFAULT 0,
+    rows_updated INTEGER NOT NULL DEFAULT 0,
+    rows_unchanged INTEGER NOT NULL DEFAULT 0,
+    rows_deleted INTEGER NOT NULL DEFAULT 0,
 
     -- Metadata
-    CONSTRAINT benchmarks_pkey_constraint PRIMARY KEY (id)
+    dataset_version BIGINT,
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP DEFAULT NOW(),
+
+    -- Primary key constraint
+    CONSTRAINT benchmark_imports_pkey_constraint PRIMARY KEY (id)
 );
 
 -- Create salary_ranges table for calculated ranges
@@ -259,5 +393,8 @@ CREATE TRIGGER update_job_analyses_updated_at BEFORE UPDATE ON compensation.job_
 CREATE TRIGGER update_conversations_updated_at BEFORE UPDATE ON compensation.conversations
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER update_geo_metros_updated_at BEFORE UPDATE ON compensation.geo_metros
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
 CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON compensation.users
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
\ No newline at end of file
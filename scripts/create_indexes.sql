@@ -4,13 +4,34 @@
 \c hranalyticsdb;
 
 -- Indexes for benchmarks table
-CREATE INDEX IF NOT EXISTS idx_benchmarks_lookup ON compensation.benchmarks (job_family, level, zone);
+-- Engine lookups: level and zone lead so the level/zone fallback (no family)
+-- uses the same index; the included columns allow index-only scans
+DROP INDEX IF EXISTS compensation.idx_benchmarks_lookup;
+CREATE INDEX IF NOT EXISTS idx_benchmarks_cell_family ON compensation.benchmarks (level, zone, job_family)
+    INCLUDE (source_type, p10_salary, p25_salary, p50_salary, p75_salary, p90_salary, deleted_at, data_date);
 CREATE INDEX IF NOT EXISTS idx_benchmarks_location ON compensation.benchmarks (geography, zone);
 CREATE INDEX IF NOT EXISTS idx_benchmarks_source ON compensation.benchmarks (source_type, data_date);
+-- Market data export: keyset pagination order
+CREATE INDEX IF NOT EXISTS idx_benchmarks_export ON compensation.benchmarks (data_date, id);
+-- Benchmark details: latest data points per source within a level/zone cell
+CREATE INDEX IF NOT EXISTS idx_benchmarks_cell_latest ON compensation.benchmarks (level, zone, source_type, data_date DESC NULLS LAST, id);
+-- Delta imports: upsert target (NULL for rows loaded in append mode); unique
+-- indexes on a partitioned table must include the partition key
+CREATE UNIQUE INDEX IF NOT EXISTS idx_benchmarks_natural_key ON compensation.benchmarks (natural_key, data_date);
+-- Retention: rows past expires_at
+CREATE INDEX IF NOT EXISTS idx_benchmarks_expires ON compensation.benchmarks (expires_at) WHERE expires_at IS NOT NULL;
+
+-- Indexes for benchmark_imports table
+CREATE INDEX IF NOT EXISTS idx_benchmark_imports_source ON compensation.benchmark_imports (source_type, finished_at DESC);
+
+-- Indexes for benchmark_rollups table
+CREATE INDEX IF NOT EXISTS idx_benchmark_rollups_lookup ON compensation.benchmark_rollups (level, zone, job_family, source_type, vintage_year);
 
 -- Indexes for salary_ranges table
 CREATE INDEX IF NOT EXISTS idx_salary_ranges_job ON compensation.salary_ranges (job_family, level, zone);
 CREATE INDEX IF NOT EXISTS idx_salary_ranges_created ON compensation.salary_ranges (created_at DESC);
+-- Latest calculation for a job
+CREATE INDEX IF NOT EXISTS idx_salary_ranges_job_latest ON compensation.salary_ranges (job_analysis_id, created_at DESC);
 
 -- Indexes for job_analyses table
 -- CREATE INDEX IF NOT EXISTS idx_job_analyses_embedding ON compensation.job_analyses USING ivfflat (embedding vector_cosine_ops); -- Uncomment after pgvector
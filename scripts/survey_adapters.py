@@ -0,0 +1,154 @@
+"""
+Survey source adapters: per-vendor column mappings plus vectorized normalization
+
+Each vendor is a SourceAdapter declaring which CSV column feeds each
+compensation.benchmarks column and which file names it claims. Adding a vendor
+is one register_adapter() call; normalize_chunk() handles type conversion and
+validation column-wise for every adapter.
+"""
+
+from fnmatch import fnmatch
+from typing import Dict, NamedTuple, Optional, Tuple
+import os
+
+import numpy as np
+import pandas as pd
+
+# Columns written by the loaders; id, created_at and updated_at use table defaults
+BENCHMARK_COLUMNS = [
+    'source_type', 'source_file', 'job_family', 'job_code', 'job_title',
+    'level', 'band', 'zone', 'geography', 'location', 'market_segment', 'industry',
+    'company_count', 'employee_count', 'p10_salary', 'p25_salary', 'p50_salary',
+    'p75_salary', 'p90_salary', 'mean_salary', 'trend_indicator', 'trend_velocity',
+    'data_date', 'currency'
+]
+INTEGER_COLUMNS = ('level', 'band', 'zone', 'company_count', 'employee_count')
+SALARY_COLUMNS = ('p10_salary', 'p25_salary', 'p50_salary', 'p75_salary', 'p90_salary', 'mean_salary')
+PERCENTILE_COLUMNS = SALARY_COLUMNS[:5]
+# VARCHAR limits from scripts/create_database.sql; longer values would fail the COPY
+TEXT_LIMITS = {
+    'job_family': 100, 'job_code': 50, 'job_title': 255, 'geography': 255, 'location': 255,
+    'market_segment': 100, 'industry': 100, 'trend_indicator': 50, 'trend_velocity': 20, 'currency': 10
+}
+# DECIMAL(12,2)
+MAX_SALARY = 1e10
+# Rows missing these cannot be matched by SalaryEngine or placed in a partition
+REQUIRED_COLUMNS = ('job_family', 'level', 'zone', 'data_date')
+
+
+class SourceAdapter(NamedTuple):
+    source_type: str
+    # benchmarks column -> CSV column; benchmarks columns not listed load as NULL
+    columns: Dict[str, str]
+    # fnmatch patterns for file names this source claims
+    file_patterns: Tuple[str, ...]
+    required: Tuple[str, ...] = REQUIRED_COLUMNS
+
+
+SOURCE_ADAPTERS: Dict[str, SourceAdapter] = {}
+
+
+def register_adapter(adapter: SourceAdapter) -> SourceAdapter:
+    unknown = set(adapter.columns) - set(BENCHMARK_COLUMNS)
+    if unknown:
+        raise ValueError(f"{adapter.source_type}: unknown benchmark columns {', '.join(sorted(unknown))}")
+    SOURCE_ADAPTERS[adapter.source_type] = adapter
+    return adapter
+
+
+# Columns every survey file shares
+COMMON_COLUMNS = {
+    'job_family': 'job_family', 'level': 'level', 'zone': 'zone',
+    'geography': 'geography', 'location': 'geography',
+    **{name: name for name in SALARY_COLUMNS},
+    'data_date': 'data_date', 'currency': 'currency'
+}
+
+register_adapter(SourceAdapter(
+    source_type='mercer',
+    columns={
+        **COMMON_COLUMNS,
+        'job_code': 'job_code', 'market_segment': 'market_segment', 'industry': 'industry',
+        'trend_indicator': 'trend_indicator', 'trend_velocity': 'trend_velocity'
+    },
+    file_patterns=('mercer*.csv',)
+))
+
+register_adapter(SourceAdapter(
+    source_type='lattice',
+    columns={
+        **COMMON_COLUMNS,
+        'job_title': 'job_title', 'band': 'band', 'industry': 'industry_segment',
+        'company_count': 'company_count', 'employee_count': 'employee_count'
+    },
+    file_patterns=('lattice*.csv',)
+))
+
+
+def adapter_for_file(filepath: str) -> Optional[SourceAdapter]:
+    name = os.path.basename(filepath).lower()
+    for adapter in SOURCE_ADAPTERS.values():
+        if any(fnmatch(name, pattern) for pattern in adapter.file_patterns):
+            return adapter
+    return None
+
+
+def read_dtypes(adapter: SourceAdapter) -> Dict[str, type]:
+    """read_csv dtypes keeping text columns verbatim; numeric columns use the C parser"""
+    numeric = set(INTEGER_COLUMNS + SALARY_COLUMNS)
+    return {source: str for target, source in adapter.columns.items() if target not in numeric}
+
+
+def normalize_chunk(df: pd.DataFrame, adapter: SourceAdapter, source_file: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Convert and validate one CSV chunk column-wise
+
+    Returns ``(rows, rejects)``: rows in BENCHMARK_COLUMNS order ready for COPY,
+    and the rejected input rows with a ``reject_reason`` column (the first
+    failed check per row).
+    """
+    out = pd.DataFrame(index=df.index)
+    reasons = np.full(len(df), '', dtype=object)
+    rejected = np.zeros(len(df), dtype=bool)
+
+    def reject(mask, reason):
+        mask = np.asarray(mask, dtype=bool) & ~rejected
+        reasons[mask] = reason
+        rejected[mask] = True
+
+    def raw(name):
+        source = adapter.columns.get(name)
+        if source is None or source not in df.columns:
+            return pd.Series(None, index=df.index, dtype=object)
+        return df[source]
+
+    for name in BENCHMARK_COLUMNS:
+        out[name] = raw(name)
+    out['source_type'] = adapter.source_type
+    out['source_file'] = source_file
+
+    for name in INTEGER_COLUMNS + SALARY_COLUMNS:
+        values = pd.to_numeric(out[name], errors='coerce')
+        reject(out[name].notna() & values.isna(), f"invalid {name}")
+        out[name] = values
+    for name in INTEGER_COLUMNS:
+        reject(out[name].notna() & (out[name] % 1 != 0), f"{name} is not an integer")
+        out[name] = out[name].where(out[name] % 1 == 0).astype('Int64')
+    for name in SALARY_COLUMNS:
+        reject((out[name] < 0) | (out[name] >= MAX_SALARY), f"{name} out of range")
+    for lower, upper in zip(PERCENTILE_COLUMNS, PERCENTILE_COLUMNS[1:]):
+        reject(out[lower] > out[upper], f"{lower} above {upper}")
+
+    dates = pd.to_datetime(out['data_date'], errors='coerce')
+    reject(out['data_date'].notna() & dates.isna(), "invalid data_date")
+    out['data_date'] = dates.dt.strftime('%Y-%m-%d')
+    out['currency'] = out['currency'].fillna('USD')
+
+    for name, limit in TEXT_LIMITS.items():
+        if name in adapter.columns:
+            reject(out[name].str.len() > limit, f"{name} longer than {limit}")
+    for name in adapter.required:
+        reject(out[name].isna(), f"missing {name}")
+
+    if not rejected.any():
+        return out, df.iloc[:0]
+    return out[~rejected], df[rejected].assign(reject_reason=reasons[rejected])